@@ -1,7 +1,9 @@
 import asyncio
 import random
 import subprocess
+import time
 import os
+from contextlib import nullcontext
 
 from loguru import logger
 
@@ -16,23 +18,51 @@ import src.model
 from src.utils.statistics import print_wallets_stats
 from src.utils.check_github_version import check_version
 from src.utils.logs import ProgressTracker, create_progress_tracker
+from src.utils.scheduler import Pacer, get_task_classes, scheduler_slot
+from src.utils.concurrency import AdjustableSemaphore, ConcurrencyController, ControlledLimit
+from src.model.help.bridge_routes import prescan_bridge_routes
+from src.model.help.preflight import plan_slots, run_preflight
+from src.model.help.holdings_index import build_holdings_index
+from src.model.help.task_plan import BATCH_RUNNERS, flatten_tasks, is_batch_only
+from src.utils.batch_executor import get_batch_executor
+from src.model.cex_withdrawal.client import close_cex_client
+from src.utils.client import close_clients
+from src.utils.proxy_pool import get_proxy_pool
+from src.utils.allowance import get_allowance_index
+from src.utils.retry import retry_budget, should_retry
+from src.utils.control import ControlServer, get_run_control
+from eth_account import Account
 
 
 async def start(configuration: RunConfiguration):
     async def launch_wrapper(index, proxy, private_key, discord_token, twitter_token, email):
-        async with semaphore:
-            await account_flow(
-                index,
-                proxy,
-                private_key,
-                discord_token,
-                twitter_token,
-                email,
-                config,
-                lock,
-                progress_tracker,
-                configuration
-            )
+        # Следующий старт пейсер планирует от момента, когда аккаунт получил слот
+        async with pacer.turn() if pacer else nullcontext():
+            # Пауза и дренаж с control-сервера: до очереди за слотом и еще раз со слотом
+            if not await control.admit(index):
+                return
+            # The slot is released while the account is parked waiting for funds
+            async with scheduler_slot(semaphore):
+                if not await control.admit(index):
+                    return
+                if pacer:
+                    pacer.started()
+                control.account_started(index)
+                try:
+                    await account_flow(
+                        index,
+                        proxy,
+                        private_key,
+                        discord_token,
+                        twitter_token,
+                        email,
+                        config,
+                        lock,
+                        progress_tracker,
+                        configuration
+                    )
+                finally:
+                    control.account_finished(index)
 
     show_logo()
     show_dev_info()
@@ -113,6 +143,14 @@ async def start(configuration: RunConfiguration):
     proxies = src.utils.check_proxy_format(proxies)
     if proxies is False:
         return
+
+    # Проверяем все прокси разом, аккаунты с мертвыми получат живые
+    proxy_pool = get_proxy_pool()
+    proxy_pool.max_errors = config.PROXIES.MAX_ERRORS
+    proxy_pool.add(proxies)
+    if config.PROXIES.CHECK_BEFORE_START:
+        if await proxy_pool.check(config.PROXIES.CHECK_URL, config.PROXIES.CHECK_TIMEOUT) == 0:
+            logger.error("No proxy passed the check, accounts will keep their own proxies")
     
     if "disperse_farm_accounts" in config.FLOW.TASKS:
         main_keys = src.utils.read_txt_file("private keys", configuration.private_key_file)
@@ -182,6 +220,13 @@ async def start(configuration: RunConfiguration):
         # Python slice не включает последний элемент, поэтому +1
         accounts_to_process = private_keys[start_index - 1 : end_index]
 
+    # Балансы в сетях-источниках читаем для всех аккаунтов сразу, до запуска
+    bridge_routes = await prescan_bridge_routes(accounts_to_process, config)
+    # Заранее проверяем, какие задачи уже выполнены (сминченные NFT, стейк, баланс)
+    preflight = await run_preflight(accounts_to_process, config)
+    # Индекс токенов кошельков по Transfer логам для задач "продать всё"
+    await build_holdings_index(accounts_to_process, config)
+
     discord_tokens = [""] * len(accounts_to_process)
     emails = [""] * len(accounts_to_process) 
 
@@ -196,6 +241,46 @@ async def start(configuration: RunConfiguration):
     shuffled_indices = list(range(len(accounts_to_process)))
     random.shuffle(shuffled_indices)
 
+    # Аккаунты, которым не из чего бриджить, не ставим в очередь
+    if bridge_routes is not None:
+        flow_tasks = flatten_tasks(config.FLOW.TASKS)
+        hopeless = {
+            idx
+            for idx in shuffled_indices
+            if not bridge_routes.has_route(
+                Account.from_key(accounts_to_process[idx]).address, flow_tasks
+            )
+        }
+        if hopeless:
+            logger.warning(
+                f"Skipping accounts without source-chain balance: "
+                f"{' '.join(str(start_index + idx) for idx in sorted(hopeless))}"
+            )
+            shuffled_indices = [idx for idx in shuffled_indices if idx not in hopeless]
+
+    # Аккаунты, у которых все задачи уже выполнены, тоже не запускаем
+    if preflight is not None:
+        report_preflight_savings(
+            preflight, accounts_to_process, shuffled_indices, start_index, config
+        )
+        shuffled_indices = [
+            idx
+            for idx in shuffled_indices
+            if preflight.has_work(
+                Account.from_key(accounts_to_process[idx]).address,
+                flatten_tasks(config.FLOW.TASKS),
+            )
+        ]
+
+    # Пресет только из batch-задач: выполняем их для всех аккаунтов разом, без пауз
+    if is_batch_only(flatten_tasks(config.FLOW.TASKS)):
+        await run_batch_mode(
+            [(start_index + idx, accounts_to_process[idx]) for idx in shuffled_indices],
+            config,
+        )
+        print_wallets_stats(config)
+        return
+
     # Создаем строку с порядком аккаунтов
     account_order = " ".join(str(start_index + idx) for idx in shuffled_indices)
     logger.info(
@@ -204,11 +289,27 @@ async def start(configuration: RunConfiguration):
     logger.info(f"Accounts order: {account_order}")
 
     lock = asyncio.Lock()
-    semaphore = asyncio.Semaphore(value=threads)
+    semaphore = AdjustableSemaphore(threads)
+    # Дорогие задачи (браузер, биржа, капча) ограничены еще и своим лимитом
+    task_classes = get_task_classes(
+        {
+            "browser": config.CONCURRENCY.BROWSER,
+            "cex": config.CONCURRENCY.CEX,
+            "captcha": config.CONCURRENCY.CAPTCHA,
+            "rpc": config.CONCURRENCY.RPC,
+        }
+    )
+    controller = create_controller(config, semaphore, task_classes)
+    pacer = create_pacer(config, len(shuffled_indices))
+    control = get_run_control()
+    control.total = len(shuffled_indices)
+    control.limits = {"accounts": semaphore, **task_classes.semaphores}
+    control.pacer = pacer
+    control_server = await start_control_server(config, control)
     tasks = []
 
     # Создаем трекер прогресса перед созданием задач
-    total_accounts = len(accounts_to_process)
+    total_accounts = len(shuffled_indices)
     progress_tracker = await create_progress_tracker(
         total=total_accounts, description="Accounts completed"
     )
@@ -229,12 +330,126 @@ async def start(configuration: RunConfiguration):
         )
 
     await asyncio.gather(*tasks)
+    if controller:
+        controller.stop()
+    if control_server:
+        await control_server.stop()
+    await close_cex_client()
+    await close_clients()
+    get_allowance_index().flush()
+    proxy_pool.log_report()
 
     logger.success("Saved accounts and private keys to a file.")
 
     print_wallets_stats(config)
 
 
+def create_pacer(config, total_accounts):
+    """Spread account starts over SCHEDULE.TARGET_HOURS, if set"""
+    if config.SCHEDULE.TARGET_HOURS <= 0 or total_accounts == 0:
+        return None
+
+    duration = config.SCHEDULE.TARGET_HOURS * 3600
+    # Случайная пауза перед стартом теперь только сдвигает старт относительно плана
+    jitter = sum(config.SETTINGS.RANDOM_INITIALIZATION_PAUSE) / 2
+    logger.info(
+        f"Pacing {total_accounts} accounts over {config.SCHEDULE.TARGET_HOURS}h: "
+        f"one start every {duration / total_accounts:.0f}s"
+    )
+    return Pacer(total_accounts, duration, jitter)
+
+
+async def start_control_server(config, control):
+    """Serve the run control on 127.0.0.1:CONTROL.PORT, if set"""
+    if config.CONTROL.PORT <= 0:
+        return None
+
+    server = ControlServer(control, config.CONTROL.PORT, config.CONTROL.TOKEN)
+    try:
+        await server.start()
+    except OSError as e:
+        # Занятый порт не повод останавливать прогон
+        logger.error(f"Control server failed to start on port {config.CONTROL.PORT}: {e}")
+        return None
+    return server
+
+
+def create_controller(config, semaphore, task_classes):
+    """Start adjusting THREADS and the RPC class limit to the RPC's health, if enabled"""
+    if not config.CONCURRENCY.ADAPTIVE:
+        return None
+
+    settings = config.CONCURRENCY
+    semaphore.set_limit(min(max(semaphore.limit, settings.MIN_THREADS), settings.MAX_THREADS))
+    limits = [
+        ControlledLimit("accounts", semaphore, settings.MIN_THREADS, settings.MAX_THREADS)
+    ]
+    if "rpc" in task_classes.semaphores:
+        # The configured RPC limit is the ceiling
+        limits.append(ControlledLimit("rpc tasks", task_classes.semaphores["rpc"], 1, settings.RPC))
+
+    controller = ConcurrencyController(limits)
+    controller.start()
+    logger.info(
+        f"Adaptive concurrency: starting with {semaphore.limit} accounts, "
+        f"bounds {settings.MIN_THREADS}-{settings.MAX_THREADS}"
+    )
+    return controller
+
+
+async def run_batch_mode(accounts, config):
+    """Run a preset of batchable tasks for all accounts at once"""
+    tasks = list(dict.fromkeys(task for task in flatten_tasks(config.FLOW.TASKS) if task != "skip"))
+    logger.info(f"Batch mode: running {', '.join(tasks)} for {len(accounts)} accounts at once...")
+    started = time.monotonic()
+    for task in tasks:
+        done = await BATCH_RUNNERS[task](accounts, config)
+        logger.success(f"Batch mode: {task} done for {done} of {len(accounts)} accounts")
+
+    executor = get_batch_executor()
+    logger.info(
+        f"Batch mode finished in {time.monotonic() - started:.1f}s: "
+        f"{executor.requests} reads in {executor.batches} batch requests"
+    )
+
+
+def report_preflight_savings(preflight, accounts, indices, start_index, config):
+    """Log the accounts and task slots the preflight scan removed from the run"""
+    settings = config.SETTINGS
+    action_pause = sum(settings.RANDOM_PAUSE_BETWEEN_ACTIONS) / 2
+    account_pause = (
+        sum(settings.RANDOM_PAUSE_BETWEEN_ACCOUNTS) / 2
+        + sum(settings.RANDOM_INITIALIZATION_PAUSE) / 2
+    )
+    flow_tasks = flatten_tasks(config.FLOW.TASKS)
+    slots = plan_slots(config.FLOW.TASKS)
+
+    dropped_accounts = []
+    skipped_slots = 0
+    for idx in indices:
+        address = Account.from_key(accounts[idx]).address
+        skipped_slots += preflight.skipped_slots(address, slots)
+        if not preflight.has_work(address, flow_tasks):
+            dropped_accounts.append(idx)
+
+    if not skipped_slots:
+        return
+
+    # Оценка по средним паузам из конфига, сами транзакции не считаем
+    saved_seconds = (
+        skipped_slots * action_pause + len(dropped_accounts) * account_pause
+    )
+    if dropped_accounts:
+        logger.warning(
+            f"Skipping accounts with all tasks already done: "
+            f"{' '.join(str(start_index + idx) for idx in dropped_accounts)}"
+        )
+    logger.success(
+        f"Preflight removed {skipped_slots} task slots and {len(dropped_accounts)} "
+        f"of {len(indices)} accounts, up to ~{saved_seconds / 60:.0f} minutes of pauses saved"
+    )
+
+
 async def account_flow(
     account_index: int,
     proxy: str,
@@ -247,34 +462,48 @@ async def account_flow(
     progress_tracker: ProgressTracker,
     run_configuration: RunConfiguration
 ):
+    # С целевым окном паузы между аккаунтами задает пейсер
+    paced = config.SCHEDULE.TARGET_HOURS > 0
     try:
-        pause = random.randint(
-            config.SETTINGS.RANDOM_INITIALIZATION_PAUSE[0],
-            config.SETTINGS.RANDOM_INITIALIZATION_PAUSE[1],
-        )
-        logger.info(f"[{account_index}] Sleeping for {pause} seconds before start...")
-        await asyncio.sleep(pause)
+        if not paced:
+            pause = random.randint(
+                config.SETTINGS.RANDOM_INITIALIZATION_PAUSE[0],
+                config.SETTINGS.RANDOM_INITIALIZATION_PAUSE[1],
+            )
+            logger.info(f"[{account_index}] Sleeping for {pause} seconds before start...")
+            await asyncio.sleep(pause)
 
         report = False
 
+        # Аккаунт с мертвым прокси сразу получает живой
+        proxy = get_proxy_pool().acquire(proxy)
         instance = src.model.Start(
             account_index, proxy, private_key, discord_token, twitter_token, email, config
         )
 
-        result = await wrapper(instance.initialize, config)
-        if not result:
-            report = True
-
-        result = await wrapper(instance.flow, config)
-        if not result:
-            report = True
-
-        pause = random.randint(
-            config.SETTINGS.RANDOM_PAUSE_BETWEEN_ACCOUNTS[0],
-            config.SETTINGS.RANDOM_PAUSE_BETWEEN_ACCOUNTS[1],
-        )
-        logger.info(f"Sleeping for {pause} seconds before next account...")
-        await asyncio.sleep(pause)
+        # Все ретраи аккаунта (flow, задачи, запросы) тратят один бюджет
+        with retry_budget(
+            f"account {account_index}",
+            config.RETRY.ACCOUNT_MAX_RETRIES,
+            config.RETRY.ACCOUNT_MAX_TIME,
+        ):
+            result = await wrapper(instance.initialize, config)
+            if not result:
+                report = True
+
+            result = await wrapper(instance.flow, config)
+            if not result:
+                report = True
+        await instance.close()
+        get_proxy_pool().release(instance.proxy)
+
+        if not paced:
+            pause = random.randint(
+                config.SETTINGS.RANDOM_PAUSE_BETWEEN_ACCOUNTS[0],
+                config.SETTINGS.RANDOM_PAUSE_BETWEEN_ACCOUNTS[1],
+            )
+            logger.info(f"Sleeping for {pause} seconds before next account...")
+            await asyncio.sleep(pause)
 
         # В конце функции, независимо от результата, обновляем прогресс
         await progress_tracker.increment(1)
@@ -297,14 +526,11 @@ async def wrapper(function, config: src.utils.config.Config, *args, **kwargs):
                 return True
 
         if attempt < attempts - 1:  # Don't sleep after the last attempt
-            pause = random.randint(
-                config.SETTINGS.PAUSE_BETWEEN_ATTEMPTS[0],
-                config.SETTINGS.PAUSE_BETWEEN_ATTEMPTS[1],
-            )
             logger.info(
-                f"Sleeping for {pause} seconds before next attempt {attempt+1}/{config.SETTINGS.ATTEMPTS}..."
+                f"Retrying, next attempt {attempt+1}/{config.SETTINGS.ATTEMPTS}..."
             )
-            await asyncio.sleep(pause)
+            if not await should_retry(None, attempt, pause=config.SETTINGS.PAUSE_BETWEEN_ATTEMPTS):
+                break
 
     return result
 
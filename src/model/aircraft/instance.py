@@ -11,6 +11,10 @@ import functools
 
 from src.utils.config import Config
 from src.utils.constants import RPC_URL, EXPLORER_URL
+from src.utils.retry import should_retry
+from src.utils.http_cache import shared_response
+
+CANDIDATES_TTL = 300  # seconds
 
 
 # Global database lock for thread safety
@@ -31,9 +35,8 @@ def with_retries(func):
                 last_exception = e
                 logger.warning(f"[{self.account_index}] Attempt {attempt + 1}/{attempts} failed for {func.__name__}: {str(e)}")
                 if attempt < attempts - 1:  # Don't sleep on the last attempt
-                    pause_time = random.uniform(pause_range[0], pause_range[1])
-                    logger.info(f"[{self.account_index}] Waiting {pause_time:.2f} seconds before next attempt...")
-                    await asyncio.sleep(pause_time)
+                    if not await should_retry(e, attempt, pause=pause_range):
+                        break
                 
         logger.error(f"[{self.account_index}] All {attempts} attempts failed for {func.__name__}")
         raise last_exception
@@ -358,28 +361,33 @@ class Aircraft:
             raise e
 
     @with_retries
+    @shared_response(ttl=CANDIDATES_TTL)
+    async def _fetch_candidates(self) -> list:
+        """Candidates list, the same for every wallet"""
+        params = {
+            'projectID': '678376133438e102d6ff5c6e',
+        }
+
+        response = await self.session.get(
+            'https://api.aicraft.fun/candidates',
+            params=params,
+            headers=self.get_auth_headers()
+        )
+
+        response_data = response.json()
+        # logger.debug(f"[{self.account_index}] Candidates response: {json.dumps(response_data, indent=2)}")
+
+        if response_data.get('statusCode') != 200:
+            raise Exception(f"Failed to get candidates: {response_data}")
+
+        return response_data['data']
+
     async def get_candidates(self) -> Dict:
         """Get available candidates from the platform."""
         try:
             logger.info(f"[{self.account_index}] Getting candidates")
             
-            params = {
-                'projectID': '678376133438e102d6ff5c6e',
-            }
-            
-            response = await self.session.get(
-                'https://api.aicraft.fun/candidates',
-                params=params,
-                headers=self.get_auth_headers()
-            )
-            
-            response_data = response.json()
-            # logger.debug(f"[{self.account_index}] Candidates response: {json.dumps(response_data, indent=2)}")
-            
-            if response_data.get('statusCode') != 200:
-                raise Exception(f"Failed to get candidates: {response_data}")
-            
-            candidates = response_data['data']
+            candidates = await self._fetch_candidates()
             if not candidates:
                 logger.warning(f"[{self.account_index}] No candidates available")
                 return None
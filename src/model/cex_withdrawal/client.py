@@ -0,0 +1,178 @@
+import asyncio
+import time
+from typing import Any, Dict, Optional
+
+import ccxt.async_support as ccxt
+from loguru import logger
+
+from src.utils.config import Config
+from src.model.cex_withdrawal.constants import (
+    SUPPORTED_EXCHANGES,
+    WITHDRAW_RATE_LIMITS,
+)
+
+
+# Currencies, networks and withdrawal fees barely change during a run
+MARKETS_TTL = 600  # seconds
+# Exchange balance is re-read after this, withdrawals in between are subtracted locally
+BALANCE_TTL = 60  # seconds
+
+
+class WithdrawalQueue:
+    """
+    Sends withdrawal requests to the exchange one at a time.
+
+    Requests are spaced by the exchange's documented withdrawal rate limit,
+    every caller awaits the result of its own request.
+    """
+
+    def __init__(self, exchange: Any, requests_per_second: float):
+        self.exchange = exchange
+        self.min_interval = 1 / requests_per_second
+        self._queue: asyncio.Queue = asyncio.Queue()
+        self._worker: Optional[asyncio.Task] = None
+        self._last_request = 0.0
+
+    async def withdraw(
+        self, currency: str, amount: float, address: str, params: Dict
+    ) -> Dict:
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((currency, amount, address, params, future))
+
+        if self._worker is None or self._worker.done():
+            self._worker = asyncio.create_task(self._work())
+
+        return await future
+
+    async def _work(self):
+        while not self._queue.empty():
+            currency, amount, address, params, future = await self._queue.get()
+            if future.cancelled():
+                continue
+
+            wait = self._last_request + self.min_interval - time.monotonic()
+            if wait > 0:
+                await asyncio.sleep(wait)
+
+            try:
+                result = await self.exchange.withdraw(
+                    currency, amount, address, params=params
+                )
+                if not future.done():
+                    future.set_result(result)
+            except Exception as e:
+                if not future.done():
+                    future.set_exception(e)
+            finally:
+                self._last_request = time.monotonic()
+
+    def close(self):
+        if self._worker is not None:
+            self._worker.cancel()
+
+
+class CexClient:
+    """
+    One exchange connection for all accounts of the process.
+
+    Authentication is checked once, markets are loaded once per MARKETS_TTL
+    and withdrawals go through a WithdrawalQueue. Any object with the ccxt
+    methods used here (fetch_balance, load_markets, currencies, withdraw,
+    close) can stand in for the exchange, e.g. a local fake in tests.
+    """
+
+    def __init__(self, exchange: Any, name: str):
+        self.exchange = exchange
+        self.name = name.lower()
+        self.queue = WithdrawalQueue(exchange, WITHDRAW_RATE_LIMITS.get(self.name, 1))
+
+        self._authenticated = False
+        self._markets_loaded_at: Optional[float] = None
+        self._balances: Dict[str, tuple] = {}
+        self._lock = asyncio.Lock()
+
+    @classmethod
+    def from_config(cls, config: Config) -> "CexClient":
+        exchange_name = config.EXCHANGES.name.lower()
+        if exchange_name not in SUPPORTED_EXCHANGES:
+            raise ValueError(f"Unsupported exchange: {exchange_name}")
+
+        exchange = getattr(ccxt, exchange_name)({"enableRateLimit": True})
+        exchange.apiKey = config.EXCHANGES.apiKey
+        exchange.secret = config.EXCHANGES.secretKey
+        if config.EXCHANGES.passphrase:
+            exchange.password = config.EXCHANGES.passphrase
+        return cls(exchange, exchange_name)
+
+    async def ensure_auth(self):
+        """Test exchange authentication, once per process."""
+        async with self._lock:
+            if self._authenticated:
+                return
+            await self.exchange.fetch_balance()
+            self._authenticated = True
+
+    async def get_networks(self, currency: str) -> Optional[Dict]:
+        """Withdrawal networks of currency, None if the exchange doesn't list it."""
+        async with self._lock:
+            expired = (
+                self._markets_loaded_at is None
+                or time.monotonic() - self._markets_loaded_at > MARKETS_TTL
+            )
+            if expired:
+                await self.exchange.load_markets(reload=self._markets_loaded_at is not None)
+                self._markets_loaded_at = time.monotonic()
+
+        currency = currency.upper()
+        if currency not in self.exchange.currencies:
+            return None
+        return self.exchange.currencies[currency]["networks"]
+
+    async def get_balance(self, currency: str, params: Dict) -> float:
+        """Total balance of currency, refreshed once per BALANCE_TTL."""
+        currency = currency.upper()
+        async with self._lock:
+            cached = self._balances.get(currency)
+            if cached and time.monotonic() - cached[0] < BALANCE_TTL:
+                return cached[1]
+
+            balances = await self.exchange.fetch_balance(params=params)
+            balance = float(balances[currency]["total"])
+            self._balances[currency] = (time.monotonic(), balance)
+            return balance
+
+    async def withdraw(
+        self, currency: str, amount: float, address: str, params: Dict
+    ) -> Dict:
+        """Queue a withdrawal and wait until the exchange accepts or rejects it."""
+        result = await self.queue.withdraw(currency, amount, address, params)
+
+        # Keep the cached balance honest until the next refresh
+        currency = currency.upper()
+        cached = self._balances.get(currency)
+        if cached:
+            spent = amount + float(params.get("fee") or 0)
+            self._balances[currency] = (cached[0], cached[1] - spent)
+        return result
+
+    async def close(self):
+        self.queue.close()
+        await self.exchange.close()
+
+
+# Singleton pattern
+def get_cex_client(config: Config) -> CexClient:
+    """Get exchange client singleton"""
+    if not hasattr(get_cex_client, "_client"):
+        get_cex_client._client = CexClient.from_config(config)
+    return get_cex_client._client
+
+
+async def close_cex_client():
+    """Close the exchange client if it was created."""
+    if hasattr(get_cex_client, "_client"):
+        try:
+            await get_cex_client._client.close()
+        except Exception as e:
+            logger.warning(f"Failed to close exchange client: {e}")
+        del get_cex_client._client
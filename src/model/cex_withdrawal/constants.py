@@ -31,4 +31,10 @@ EXCHANGE_PARAMS = {
 }
 
 # Supported exchanges
-SUPPORTED_EXCHANGES = ["okx", "bitget"]
\ No newline at end of file
+SUPPORTED_EXCHANGES = ["okx", "bitget"]
+
+# Withdrawal endpoint rate limits (requests per second) from the exchanges' API docs
+WITHDRAW_RATE_LIMITS = {
+    "okx": 6,  # POST /api/v5/asset/withdrawal: 6 requests per second
+    "bitget": 5,  # POST /api/v2/spot/wallet/withdrawal: 5 requests per second
+}
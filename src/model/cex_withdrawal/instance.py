@@ -1,7 +1,6 @@
 import random
 import ccxt.async_support as ccxt
 import asyncio
-import time
 from decimal import Decimal
 from src.utils.config import Config
 from eth_account import Account
@@ -13,10 +12,19 @@ from src.model.cex_withdrawal.constants import (
     EXCHANGE_PARAMS,
     SUPPORTED_EXCHANGES
 )
+from src.model.cex_withdrawal.client import CexClient, get_cex_client
+from src.utils.chains import get_native_balance, get_native_balances, invalidate_balance
+from src.utils.fund_watcher import get_fund_watcher
 from typing import Dict, Optional
 
 class CexWithdraw:
-    def __init__(self, account_index: int, private_key: str, config: Config):
+    def __init__(
+        self,
+        account_index: int,
+        private_key: str,
+        config: Config,
+        client: Optional[CexClient] = None,
+    ):
         self.account_index = account_index
         self.private_key = private_key
         self.config = config
@@ -26,14 +34,9 @@ class CexWithdraw:
         if exchange_name not in SUPPORTED_EXCHANGES:
             raise ValueError(f"Unsupported exchange: {exchange_name}")
             
-        # Initialize exchange
-        self.exchange = getattr(ccxt, exchange_name)()
-            
-        # Setup exchange credentials
-        self.exchange.apiKey = config.EXCHANGES.apiKey
-        self.exchange.secret = config.EXCHANGES.secretKey
-        if config.EXCHANGES.passphrase:
-            self.exchange.password = config.EXCHANGES.passphrase
+        # One exchange connection is shared by all accounts, it is closed at the end of the run
+        self.client = client or get_cex_client(config)
+        self.exchange = self.client.exchange
         
         self.account = Account.from_key(private_key)
         self.address = self.account.address
@@ -47,9 +50,7 @@ class CexWithdraw:
             raise ValueError("No networks specified in withdrawal configuration")
             
         # The network will be selected during withdrawal, not in __init__
-        # We'll initialize web3 only after network selection in the withdraw method
         self.network = None
-        self.web3 = None
 
     async def __aenter__(self):
         """Async context manager entry"""
@@ -57,22 +58,20 @@ class CexWithdraw:
         return self
 
     async def __aexit__(self, exc_type, exc_val, exc_tb):
-        """Async context manager exit"""
-        await self.exchange.close()
+        """Async context manager exit, the shared exchange client stays open"""
+        return None
 
     async def check_auth(self) -> None:
         """Test exchange authentication"""
         logger.info(f"[{self.account_index}] Testing exchange authentication...")
         try:
-            await self.exchange.fetch_balance()
+            await self.client.ensure_auth()
             logger.success(f"[{self.account_index}] Authentication successful")
         except ccxt.AuthenticationError as e:
             logger.error(f"[{self.account_index}] Authentication error: {str(e)}")
-            await self.exchange.close()
             raise
         except Exception as e:
             logger.error(f"[{self.account_index}] Unexpected error during authentication: {str(e)}")
-            await self.exchange.close()
             raise
             
     async def get_chains_info(self) -> Dict:
@@ -80,17 +79,16 @@ class CexWithdraw:
         logger.info(f"[{self.account_index}] Getting withdrawal networks data...")
         
         try:
-            await self.exchange.load_markets()
-            
             chains_info = {}
             withdrawal_config = self.config.EXCHANGES.withdrawals[0]
             currency = withdrawal_config.currency.upper()
             
-            if currency not in self.exchange.currencies:
+            # Markets are loaded once per process and reused until they expire
+            networks = await self.client.get_networks(currency)
+            if networks is None:
                 logger.error(f"[{self.account_index}] Currency {currency} not found on {self.config.EXCHANGES.name}")
                 return {}
-                
-            networks = self.exchange.currencies[currency]["networks"]
+
             # logger.info(f"[{self.account_index}] Available networks for {currency}:")
             
             for key, info in networks.items():
@@ -113,7 +111,6 @@ class CexWithdraw:
             return chains_info
         except Exception as e:
             logger.error(f"[{self.account_index}] Error getting chains info: {str(e)}")
-            await self.exchange.close()
             raise
         
     def _is_withdrawal_enabled(self, key: str, info: Dict) -> bool:
@@ -140,55 +137,48 @@ class CexWithdraw:
             exchange_name = self.config.EXCHANGES.name.lower()
             params = EXCHANGE_PARAMS[exchange_name]["balance"]
             
-            balances = await self.exchange.fetch_balance(params=params)
             withdrawal_config = self.config.EXCHANGES.withdrawals[0]
             currency = withdrawal_config.currency.upper()
             
-            balance = float(balances[currency]["total"])
+            balance = await self.client.get_balance(currency, params)
             logger.info(f"[{self.account_index}] Exchange balance: {balance:.8f} {currency}")
             
             if balance < amount:
                 logger.error(f"[{self.account_index}] Insufficient balance for withdrawal {balance} {currency} < {amount} {currency}")
-                await self.exchange.close()
                 return False
                 
             return True
             
         except Exception as e:
             logger.error(f"[{self.account_index}] Error checking balance: {str(e)}")
-            await self.exchange.close()
             raise
 
     async def get_eth_balance(self) -> Decimal:
         """Get ETH balance for the wallet address"""
-        if self.web3 is None:
-            raise ValueError(f"[{self.account_index}] Web3 instance not initialized. Network must be selected first.")
+        if self.network is None:
+            raise ValueError(f"[{self.account_index}] Network must be selected first.")
 
-        balance_wei = self.web3.eth.get_balance(self.address)
-        return Decimal(self.web3.from_wei(balance_wei, 'ether'))
+        balance_wei = await get_native_balance(CEX_WITHDRAWAL_RPCS[self.network], self.address)
+        return Decimal(Web3.from_wei(balance_wei, 'ether'))
 
     async def wait_for_balance_update(self, initial_balance: Decimal, timeout: int = 600) -> bool:
         """
         Wait for the balance to increase from the initial balance.
         Returns True if balance increased, False if timeout reached.
         """
-        start_time = time.time()
         logger.info(f"[{self.account_index}] Waiting for funds to arrive. Initial balance: {initial_balance} ETH")
         
-        while time.time() - start_time < timeout:
-            try:
-                current_balance = await self.get_eth_balance()
-                if current_balance > initial_balance:
-                    increase = current_balance - initial_balance
-                    logger.success(f"[{self.account_index}] Funds received! Balance increased by {increase} ETH")
-                    return True
-                
-                logger.info(f"[{self.account_index}] Current balance: {current_balance} ETH. Waiting...")
-                await asyncio.sleep(10)  # Check every 10 seconds
-                
-            except Exception as e:
-                logger.error(f"[{self.account_index}] Error checking balance: {str(e)}")
-                await asyncio.sleep(5)
+        # The account gives up its slot while the exchange processes the withdrawal
+        current_balance = await get_fund_watcher().wait_for_balance(
+            CEX_WITHDRAWAL_RPCS[self.network],
+            self.address,
+            lambda balance: Decimal(Web3.from_wei(balance, 'ether')) > initial_balance,
+            timeout,
+        )
+        if current_balance is not None:
+            increase = Decimal(Web3.from_wei(current_balance, 'ether')) - initial_balance
+            logger.success(f"[{self.account_index}] Funds received! Balance increased by {increase} ETH")
+            return True
                 
         logger.warning(f"[{self.account_index}] Timeout reached after {timeout} seconds. Funds not received.")
         return False
@@ -242,7 +232,6 @@ class CexWithdraw:
             if not rpc_url:
                 logger.error(f"[{self.account_index}] No RPC URL found for network: {self.network}")
                 return False
-            self.web3 = Web3(Web3.HTTPProvider(rpc_url))
             # logger.info(f"[{self.account_index}] Updated web3 provider to: {rpc_url}")
             
             # Ensure withdrawal amount respects network minimum
@@ -251,7 +240,6 @@ class CexWithdraw:
             
             if min_amount > max_amount:
                 logger.error(f"[{self.account_index}] Network minimum ({network_info['withdrawMin']}) is higher than configured maximum ({max_amount})")
-                await self.exchange.close()
                 return False
                 
             amount = round(random.uniform(min_amount, max_amount), random.randint(5, 12))
@@ -264,7 +252,6 @@ class CexWithdraw:
             # This prevents withdrawals if the wallet already has sufficient funds on any chain
             if not await self.check_all_networks_balance(withdrawal_config.max_balance):
                 logger.warning(f"[{self.account_index}] Skipping withdrawal as destination wallet balance exceeds maximum on at least one network")
-                await self.exchange.close()
                 return False
              
             max_retries = withdrawal_config.retries
@@ -283,12 +270,14 @@ class CexWithdraw:
                         **EXCHANGE_PARAMS[exchange_name]["withdraw"]
                     }
                     
-                    withdrawal = await self.exchange.withdraw(
+                    # Requests of all accounts are queued under the exchange's rate limit
+                    withdrawal = await self.client.withdraw(
                         currency,
                         amount,
                         self.address,
-                        params=params
+                        params
                     )
+                    invalidate_balance(rpc_url, self.address)
                     
                     logger.success(f"[{self.account_index}] Withdrawal initiated successfully")
                     
@@ -299,18 +288,15 @@ class CexWithdraw:
                             timeout=withdrawal_config.max_wait_time
                         )
                         if funds_received:
-                            await self.exchange.close()
                             return True
                         
                         logger.warning(f"[{self.account_index}] Funds not received yet, will retry withdrawal")
                     else:
-                        await self.exchange.close()
                         return True  # If not waiting for funds, consider it successful
                     
                 except ccxt.NetworkError as e:
                     if attempt == max_retries - 1:
                         logger.error(f"[{self.account_index}] Network error on final attempt: {str(e)}")
-                        await self.exchange.close()
                         raise
                     logger.warning(f"[{self.account_index}] Network error, retrying: {str(e)}")
                     await asyncio.sleep(5)
@@ -319,31 +305,25 @@ class CexWithdraw:
                     error_msg = str(e).lower()
                     if "insufficient balance" in error_msg:
                         logger.error(f"[{self.account_index}] Insufficient balance in exchange account")
-                        await self.exchange.close()
                         return False
                     if "whitelist" in error_msg or "not in withdraw whitelist" in error_msg:
                         logger.error(f"[{self.account_index}] Address not in whitelist: {str(e)}")
-                        await self.exchange.close()
                         return False
                     if attempt == max_retries - 1:
                         logger.error(f"[{self.account_index}] Exchange error on final attempt: {str(e)}")
-                        await self.exchange.close()
                         raise
                     logger.warning(f"[{self.account_index}] Exchange error, retrying: {str(e)}")
                     await asyncio.sleep(5)
                     
                 except Exception as e:
                     logger.error(f"[{self.account_index}] Unexpected error during withdrawal: {str(e)}")
-                    await self.exchange.close()
                     raise
                     
             logger.error(f"[{self.account_index}] Withdrawal failed after {max_retries} attempts")
-            await self.exchange.close()
             return False
             
         except Exception as e:
             logger.error(f"[{self.account_index}] Fatal error during withdrawal process: {str(e)}")
-            await self.exchange.close()
             raise 
 
     async def check_all_networks_balance(self, max_balance: float) -> bool:
@@ -355,34 +335,24 @@ class CexWithdraw:
         if not withdrawal_config.networks:
             raise ValueError("No networks specified in withdrawal configuration")
             
-        # Store the current network and web3 instance to restore later
-        original_network = self.network
-        original_web3 = self.web3
-        
-        try:
-            # Check balance on each network
-            for network in withdrawal_config.networks:
-                rpc_url = CEX_WITHDRAWAL_RPCS.get(network)
-                if not rpc_url:
-                    logger.warning(f"[{self.account_index}] No RPC URL found for network: {network}, skipping balance check")
-                    continue
-                    
-                # Set up web3 for this network
-                self.network = network
-                self.web3 = Web3(Web3.HTTPProvider(rpc_url))
-                
-                try:
-                    current_balance = await self.get_eth_balance()
-                    if current_balance >= Decimal(str(max_balance)):
-                        logger.warning(f"[{self.account_index}] Destination wallet balance on {network} ({current_balance}) exceeds maximum allowed ({max_balance})")
-                        return False
-                    logger.info(f"[{self.account_index}] Balance on {network}: {current_balance} ETH (below max: {max_balance})")
-                except Exception as e:
-                    logger.warning(f"[{self.account_index}] Error checking balance on {network}: {str(e)}")
+        rpcs = {}
+        for network in withdrawal_config.networks:
+            rpc_url = CEX_WITHDRAWAL_RPCS.get(network)
+            if not rpc_url:
+                logger.warning(f"[{self.account_index}] No RPC URL found for network: {network}, skipping balance check")
+                continue
+            rpcs[network] = rpc_url
+
+        # Balances on all networks are read concurrently
+        balances = await get_native_balances(rpcs, self.address)
+        for network, balance_wei in balances.items():
+            if balance_wei is None:
+                logger.warning(f"[{self.account_index}] Error checking balance on {network}")
+                continue
+            current_balance = Decimal(Web3.from_wei(balance_wei, 'ether'))
+            if current_balance >= Decimal(str(max_balance)):
+                logger.warning(f"[{self.account_index}] Destination wallet balance on {network} ({current_balance}) exceeds maximum allowed ({max_balance})")
+                return False
+            logger.info(f"[{self.account_index}] Balance on {network}: {current_balance} ETH (below max: {max_balance})")
                     
-            return True
-            
-        finally:
-            # Restore original network and web3 instance
-            self.network = original_network
-            self.web3 = original_web3 
\ No newline at end of file
+        return True
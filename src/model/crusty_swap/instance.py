@@ -1,4 +1,4 @@
-from web3 import AsyncWeb3
+from web3 import AsyncWeb3, Web3
 from eth_account import Account
 from typing import Dict, Optional, List, Tuple
 from decimal import Decimal
@@ -7,6 +7,15 @@ import numpy as np
 import asyncio
 from loguru import logger
 from src.utils.config import Config
+from src.utils.fund_watcher import get_fund_watcher
+from src.utils.chains import (
+    get_chain_web3,
+    get_native_balance,
+    get_native_balances,
+    invalidate_balance,
+)
+from src.model.help.bridge_routes import get_bridge_routes
+from src.utils.disperse_engine import DisperseEngine, Transfer
 from src.model.crusty_swap.constants import (
     CONTRACT_ADDRESSES, 
     EXPLORER_URLS,
@@ -20,6 +29,16 @@ from src.model.crusty_swap.constants import (
     REFUEL_FROM_ONE_TO_ALL_CONTRACT_ABI
 )
 from src.utils.constants import RPC_URL, ETH_RPC_URL, EXPLORER_URL
+from src.utils.call_cache import register_global_call
+from src.utils.provider import create_web3
+
+# Contract settings, prices and capacity are the same for every account
+for _address in {*CONTRACT_ADDRESSES.values(), DESTINATION_CONTRACT_ADDRESS}:
+    register_global_call(_address, "minimumDeposit()", ttl=300)
+    register_global_call(_address, "minimumSell()", ttl=300)
+    register_global_call(_address, "pricePerMonad()", ttl=30)
+register_global_call(DESTINATION_CONTRACT_ADDRESS, "getAvailableCapacity()", blocks=1)
+register_global_call(CHAINLINK_ETH_PRICE_CONTRACT_ADDRESS, "latestAnswer()", ttl=60)
 
 class CrustySwap:
     def __init__(
@@ -34,18 +53,9 @@ class CrustySwap:
         self.private_key = private_key
         self.config = config
         self.account = Account.from_key(private_key)
-        self.monad_web3 = AsyncWeb3(
-            AsyncWeb3.AsyncHTTPProvider(
-                RPC_URL,
-                request_kwargs={"proxy": (f"http://{proxy}") if proxy else None, "ssl": False},
-            )
-        )
-        self.eth_web3 = AsyncWeb3(
-            AsyncWeb3.AsyncHTTPProvider(
-                ETH_RPC_URL,
-                request_kwargs={"proxy": (f"http://{proxy}") if proxy else None, "ssl": False},
-            )
-        )
+        # Pooled clients, their global reads go through the shared call cache
+        self.monad_web3 = create_web3(proxy, RPC_URL)
+        self.eth_web3 = create_web3(proxy, ETH_RPC_URL)
         self.monad_contract = self.monad_web3.eth.contract(address=DESTINATION_CONTRACT_ADDRESS, abi=CRUSTY_SWAP_ABI)
 
     async def check_available_monad(self, eth_amount_wei, contract, max_retries=5, retry_delay=5) -> bool:
@@ -130,8 +140,7 @@ class CrustySwap:
     async def get_native_balance(self, network: str) -> float:
         """Get native token balance for a specific network."""
         try:
-            web3 = AsyncWeb3(AsyncWeb3.AsyncHTTPProvider(CRUSTY_SWAP_RPCS[network]))
-            return await web3.eth.get_balance(self.account.address)
+            return await get_native_balance(CRUSTY_SWAP_RPCS[network], self.account.address)
         except Exception as e:
             logger.error(f"[{self.account_index}] Failed to get balance for {network}: {str(e)}")
             return None
@@ -142,24 +151,18 @@ class CrustySwap:
         timeout = self.config.CRUSTY_SWAP.MAX_WAIT_TIME
         
         logger.info(f"[{self.account_index}] Waiting for balance to increase (max wait time: {timeout} seconds)...")
-        start_time = asyncio.get_event_loop().time()
-        
-        # Check balance every 5 seconds until timeout
-        while asyncio.get_event_loop().time() - start_time < timeout:
-            current_balance = await self.get_monad_balance()
-            if current_balance > initial_balance:
-                logger.success(
-                    f"[{self.account_index}] Balance increased from {initial_balance} to {current_balance} MON"
-                )
-                return True
-            
-            # Log progress every 15 seconds
-            elapsed = int(asyncio.get_event_loop().time() - start_time)
-            if elapsed % 15 == 0:
-                logger.info(f"[{self.account_index}] Still waiting for balance to increase... ({elapsed}/{timeout} seconds)")
-            
-            await asyncio.sleep(5)
-        
+        current_balance = await get_fund_watcher().wait_for_balance(
+            RPC_URL,
+            self.account.address,
+            lambda balance: float(Web3.from_wei(balance, "ether")) > initial_balance,
+            timeout,
+        )
+        if current_balance is not None:
+            logger.success(
+                f"[{self.account_index}] Balance increased from {initial_balance} to {float(Web3.from_wei(current_balance, 'ether'))} MON"
+            )
+            return True
+
         logger.error(f"[{self.account_index}] Balance didn't increase after {timeout} seconds")
         return False
     
@@ -196,7 +199,7 @@ class CrustySwap:
     async def get_minimum_deposit(self, network: str) -> int:
         """Get minimum deposit amount for a specific network."""
         try:
-            web3 = AsyncWeb3(AsyncWeb3.AsyncHTTPProvider(CRUSTY_SWAP_RPCS[network]))
+            web3 = get_chain_web3(CRUSTY_SWAP_RPCS[network])
             contract = web3.eth.contract(address=CONTRACT_ADDRESSES[network], abi=CRUSTY_SWAP_ABI)
             return await contract.functions.minimumDeposit().call()
         except Exception as e:
@@ -218,10 +221,22 @@ class CrustySwap:
             try:
                 eligible_networks = []
                 
-                networks_to_refuel_from = self.config.CRUSTY_SWAP.NETWORKS_TO_REFUEL_FROM
-                for network in networks_to_refuel_from:
-                    balance = await self.get_native_balance(network)
-                    if balance > await self.get_minimum_deposit(network):
+                networks_to_refuel_from = get_bridge_routes().networks(
+                    "crusty_refuel", self.account.address, self.config.CRUSTY_SWAP.NETWORKS_TO_REFUEL_FROM
+                )
+                # Balances and minimum deposits of all source chains are read concurrently
+                balances, minimum_deposits = await asyncio.gather(
+                    get_native_balances(
+                        {network: CRUSTY_SWAP_RPCS[network] for network in networks_to_refuel_from},
+                        self.account.address,
+                    ),
+                    asyncio.gather(
+                        *(self.get_minimum_deposit(network) for network in networks_to_refuel_from)
+                    ),
+                )
+                for network, minimum_deposit in zip(networks_to_refuel_from, minimum_deposits):
+                    balance = balances[network]
+                    if balance is not None and balance > minimum_deposit:
                         eligible_networks.append((network, balance))
                 return eligible_networks
             except Exception as e:
@@ -260,7 +275,7 @@ class CrustySwap:
                 logger.error(f"[{self.account_index}] No network found")
                 return False
             # Get web3 for the selected network
-            web3 = AsyncWeb3(AsyncWeb3.AsyncHTTPProvider(CRUSTY_SWAP_RPCS[network]))
+            web3 = get_chain_web3(CRUSTY_SWAP_RPCS[network])
             gas_params = await self.get_gas_params(web3)
             contract = web3.eth.contract(address=CONTRACT_ADDRESSES[network], abi=CRUSTY_SWAP_ABI)
             # Estimate gas using the same gas parameters from get_balances
@@ -324,6 +339,7 @@ class CrustySwap:
             # Sign and send transaction
             signed_tx = web3.eth.account.sign_transaction(tx, self.private_key)
             tx_hash = await web3.eth.send_raw_transaction(signed_tx.raw_transaction)
+            invalidate_balance(CRUSTY_SWAP_RPCS[network], self.account.address)
             
             logger.info(f"[{self.account_index}] Waiting for refuel transaction confirmation...")
             receipt = await web3.eth.wait_for_transaction_receipt(tx_hash)
@@ -425,24 +441,18 @@ class CrustySwap:
         # Use the timeout from config
         timeout = self.config.CRUSTY_SWAP.MAX_WAIT_TIME
         logger.info(f"[{self.account_index}] Waiting for balance to increase (max wait time: {timeout} seconds)...")
-        start_time = asyncio.get_event_loop().time()
-        
-        # Check balance every 5 seconds until timeout
-        while asyncio.get_event_loop().time() - start_time < timeout:
-            current_balance = await self.get_native_balance("Arbitrum")
-            if current_balance > initial_balance:
-                logger.success(
-                    f"[{self.account_index}] Balance increased from {self.monad_web3.from_wei(initial_balance, 'ether')} to {self.monad_web3.from_wei(current_balance, 'ether')} ETH"
-                )
-                return True
-            
-            # Log progress every 15 seconds
-            elapsed = int(asyncio.get_event_loop().time() - start_time)
-            if elapsed % 15 == 0:
-                logger.info(f"[{self.account_index}] Still waiting for balance to increase... ({elapsed}/{timeout} seconds)")
-            
-            await asyncio.sleep(5)
-        
+        current_balance = await get_fund_watcher().wait_for_balance(
+            CRUSTY_SWAP_RPCS["Arbitrum"],
+            self.account.address,
+            lambda balance: balance > initial_balance,
+            timeout,
+        )
+        if current_balance is not None:
+            logger.success(
+                f"[{self.account_index}] Balance increased from {self.monad_web3.from_wei(initial_balance, 'ether')} to {self.monad_web3.from_wei(current_balance, 'ether')} ETH"
+            )
+            return True
+
         logger.error(f"[{self.account_index}] Balance didn't increase after {timeout} seconds")
         return False
     
@@ -558,24 +568,18 @@ class CrustySwap:
         timeout = self.config.CRUSTY_SWAP.MAX_WAIT_TIME
         
         logger.info(f"[{self.account_index}] Waiting for balance to increase (max wait time: {timeout} seconds)...")
-        start_time = asyncio.get_event_loop().time()
-        
-        # Check balance every 5 seconds until timeout
-        while asyncio.get_event_loop().time() - start_time < timeout:
-            current_balance = await self._get_monad_balance(address)
-            if current_balance > initial_balance:
-                logger.success(
-                    f"[{self.account_index}] Balance increased from {initial_balance} to {current_balance} MON"
-                )
-                return True
-            
-            # Log progress every 15 seconds
-            elapsed = int(asyncio.get_event_loop().time() - start_time)
-            if elapsed % 15 == 0:
-                logger.info(f"[{self.account_index}] Still waiting for balance to increase... ({elapsed}/{timeout} seconds)")
-            
-            await asyncio.sleep(5)
-        
+        current_balance = await get_fund_watcher().wait_for_balance(
+            RPC_URL,
+            address,
+            lambda balance: float(Web3.from_wei(balance, "ether")) > initial_balance,
+            timeout,
+        )
+        if current_balance is not None:
+            logger.success(
+                f"[{self.account_index}] Balance increased from {initial_balance} to {float(Web3.from_wei(current_balance, 'ether'))} MON"
+            )
+            return True
+
         logger.error(f"[{self.account_index}] Balance didn't increase after {timeout} seconds")
         return False
     
@@ -618,7 +622,7 @@ class CrustySwap:
                 logger.error(f"[{self.account_index}] No network found")
                 return False
             # Get web3 for the selected network
-            web3 = AsyncWeb3(AsyncWeb3.AsyncHTTPProvider(CRUSTY_SWAP_RPCS[network]))
+            web3 = get_chain_web3(CRUSTY_SWAP_RPCS[network])
             gas_params = await self.get_gas_params(web3)
             contract = web3.eth.contract(address=REFUEL_FROM_ONE_TO_ALL_CONTRACT_ADDRESS[network], abi=REFUEL_FROM_ONE_TO_ALL_CONTRACT_ABI)
             # Estimate gas using the same gas parameters from get_balances
@@ -684,6 +688,7 @@ class CrustySwap:
             # Sign and send transaction
             signed_tx = web3.eth.account.sign_transaction(tx, self.private_key)
             tx_hash = await web3.eth.send_raw_transaction(signed_tx.raw_transaction)
+            invalidate_balance(CRUSTY_SWAP_RPCS[network], self.account.address)
             
             logger.info(f"[{self.account_index}] Waiting for refuel transaction confirmation...")
             receipt = await web3.eth.wait_for_transaction_receipt(tx_hash)
@@ -699,6 +704,10 @@ class CrustySwap:
         """Refuel MON from one of the supported networks."""
         try:
             addresses = self._convert_private_keys_to_addresses(private_keys_to_distribute)
+            if not self.config.CRUSTY_SWAP.BRIDGE_ALL:
+                return await self._pipelined_refuel_from_one_to_all(addresses)
+
+            # With BRIDGE_ALL every amount depends on what the previous deposit left
             for index, address in enumerate(addresses):
                 logger.info(f"[{self.account_index}] - [{index}/{len(addresses)}] Refueling from MAIN: {self.account.address} to: {address} ")
                 status = await self.send_refuel_from_one_to_all(address)
@@ -711,3 +720,108 @@ class CrustySwap:
         except Exception as e:
             logger.error(f"[{self.account_index}] Refuel failed: {str(e)}")
             return False
+
+    async def _pipelined_refuel_from_one_to_all(self, addresses) -> bool:
+        """Send deposits for all addresses with consecutive nonces, without waiting for each one."""
+        initial_balances = await asyncio.gather(
+            *(self._get_monad_balance(address) for address in addresses)
+        )
+        to_refuel = []
+        for address, initial_balance in zip(addresses, initial_balances):
+            if initial_balance is None:
+                logger.error(f"[{self.account_index}] Failed to get MON balance for address: {address}")
+                continue
+            if initial_balance > self.config.CRUSTY_SWAP.MINIMUM_BALANCE_TO_REFUEL:
+                logger.info(f"[{self.account_index}] {address} balance ({initial_balance}) is above minimum "
+                    f"({self.config.CRUSTY_SWAP.MINIMUM_BALANCE_TO_REFUEL}), skipping refuel"
+                )
+                continue
+            to_refuel.append((address, initial_balance))
+
+        if not to_refuel:
+            logger.info(f"[{self.account_index}] No addresses need a refuel")
+            return True
+
+        picked = await self.pick_network_to_refuel_from()
+        if not picked:
+            logger.error(f"[{self.account_index}] No network found")
+            return False
+        network, balance = picked
+
+        web3 = get_chain_web3(CRUSTY_SWAP_RPCS[network])
+        contract = web3.eth.contract(address=REFUEL_FROM_ONE_TO_ALL_CONTRACT_ADDRESS[network], abi=REFUEL_FROM_ONE_TO_ALL_CONTRACT_ABI)
+        # Fees are calculated once for the whole run, deposits only differ by recipient and value
+        gas_params = await self.get_gas_params(web3)
+        gas_estimate = await web3.eth.estimate_gas({
+            'from': self.account.address,
+            'to': REFUEL_FROM_ONE_TO_ALL_CONTRACT_ADDRESS[network],
+            'value': await contract.functions.minimumDeposit().call(),
+            'data': contract.functions.deposit(
+                    ZERO_ADDRESS,
+                    to_refuel[0][0]
+                )._encode_transaction_data(),
+        })
+        gas = int(gas_estimate * 1.1)  # Add 10% buffer to gas estimate
+
+        transfers = []
+        recipients = []
+        available_wei = balance
+        for address, initial_balance in to_refuel:
+            amount_ether = random.uniform(
+                self.config.CRUSTY_SWAP.AMOUNT_TO_REFUEL[0], 
+                self.config.CRUSTY_SWAP.AMOUNT_TO_REFUEL[1]
+                )
+            amount_wei = int(round(web3.to_wei(amount_ether, 'ether'), random.randint(8, 12)))
+
+            total_needed = amount_wei + gas * gas_params['maxFeePerGas']
+            if total_needed > available_wei:
+                logger.warning(f"[{self.account_index}] Not enough ETH on {network} to refuel {len(to_refuel) - len(transfers)} more addresses")
+                break
+            available_wei -= total_needed
+
+            transfers.append(Transfer(
+                to=REFUEL_FROM_ONE_TO_ALL_CONTRACT_ADDRESS[network],
+                value=amount_wei,
+                data=contract.functions.deposit(
+                        ZERO_ADDRESS,
+                        address
+                    )._encode_transaction_data(),
+                gas=gas,
+            ))
+            recipients.append((address, initial_balance))
+
+        if not transfers:
+            return False
+
+        has_enough_monad = await self.check_available_monad(sum(transfer.value for transfer in transfers), contract)
+        if not has_enough_monad:
+            logger.error(f"[{self.account_index}] Not enough MON in the contract for your amount of ETH deposit, try again later")
+            return False
+
+        async def fixed_gas_params():
+            return gas_params
+
+        engine = DisperseEngine(
+            self.private_key,
+            web3,
+            max_in_flight=self.config.DISPERSE.MAX_IN_FLIGHT,
+            gas_params=fixed_gas_params,
+        )
+        await engine.run(transfers)
+        invalidate_balance(CRUSTY_SWAP_RPCS[network], self.account.address)
+
+        waits = []
+        for transfer, (address, initial_balance) in zip(transfers, recipients):
+            explorer_url = f"{EXPLORER_URLS[network]}{transfer.tx_hash}"
+            if not transfer.success:
+                logger.error(f"[{self.account_index}] Refuel transaction to {address} failed! Explorer URL: {explorer_url}")
+                continue
+            logger.success(f"[{self.account_index}] Refuel transaction to {address} successful! Explorer URL: {explorer_url}")
+            if self.config.CRUSTY_SWAP.WAIT_FOR_FUNDS_TO_ARRIVE:
+                waits.append(self._wait_for_balance_increase(initial_balance, address))
+
+        # All recipients are watched together, the watcher reads their balances in one batch
+        if waits:
+            await asyncio.gather(*waits)
+
+        return any(transfer.success for transfer in transfers)
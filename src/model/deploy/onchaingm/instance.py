@@ -3,11 +3,11 @@ import random
 from eth_account import Account
 from loguru import logger
 from primp import AsyncClient
-from web3 import AsyncWeb3, Web3
-from typing import Dict
+from web3 import Web3
 
 from src.utils.config import Config
-from src.utils.constants import RPC_URL, EXPLORER_URL
+from src.utils.constants import EXPLORER_URL
+from src.utils.tx_builder import TxBuilder
 from .constants import (
     ONCHAINGM_PAYLOAD,
     ONCHAINGM_FEE,
@@ -30,97 +30,29 @@ class OnChainGM:
         self.session = session
 
         self.account: Account = Account.from_key(private_key=private_key)
-        self.web3 = AsyncWeb3(
-            AsyncWeb3.AsyncHTTPProvider(
-                RPC_URL,
-                request_kwargs={"proxy": (f"http://{proxy}") if proxy else None, "ssl": False},
-            )
-        )
-
-    async def get_gas_params(self) -> Dict[str, int]:
-        """Get current gas parameters from the network."""
-        latest_block = await self.web3.eth.get_block("latest")
-        base_fee = latest_block["baseFeePerGas"]
-        max_priority_fee = await self.web3.eth.max_priority_fee
-
-        # Calculate maxFeePerGas (base fee + priority fee)
-        max_fee = base_fee + max_priority_fee
-
-        return {
-            "maxFeePerGas": max_fee,
-            "maxPriorityFeePerGas": max_priority_fee,
-        }
-
-    async def estimate_gas(self, transaction: dict) -> int:
-        """Estimate gas for transaction and add some buffer."""
-        try:
-            estimated = await self.web3.eth.estimate_gas(transaction)
-            # Добавляем 10% к estimated gas для безопасности
-            return int(estimated * 1.1)
-        except Exception as e:
-            logger.warning(
-                f"[{self.account_index}] Error estimating gas: {e}. Using default gas limit"
-            )
-            raise e
+        self.tx_builder = TxBuilder(private_key, proxy)
+        self.web3 = self.tx_builder.web3
 
     async def deploy_contract(self):
         for retry in range(self.config.SETTINGS.ATTEMPTS):
             try:
                 logger.info(f"[{self.account_index}] Sending OnChainGM transaction...")
 
-                gas_params = await self.get_gas_params()
-
-                # Создаем базовую транзакцию для оценки газа
-                transaction = {
-                    "from": self.account.address,
-                    "to": "0x0000000000000000000000000000000000000000",  # Нулевой адрес для отправки данных
-                    "data": ONCHAINGM_PAYLOAD,  # Используем фиксированный пейлоад
-                    "chainId": 10143,
-                    "type": 2,
-                    "value": Web3.to_wei(
-                        ONCHAINGM_FEE, "ether"
-                    ),  # Фиксированная плата 0.00005 MON
-                }
-
-                # Оцениваем газ
-                try:
-                    estimated_gas = await self.estimate_gas(transaction)
-                    logger.info(
-                        f"[{self.account_index}] Estimated gas: {estimated_gas}"
-                    )
-                except Exception as e:
-                    logger.warning(
-                        f"[{self.account_index}] Error estimating gas: {e}. Using default gas limit"
-                    )
-                    raise e
-
-                # Добавляем остальные параметры транзакции
-                transaction.update(
-                    {
-                        "nonce": await self.web3.eth.get_transaction_count(
-                            self.account.address,
-                            "latest",
-                        ),
-                        "gas": estimated_gas,
-                        **gas_params,
-                    }
-                )
-
-                signed_txn = self.web3.eth.account.sign_transaction(
-                    transaction, self.private_key
-                )
-                tx_hash = await self.web3.eth.send_raw_transaction(
-                    signed_txn.raw_transaction
-                )
-
-                # Ждем подтверждения транзакции
+                # Payload is fixed, so is its gas: reuse the learned limit
                 logger.info(
                     f"[{self.account_index}] Waiting for transaction confirmation..."
                 )
-                receipt = await self.web3.eth.wait_for_transaction_receipt(tx_hash)
+                tx_hash, receipt = await self.tx_builder.send_and_wait(
+                    to="0x0000000000000000000000000000000000000000",  # Нулевой адрес для отправки данных
+                    data=ONCHAINGM_PAYLOAD,  # Используем фиксированный пейлоад
+                    value=Web3.to_wei(
+                        ONCHAINGM_FEE, "ether"
+                    ),  # Фиксированная плата 0.00005 MON
+                    cache_gas=True,
+                )
 
                 logger.success(
-                    f"[{self.account_index}] Successfully sent OnChainGM transaction. TX: {EXPLORER_URL}{tx_hash.hex()}"
+                    f"[{self.account_index}] Successfully sent OnChainGM transaction. TX: {EXPLORER_URL}{tx_hash}"
                 )
                 return True
 
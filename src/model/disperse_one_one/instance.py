@@ -7,6 +7,7 @@ from typing import List
 from src.utils.constants import RPC_URL
 from src.utils.config import Config
 from .utils import get_all_balances, WalletInfo, WalletGroup, process_single_transfer
+from .planner import plan_disperse
 
 
 class DisperseOneOne:
@@ -51,30 +52,21 @@ class DisperseOneOne:
     async def process_wallet_group(
         self, wallet_group: WalletGroup, semaphore: asyncio.Semaphore, config: Config
     ) -> bool:
-        """Process all transfers for a single wallet group sequentially."""
-        results = []
-
-        # Process transfers one by one within the group
-        for farm_wallet in wallet_group.farm_wallets:
-            result = await process_single_transfer(
-                self.web3,
-                farm_wallet,
-                wallet_group.main_wallet.address,
-                semaphore,
-                config,
-            )
-            results.append(result)
-
-            # Add pause between transfers within the group
-            if result:  # If transfer was successful
-                random_pause = random.uniform(
-                    config.SETTINGS.PAUSE_BETWEEN_SWAPS[0],
-                    config.SETTINGS.PAUSE_BETWEEN_SWAPS[1],
-                )
-                logger.info(
-                    f"Transfer completed. Pausing for {random_pause:.2f} seconds..."
+        """Process all transfers for a single wallet group."""
+        # Every farm wallet is its own sender with its own nonce,
+        # so the transfers of a group don't have to wait for each other
+        results = await asyncio.gather(
+            *(
+                process_single_transfer(
+                    self.web3,
+                    farm_wallet,
+                    wallet_group.main_wallet.address,
+                    semaphore,
+                    config,
                 )
-                await asyncio.sleep(random_pause)
+                for farm_wallet in wallet_group.farm_wallets
+            )
+        )
 
         return all(results)  # Return True only if all transfers succeeded
 
@@ -115,54 +107,24 @@ class DisperseOneOne:
         self, main_wallets: List[WalletInfo], farm_wallets: List[WalletInfo]
     ) -> List[WalletGroup]:
         """Create groups of wallets for dispersing funds."""
-        # Filter out farm wallets with zero balance and copy the list
-        available_farm_wallets = [
-            wallet for wallet in farm_wallets if wallet.balance_eth > 0
-        ]
-        wallet_groups = []
-
         min_balance_range = self.config.DISPERSE.MIN_BALANCE_FOR_DISPERSE
 
-        for main_wallet in main_wallets:
-            # Get random target balance between min and max from config
-            target_balance = random.uniform(min_balance_range[0], min_balance_range[1])
-
-            # Skip if main wallet already has enough balance
-            if main_wallet.balance_eth >= target_balance:
-                continue
-
-            needed_balance = target_balance - main_wallet.balance_eth
-            current_farm_wallets = []
-            current_sum = 0
-
-            # Try to find enough farm wallets to reach target balance
-            for farm_wallet in available_farm_wallets[:]:
-                current_farm_wallets.append(farm_wallet)
-                current_sum += farm_wallet.balance_eth
-                available_farm_wallets.remove(farm_wallet)
-
-                if current_sum >= needed_balance:
-                    break
-
-            # Create group even if we didn't reach target balance but have some funds
-            if current_sum > 0:
-                group = WalletGroup(
-                    main_wallet=main_wallet,
-                    farm_wallets=current_farm_wallets,
-                    target_balance=target_balance,
-                )
-                wallet_groups.append(group)
-                if current_sum < needed_balance:
-                    logger.warning(
-                        f"Insufficient balance for main wallet {main_wallet.address[:8]}... "
-                        f"(needed: {needed_balance}, found: {current_sum}, but proceeding anyway)"
-                    )
-            else:
-                # Return farm wallets back to pool if we couldn't get any balance
-                available_farm_wallets.extend(current_farm_wallets)
-                logger.warning(
-                    f"No available farm wallets with balance for main wallet "
-                    f"{main_wallet.address[:8]}..."
-                )
+        # Get random target balance between min and max from config
+        targets = {
+            main_wallet.address: random.uniform(
+                min_balance_range[0], min_balance_range[1]
+            )
+            for main_wallet in main_wallets
+        }
+
+        # Transfers pay the same gas price as in process_single_transfer
+        gas_price = await self.web3.eth.gas_price
+        plan = plan_disperse(main_wallets, farm_wallets, targets, gas_price)
+
+        for main_wallet in plan.underfunded:
+            logger.warning(
+                f"Insufficient balance for main wallet {main_wallet.address[:8]}..., "
+                f"proceeding with what farm wallets have"
+            )
 
-        return wallet_groups
+        return plan.groups
@@ -0,0 +1,148 @@
+import bisect
+import random
+import time
+from dataclasses import dataclass
+from typing import Dict, List, Tuple
+
+from loguru import logger
+
+from src.utils.disperse_engine import NATIVE_TRANSFER_GAS
+from .utils import WalletInfo, WalletGroup
+
+
+PLAN_TIME_LIMIT = 5  # seconds spent looking for a plan with fewer transfers
+MAX_PLAN_ATTEMPTS = 500
+
+
+@dataclass
+class DispersePlan:
+    groups: List[WalletGroup]
+    transactions: int
+    total_gas_wei: int
+    # Main wallets that stay below target because farm balances ran out
+    underfunded: List[WalletInfo]
+
+
+def _assign(
+    deficits: List[Tuple[WalletInfo, int]],
+    farms: List[Tuple[int, int]],
+) -> Tuple[List[Tuple[WalletInfo, List[int], int]], int, int]:
+    """
+    Cover deficits in the given order with as few farm wallets as possible.
+
+    A deficit takes the smallest farm that covers it alone, otherwise the
+    largest farm left and tries again with the rest.
+
+    Args:
+        deficits: (main wallet, missing wei)
+        farms: (net wei the farm can send, farm index), sorted by amount
+
+    Returns:
+        ([(main wallet, farm indices, wei still missing)], transfers, wei left uncovered)
+    """
+    pool = list(farms)
+    assignments = []
+    transfers = 0
+    uncovered = 0
+
+    for main_wallet, deficit in deficits:
+        taken = []
+        remaining = deficit
+        while remaining > 0 and pool:
+            position = bisect.bisect_left(pool, (remaining, -1))
+            if position < len(pool):
+                amount, index = pool.pop(position)
+            else:
+                amount, index = pool.pop()
+            taken.append(index)
+            remaining -= amount
+
+        remaining = max(remaining, 0)
+        assignments.append((main_wallet, taken, remaining))
+        transfers += len(taken)
+        uncovered += remaining
+
+    return assignments, transfers, uncovered
+
+
+def plan_disperse(
+    main_wallets: List[WalletInfo],
+    farm_wallets: List[WalletInfo],
+    targets: Dict[str, float],
+    gas_price_wei: int,
+    time_limit: float = PLAN_TIME_LIMIT,
+) -> DispersePlan:
+    """
+    Assign farm wallets to main wallets with the fewest transfers.
+
+    Every farm wallet sends its whole balance minus gas in one transfer, so
+    the number of transfers is the number of farm wallets used. The first
+    plan handles the largest deficits first, then shuffled orders are tried
+    until time_limit runs out; the plan leaving the least MON uncovered with
+    the fewest transfers wins.
+
+    Args:
+        main_wallets: Wallets to top up
+        farm_wallets: Wallets to empty
+        targets: Main wallet address -> target balance in MON
+        gas_price_wei: Gas price the transfers will pay
+    """
+    transfer_cost = NATIVE_TRANSFER_GAS * gas_price_wei
+
+    deficits = []
+    for main_wallet in main_wallets:
+        target_wei = int(targets[main_wallet.address] * 10**18)
+        if main_wallet.balance_wei < target_wei:
+            deficits.append((main_wallet, target_wei - main_wallet.balance_wei))
+
+    # Farms that can't pay for their own transfer are useless
+    farms = sorted(
+        (wallet.balance_wei - transfer_cost, index)
+        for index, wallet in enumerate(farm_wallets)
+        if wallet.balance_wei > transfer_cost
+    )
+
+    order = sorted(deficits, key=lambda item: item[1], reverse=True)
+    best = _assign(order, farms)
+    attempts = 1
+
+    deadline = time.monotonic() + time_limit
+    # One transfer per deficit with nothing uncovered can't be beaten
+    while (
+        best[1] > len(deficits) or best[2] > 0
+    ) and attempts < MAX_PLAN_ATTEMPTS and time.monotonic() < deadline:
+        random.shuffle(order)
+        candidate = _assign(order, farms)
+        if (candidate[2], candidate[1]) < (best[2], best[1]):
+            best = candidate
+        attempts += 1
+
+    assignments, transactions, uncovered = best
+    groups = [
+        WalletGroup(
+            main_wallet=main_wallet,
+            farm_wallets=[farm_wallets[index] for index in indices],
+            target_balance=targets[main_wallet.address],
+        )
+        for main_wallet, indices, _ in assignments
+        if indices
+    ]
+    underfunded = [main_wallet for main_wallet, _, missing in assignments if missing > 0]
+
+    plan = DispersePlan(
+        groups=groups,
+        transactions=transactions,
+        total_gas_wei=transactions * transfer_cost,
+        underfunded=underfunded,
+    )
+    logger.info(
+        f"Disperse plan: {len(deficits)} main wallets to top up, {transactions} transfers, "
+        f"~{plan.total_gas_wei / 10**18:.6f} MON gas ({attempts} plans tried)"
+    )
+    if underfunded:
+        logger.warning(
+            f"Not enough farm balance for {len(underfunded)} main wallets, "
+            f"{uncovered / 10**18:.4f} MON missing in total"
+        )
+    return plan
+
@@ -16,6 +16,7 @@ import time
 from src.model.dusted.browser_login import dusted_browser_login
 from src.utils.config import Config
 from src.utils.constants import RPC_URL, EXPLORER_URL
+from src.utils.retry import should_retry
 
 
 def with_retries(func):
@@ -39,11 +40,11 @@ def with_retries(func):
                 last_exception = e
 
                 if attempt < attempts:
-                    pause_time = random.uniform(pause_range[0], pause_range[1])
                     logger.warning(
-                        f"[{self.account_index}] Attempt {attempt}/{attempts} failed for {func.__name__}: {e}. Retrying in {pause_time:.2f}s"
+                        f"[{self.account_index}] Attempt {attempt}/{attempts} failed for {func.__name__}: {e}. Retrying..."
                     )
-                    await asyncio.sleep(pause_time)
+                    if not await should_retry(e, attempt - 1, pause=pause_range):
+                        break
                 else:
                     logger.error(
                         f"[{self.account_index}] All {attempts} attempts for {func.__name__} failed: {e}"
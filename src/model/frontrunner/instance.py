@@ -3,10 +3,10 @@ import random
 from eth_account import Account
 from loguru import logger
 from primp import AsyncClient
-from web3 import AsyncWeb3
 from src.model.frontrunner.constants import ABI, CONTRACT_ADDRESS
 from src.utils.config import Config
-from src.utils.constants import RPC_URL, EXPLORER_URL
+from src.utils.constants import EXPLORER_URL
+from src.utils.tx_builder import TxBuilder
 
 
 class Frontrunner:
@@ -25,12 +25,8 @@ class Frontrunner:
         self.session = session
 
         self.account: Account = Account.from_key(private_key=private_key)
-        self.web3 = AsyncWeb3(
-             AsyncWeb3.AsyncHTTPProvider(
-                 RPC_URL,
-                 request_kwargs={"proxy": (f"http://{proxy}") if proxy else None, "ssl": False},
-             )
-        )     
+        self.tx_builder = TxBuilder(private_key, proxy)
+        self.web3 = self.tx_builder.web3
         self.contract = self.web3.eth.contract(
             address=self.web3.to_checksum_address(CONTRACT_ADDRESS),
             abi=ABI
@@ -41,39 +37,24 @@ class Frontrunner:
         for i in range(amount_of_transactions):
             try:
                 logger.info(f"[{self.account_index}] Transaction {i+1} of {amount_of_transactions}")                
-                # Get current nonce
-                nonce = await self.web3.eth.get_transaction_count(self.account.address)
-                
-                # Build the transaction properly
-                frontrun_tx = await self.contract.functions.frontrun().build_transaction(
-                    {
-                        "from": self.account.address,
-                        "nonce": nonce,
+                # Calldata is encoded locally, nonce and chainId come from the builder
+                tx_hash, receipt = await self.tx_builder.send_and_wait(
+                    to=CONTRACT_ADDRESS,
+                    data=self.contract.functions.frontrun()._encode_transaction_data(),
+                    gas_params={
                         "maxFeePerGas": self.web3.to_wei(60, "gwei"),
                         "maxPriorityFeePerGas": self.web3.to_wei(2, "gwei"),
-                    }
-                )
-                
-                # Estimate gas and update the transaction
-                gas = await self.web3.eth.estimate_gas(frontrun_tx)
-                frontrun_tx['gas'] = gas
-                
-                signed_txn = self.web3.eth.account.sign_transaction(
-                    frontrun_tx, self.account.key
-                )
-                tx_hash = await self.web3.eth.send_raw_transaction(signed_txn.raw_transaction)
-                logger.info(f"[{self.account_index}] Waiting for transaction confirmation...")
-                receipt = await self.web3.eth.wait_for_transaction_receipt(
-                    tx_hash, poll_latency=2
+                    },
+                    cache_gas=True,
                 )
 
                 if receipt["status"] == 1:
                     logger.success(
-                        f"Transaction successful! Explorer URL: {EXPLORER_URL}{tx_hash.hex()}"
+                        f"Transaction successful! Explorer URL: {EXPLORER_URL}{tx_hash}"
                     )
                 else:
                     logger.error(
-                        f"Transaction failed! Explorer URL: {EXPLORER_URL}{tx_hash.hex()}"
+                        f"Transaction failed! Explorer URL: {EXPLORER_URL}{tx_hash}"
                     )
                 random_pause = random.uniform(  
                     self.config.FRONT_RUNNER.PAUSE_BETWEEN_TRANSACTIONS[0],
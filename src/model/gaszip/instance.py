@@ -1,4 +1,4 @@
-from web3 import AsyncWeb3
+from web3 import AsyncWeb3, Web3
 from eth_account import Account
 from typing import Dict, Optional, List, Tuple
 from decimal import Decimal
@@ -6,6 +6,15 @@ import random
 import asyncio
 from loguru import logger
 from src.utils.config import Config
+from src.utils.fund_watcher import get_fund_watcher
+from src.utils.chains import (
+    get_chain_web3,
+    get_fee_data,
+    get_native_balance,
+    get_native_balances,
+    invalidate_balance,
+)
+from src.model.help.bridge_routes import get_bridge_routes
 from src.model.gaszip.constants import (
     GASZIP_RPCS, 
     REFUEL_ADDRESS, 
@@ -47,13 +56,8 @@ class Gaszip:
     async def get_native_balance(self, network: str) -> float:
         """Get native token balance for a specific network."""
         try:
-            web3 = AsyncWeb3(
-                AsyncWeb3.AsyncHTTPProvider(
-                    GASZIP_RPCS[network], request_kwargs={"ssl": False}
-                )
-            )
-            balance_wei = await web3.eth.get_balance(self.account.address)
-            return float(web3.from_wei(balance_wei, "ether"))
+            balance_wei = await get_native_balance(GASZIP_RPCS[network], self.account.address)
+            return float(Web3.from_wei(balance_wei, "ether"))
         except Exception as e:
             logger.error(f"[{self.account_index}] Failed to get balance for {network}: {str(e)}")
             return 0
@@ -64,24 +68,18 @@ class Gaszip:
         timeout = self.config.GASZIP.MAX_WAIT_TIME
         
         logger.info(f"[{self.account_index}] Waiting for balance to increase (max wait time: {timeout} seconds)...")
-        start_time = asyncio.get_event_loop().time()
-        
-        # Check balance every 5 seconds until timeout
-        while asyncio.get_event_loop().time() - start_time < timeout:
-            current_balance = await self.get_monad_balance()
-            if current_balance > initial_balance:
-                logger.success(
-                    f"[{self.account_index}] Balance increased from {initial_balance} to {current_balance} MON"
-                )
-                return True
-            
-            # Log progress every 15 seconds
-            elapsed = int(asyncio.get_event_loop().time() - start_time)
-            if elapsed % 15 == 0:
-                logger.info(f"[{self.account_index}] Still waiting for balance to increase... ({elapsed}/{timeout} seconds)")
-            
-            await asyncio.sleep(5)
-        
+        current_balance = await get_fund_watcher().wait_for_balance(
+            RPC_URL,
+            self.account.address,
+            lambda balance: float(Web3.from_wei(balance, "ether")) > initial_balance,
+            timeout,
+        )
+        if current_balance is not None:
+            logger.success(
+                f"[{self.account_index}] Balance increased from {initial_balance} to {float(Web3.from_wei(current_balance, 'ether'))} MON"
+            )
+            return True
+
         logger.error(f"[{self.account_index}] Balance didn't increase after {timeout} seconds")
         return False
 
@@ -102,8 +100,6 @@ class Gaszip:
                 )
                 return None
             
-            eligible_networks = []
-            
             # Determine amount to refuel based on configuration
             if not self.config.GASZIP.BRIDGE_ALL:
                 # Use the configured range if not bridging all
@@ -117,78 +113,23 @@ class Gaszip:
                 amount_to_refuel = None
                 logger.info(f"[{self.account_index}] Will bridge maximum amount based on balance")
             
-            for network in self.config.GASZIP.NETWORKS_TO_REFUEL_FROM:
-                balance = await self.get_native_balance(network)
-                logger.info(f"[{self.account_index}] {network} balance: {balance}")
-                
-                if self.config.GASZIP.BRIDGE_ALL:
-                    # Get a Web3 instance for this network
-                    web3 = AsyncWeb3(
-                        AsyncWeb3.AsyncHTTPProvider(
-                            GASZIP_RPCS[network], request_kwargs={"ssl": False}
-                        )
-                    )
-
-                    # Build the actual transaction to estimate its gas cost
-                    try:
-                        # Get the current gas parameters (EIP-1559 or legacy)
-                        # Store these for reuse in the actual transaction
-                        gas_params = await self.get_gas_params(web3)
-                        
-                        # Create transaction object that would be used for bridging
-                        tx = {
-                            'from': self.account.address,
-                            'to': REFUEL_ADDRESS,
-                            'data': REFUEL_CALLLDATA,
-                            'value': web3.to_wei(0.0001, 'ether'),  # Dummy value for estimation
-                            **gas_params
-                        }
-                        
-                        # Estimate gas for this exact transaction
-                        estimated_gas = await web3.eth.estimate_gas(tx)
-                        
-                        # Calculate total cost with a 10% buffer for safety
-                        gas_price_wei = gas_params.get('maxFeePerGas', gas_params.get('gasPrice', 0))
-                        total_gas_cost_wei = int(estimated_gas * gas_price_wei * 1.1)
-                        
-                        # Convert to ETH
-                        gas_reserve = float(web3.from_wei(total_gas_cost_wei, 'ether')) + random.uniform(0.000005, 0.00001)    
-                        logger.info(f"[{self.account_index}] Estimated gas for {network} transaction: {estimated_gas} units")
-                        logger.info(f"[{self.account_index}] Calculated gas reserve: {gas_reserve} ETH")
-                        
-                    except Exception as e:
-                        logger.error(f"[{self.account_index}] Failed to estimate transaction cost: {str(e)}")
-                        continue  # Skip this network if we can't estimate gas
-                    
-                    # Only proceed if we have more than the gas cost
-                    if balance > gas_reserve:
-                        max_to_bridge = balance - gas_reserve
-                        
-                        # If balance exceeds max amount, apply the limit with randomization
-                        if self.config.GASZIP.BRIDGE_ALL_MAX_AMOUNT and max_to_bridge > self.config.GASZIP.BRIDGE_ALL_MAX_AMOUNT:
-                            # Apply 1-3% random reduction to avoid same amount transfers
-                            random_reduction = random.uniform(0.01, 0.05)
-                            network_amount = self.config.GASZIP.BRIDGE_ALL_MAX_AMOUNT * (1 - random_reduction)
-                            logger.info(f"[{self.account_index}] Limiting bridge amount to {network_amount} ETH (max: {self.config.GASZIP.BRIDGE_ALL_MAX_AMOUNT} with {random_reduction*100:.1f}% reduction)")
-                        else:
-                            network_amount = max_to_bridge
-                            logger.info(f"[{self.account_index}] Will bridge {network_amount} ETH (full available balance minus gas cost of {gas_reserve} ETH)")
-                        
-                        eligible_networks.append((network, network_amount, gas_params))
-                else:
-                    # For fixed amount refueling, we still need to get gas params
-                    if balance > amount_to_refuel:
-                        try:
-                            web3 = AsyncWeb3(
-                                AsyncWeb3.AsyncHTTPProvider(
-                                    GASZIP_RPCS[network], request_kwargs={"ssl": False}
-                                )
-                            )
-                            gas_params = await self.get_gas_params(web3)
-                            eligible_networks.append((network, amount_to_refuel, gas_params))
-                        except Exception as e:
-                            logger.error(f"[{self.account_index}] Failed to get gas params for {network}: {str(e)}")
-                            continue
+            # Networks ruled out by the pre-run scan are not read again
+            networks_to_refuel_from = get_bridge_routes().networks(
+                "gaszip", self.account.address, self.config.GASZIP.NETWORKS_TO_REFUEL_FROM
+            )
+            # Balances of all source chains are read concurrently
+            balances = await get_native_balances(
+                {network: GASZIP_RPCS[network] for network in networks_to_refuel_from},
+                self.account.address,
+            )
+            results = await asyncio.gather(
+                *(
+                    self._evaluate_network(network, float(Web3.from_wei(balance, "ether")), amount_to_refuel)
+                    for network, balance in balances.items()
+                    if balance is not None
+                )
+            )
+            eligible_networks = [result for result in results if result]
             
             if not eligible_networks:
                 logger.warning(f"[{self.account_index}] No networks with sufficient balance found")
@@ -205,11 +146,74 @@ class Gaszip:
             logger.error(f"[{self.account_index}] Error checking balances: {str(e)}")
             return None
 
+    async def _evaluate_network(
+        self, network: str, balance: float, amount_to_refuel: Optional[float]
+    ) -> Optional[Tuple[str, float, Dict[str, int]]]:
+        """Check one source network, returns (network, amount, gas_params) if it can refuel."""
+        logger.info(f"[{self.account_index}] {network} balance: {balance}")
+        web3 = get_chain_web3(GASZIP_RPCS[network])
+
+        if self.config.GASZIP.BRIDGE_ALL:
+            # Build the actual transaction to estimate its gas cost
+            try:
+                # Get the current gas parameters (EIP-1559 or legacy)
+                # Store these for reuse in the actual transaction
+                gas_params = await self.get_gas_params(web3)
+                
+                # Create transaction object that would be used for bridging
+                tx = {
+                    'from': self.account.address,
+                    'to': REFUEL_ADDRESS,
+                    'data': REFUEL_CALLLDATA,
+                    'value': web3.to_wei(0.0001, 'ether'),  # Dummy value for estimation
+                    **gas_params
+                }
+                
+                # Estimate gas for this exact transaction
+                estimated_gas = await web3.eth.estimate_gas(tx)
+                
+                # Calculate total cost with a 10% buffer for safety
+                gas_price_wei = gas_params.get('maxFeePerGas', gas_params.get('gasPrice', 0))
+                total_gas_cost_wei = int(estimated_gas * gas_price_wei * 1.1)
+                
+                # Convert to ETH
+                gas_reserve = float(web3.from_wei(total_gas_cost_wei, 'ether')) + random.uniform(0.000005, 0.00001)    
+                logger.info(f"[{self.account_index}] Estimated gas for {network} transaction: {estimated_gas} units")
+                logger.info(f"[{self.account_index}] Calculated gas reserve: {gas_reserve} ETH")
+                
+            except Exception as e:
+                logger.error(f"[{self.account_index}] Failed to estimate transaction cost: {str(e)}")
+                return None  # Skip this network if we can't estimate gas
+            
+            # Only proceed if we have more than the gas cost
+            if balance > gas_reserve:
+                max_to_bridge = balance - gas_reserve
+                
+                # If balance exceeds max amount, apply the limit with randomization
+                if self.config.GASZIP.BRIDGE_ALL_MAX_AMOUNT and max_to_bridge > self.config.GASZIP.BRIDGE_ALL_MAX_AMOUNT:
+                    # Apply 1-3% random reduction to avoid same amount transfers
+                    random_reduction = random.uniform(0.01, 0.05)
+                    network_amount = self.config.GASZIP.BRIDGE_ALL_MAX_AMOUNT * (1 - random_reduction)
+                    logger.info(f"[{self.account_index}] Limiting bridge amount to {network_amount} ETH (max: {self.config.GASZIP.BRIDGE_ALL_MAX_AMOUNT} with {random_reduction*100:.1f}% reduction)")
+                else:
+                    network_amount = max_to_bridge
+                    logger.info(f"[{self.account_index}] Will bridge {network_amount} ETH (full available balance minus gas cost of {gas_reserve} ETH)")
+                
+                return (network, network_amount, gas_params)
+            return None
+
+        # For fixed amount refueling, we still need to get gas params
+        if balance > amount_to_refuel:
+            try:
+                gas_params = await self.get_gas_params(web3)
+                return (network, amount_to_refuel, gas_params)
+            except Exception as e:
+                logger.error(f"[{self.account_index}] Failed to get gas params for {network}: {str(e)}")
+        return None
+
     async def get_gas_params(self, web3: AsyncWeb3) -> Dict[str, int]:
         """Get gas parameters for transaction."""
-        latest_block = await web3.eth.get_block('latest')
-        base_fee = latest_block['baseFeePerGas']
-        max_priority_fee = await web3.eth.max_priority_fee
+        base_fee, max_priority_fee = await get_fee_data(web3)
         max_fee = int((base_fee + max_priority_fee) * 1.5)
         
         return {
@@ -234,11 +238,7 @@ class Gaszip:
             logger.info(f"[{self.account_index}] Refueling from {network} with {amount} ETH")
             
             # Get web3 for the selected network
-            web3 = AsyncWeb3(
-                AsyncWeb3.AsyncHTTPProvider(
-                    GASZIP_RPCS[network], request_kwargs={"ssl": False}
-                )
-            )
+            web3 = get_chain_web3(GASZIP_RPCS[network])
             
             # Convert amount to wei
             amount_wei = web3.to_wei(amount, "ether")
@@ -268,6 +268,7 @@ class Gaszip:
             # Sign and send transaction
             signed_tx = web3.eth.account.sign_transaction(tx, self.private_key)
             tx_hash = await web3.eth.send_raw_transaction(signed_tx.raw_transaction)
+            invalidate_balance(GASZIP_RPCS[network], self.account.address)
             
             logger.info(f"[{self.account_index}] Waiting for refuel transaction confirmation...")
             receipt = await web3.eth.wait_for_transaction_receipt(tx_hash)
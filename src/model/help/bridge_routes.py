@@ -0,0 +1,187 @@
+import asyncio
+from typing import Dict, Iterable, List, Optional
+
+from eth_account import Account
+from loguru import logger
+from web3 import Web3
+
+from src.utils.config import Config
+from src.model.help.task_plan import flatten_tasks
+from src.utils.chains import get_chain_web3, get_native_balances_bulk
+from src.model.gaszip.constants import GASZIP_RPCS
+from src.model.memebridge.constansts import MEMEBRIDGE_RPCS
+from src.model.crusty_swap.constants import (
+    CRUSTY_SWAP_RPCS,
+    CONTRACT_ADDRESSES,
+    CRUSTY_SWAP_ABI,
+)
+from src.model.testnet_bridge.constants import TESTNET_BRIDGE_RPCS
+
+
+# Tasks that bridge from Arbitrum/Base/Optimism and can be routed by the scan
+BRIDGE_TASKS = ["gaszip", "memebridge", "crusty_refuel", "testnet_bridge"]
+
+# Tasks that move funds onto the source chains, a scan before them goes stale
+FUNDING_TASKS = ["cex_withdrawal"]
+
+
+class BridgeRoutes:
+    """
+    Routing table of the bridge tasks: task -> address -> networks to bridge from.
+
+    Filled once before the run by prescan_bridge_routes(). An empty list
+    means the account has nothing to bridge, a missing entry means the
+    account was not scanned and the module checks all configured networks.
+    """
+
+    def __init__(self):
+        self._routes: Dict[str, Dict[str, List[str]]] = {}
+
+    def set(self, task: str, address: str, networks: List[str]):
+        self._routes.setdefault(task, {})[address.lower()] = networks
+
+    def networks(self, task: str, address: str, default: List[str]) -> List[str]:
+        """Networks to check for the task, default if the account was not scanned."""
+        routed = self._routes.get(task, {}).get(address.lower())
+        if routed is None:
+            return default
+        return [network for network in default if network in routed]
+
+    def has_route(self, address: str, tasks: Iterable[str]) -> bool:
+        """
+        False only if every one of the tasks was scanned and has nowhere to
+        bridge from. Tasks that are not bridges are never scanned, so any
+        of them in the list makes the account worth running.
+        """
+        for task in tasks:
+            routed = self._routes.get(task, {}).get(address.lower())
+            if routed is None or routed:
+                return True
+        return False
+
+
+async def _crusty_minimum_deposits(networks: List[str]) -> Dict[str, int]:
+    async def read(network: str) -> int:
+        try:
+            web3 = get_chain_web3(CRUSTY_SWAP_RPCS[network])
+            contract = web3.eth.contract(
+                address=CONTRACT_ADDRESSES[network], abi=CRUSTY_SWAP_ABI
+            )
+            return await contract.functions.minimumDeposit().call()
+        except Exception as e:
+            logger.error(f"Failed to get Crusty minimum deposit on {network}: {e}")
+            return 0
+
+    deposits = await asyncio.gather(*(read(network) for network in networks))
+    return dict(zip(networks, deposits))
+
+
+def _fixed_amount_floor(section) -> int:
+    """Smallest balance that can pay for the configured amount."""
+    if section.BRIDGE_ALL:
+        return Web3.to_wei(0.0001, "ether")
+    return Web3.to_wei(section.AMOUNT_TO_REFUEL[0], "ether")
+
+
+async def _bridge_tasks(config: Config, flow_tasks: List[str]) -> Dict[str, tuple]:
+    """task -> (rpcs, networks, check(network, balance_wei) -> bool) for the tasks in the preset"""
+    tasks = {}
+
+    if "gaszip" in flow_tasks:
+        gaszip_floor = _fixed_amount_floor(config.GASZIP)
+        tasks["gaszip"] = (
+            GASZIP_RPCS,
+            config.GASZIP.NETWORKS_TO_REFUEL_FROM,
+            lambda network, balance: balance > gaszip_floor,
+        )
+
+    if "memebridge" in flow_tasks:
+        tasks["memebridge"] = (
+            MEMEBRIDGE_RPCS,
+            config.MEMEBRIDGE.NETWORKS_TO_REFUEL_FROM,
+            lambda network, balance: balance > Web3.to_wei(0.0001, "ether"),
+        )
+
+    if "crusty_refuel" in flow_tasks:
+        minimum_deposits = await _crusty_minimum_deposits(
+            config.CRUSTY_SWAP.NETWORKS_TO_REFUEL_FROM
+        )
+        tasks["crusty_refuel"] = (
+            CRUSTY_SWAP_RPCS,
+            config.CRUSTY_SWAP.NETWORKS_TO_REFUEL_FROM,
+            lambda network, balance: balance > minimum_deposits[network],
+        )
+
+    if "testnet_bridge" in flow_tasks:
+        testnet_floor = _fixed_amount_floor(config.TESTNET_BRIDGE)
+        tasks["testnet_bridge"] = (
+            TESTNET_BRIDGE_RPCS,
+            config.TESTNET_BRIDGE.NETWORKS_TO_REFUEL_FROM,
+            lambda network, balance: balance > testnet_floor,
+        )
+
+    return tasks
+
+
+async def prescan_bridge_routes(private_keys: List[str], config: Config) -> Optional[BridgeRoutes]:
+    """
+    Read source-chain balances of all accounts before the run and fill the routing table.
+
+    Balances are read in batches per chain, all chains at once. Nothing is
+    scanned if the preset has no bridge tasks or funds the source chains itself.
+    """
+    flow_tasks = flatten_tasks(config.FLOW.TASKS)
+    if any(task in FUNDING_TASKS for task in flow_tasks):
+        return None
+    if not any(task in BRIDGE_TASKS for task in flow_tasks):
+        return None
+
+    bridge_tasks = await _bridge_tasks(config, flow_tasks)
+
+    addresses = [Account.from_key(key).address for key in private_keys]
+
+    # One bulk read per RPC url, modules that share a url share the read
+    rpc_urls = list(
+        {
+            rpcs[network]
+            for rpcs, networks, _ in bridge_tasks.values()
+            for network in networks
+            if network in rpcs
+        }
+    )
+    logger.info(
+        f"Scanning source-chain balances of {len(addresses)} accounts on {len(rpc_urls)} chains..."
+    )
+    results = await asyncio.gather(
+        *(get_native_balances_bulk(rpc_url, addresses) for rpc_url in rpc_urls)
+    )
+    balances = dict(zip(rpc_urls, results))
+
+    routes = get_bridge_routes()
+    for task, (rpcs, networks, check) in bridge_tasks.items():
+        skipped = 0
+        for address in addresses:
+            routed = []
+            for network in networks:
+                if network not in rpcs:
+                    continue
+                balance = balances[rpcs[network]].get(address)
+                # Unknown balance: leave the network to the module's own check
+                if balance is None or check(network, balance):
+                    routed.append(network)
+            routes.set(task, address, routed)
+            if not routed:
+                skipped += 1
+        logger.info(
+            f"{task}: {len(addresses) - skipped} accounts can bridge, {skipped} have no source balance"
+        )
+
+    return routes
+
+
+# Singleton pattern
+def get_bridge_routes() -> BridgeRoutes:
+    """Get bridge routing table singleton"""
+    if not hasattr(get_bridge_routes, "_routes"):
+        get_bridge_routes._routes = BridgeRoutes()
+    return get_bridge_routes._routes
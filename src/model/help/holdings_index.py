@@ -0,0 +1,286 @@
+import asyncio
+import json
+import os
+from typing import Dict, Iterable, List, Optional
+
+from eth_account import Account
+from loguru import logger
+from web3 import AsyncWeb3, Web3
+
+from src.utils.config import Config
+from src.utils.constants import CHAIN_ID, TOKENS, ERC20_ABI
+from src.utils.provider import batch_web3, create_web3
+from src.model.help.task_plan import flatten_tasks
+
+
+INDEX_FILE = "data/holdings_index.json"
+
+WMON_CONTRACT = "0x760AfE86e5de5fa0Ee542fc7B7B713e1c5425701"
+
+# Tasks that sell everything they find and read the index to find it
+SELL_ALL_TASKS = ["collect_all_to_monad", "ambient", "octo_swap", "madness_swaps"]
+
+LOGS_BLOCK_RANGE = 100  # the Monad RPC refuses eth_getLogs over more blocks
+MAX_CATCHUP_BLOCKS = 20000  # beyond this, re-reading balances is cheaper than logs
+WALLETS_PER_FILTER = 100  # addresses in one topic filter
+MAX_BATCH_SIZE = 100  # requests per JSON-RPC batch
+
+TRANSFER_TOPIC = Web3.to_hex(Web3.keccak(text="Transfer(address,address,uint256)"))
+# WMON mints and burns without a Transfer event
+DEPOSIT_TOPIC = Web3.to_hex(Web3.keccak(text="Deposit(address,uint256)"))
+WITHDRAWAL_TOPIC = Web3.to_hex(Web3.keccak(text="Withdrawal(address,uint256)"))
+
+
+def _known_tokens() -> List[str]:
+    """Token addresses the sell-all modules can route, read directly when a wallet is new"""
+    # The swap modules import this one, so their token lists are imported on use
+    from src.model.monad_xyz.constants import AMBIENT_TOKENS
+    from src.model.swaps.octo_swap.constants import AVAILABLE_TOKENS as OCTO_TOKENS
+    from src.model.swaps.madness.constants import AVAILABLE_TOKENS as MADNESS_TOKENS
+
+    addresses = [address for token, address in TOKENS.items() if token != "native"]
+    addresses += [token["address"] for token in AMBIENT_TOKENS.values()]
+    addresses += [token["address"] for token in OCTO_TOKENS.values() if not token["native"]]
+    addresses += [token["address"] for token in MADNESS_TOKENS.values() if not token["native"]]
+    return list(dict.fromkeys(address.lower() for address in addresses))
+
+
+def _topic_address(address: str) -> str:
+    return "0x" + "0" * 24 + address[2:].lower()
+
+
+def _log_address(topic) -> str:
+    return "0x" + bytes(topic)[-20:].hex()
+
+
+class HoldingsIndex:
+    """
+    ERC20 balances of our wallets, kept up to date from Transfer logs.
+
+    A new wallet gets its known-token balances read once at some block,
+    after that only the logs since the last indexed block are scanned, in
+    LOGS_BLOCK_RANGE chunks for all wallets at once. Tokens nobody listed
+    (memecoins bought elsewhere) show up as soon as a wallet receives them.
+    The table is saved to INDEX_FILE, so the next run starts where this
+    one stopped.
+    """
+
+    def __init__(self, web3: AsyncWeb3, path: str = INDEX_FILE):
+        self.web3 = web3
+        self.path = path
+        self.last_block = 0
+        # wallet -> token -> balance in wei
+        self.holdings: Dict[str, Dict[str, int]] = {}
+        self._lock = asyncio.Lock()
+
+    def load(self):
+        if not os.path.exists(self.path):
+            return
+        try:
+            with open(self.path, "r") as f:
+                data = json.load(f)
+        except Exception as e:
+            logger.warning(f"Holdings index is unreadable, starting over: {e}")
+            return
+
+        if data.get("chain_id") != CHAIN_ID:
+            return
+        self.last_block = data["last_block"]
+        self.holdings = {
+            wallet: {token: int(balance) for token, balance in tokens.items()}
+            for wallet, tokens in data["wallets"].items()
+        }
+
+    def save(self):
+        data = {
+            "chain_id": CHAIN_ID,
+            "last_block": self.last_block,
+            "wallets": {
+                wallet: {token: str(balance) for token, balance in tokens.items() if balance}
+                for wallet, tokens in self.holdings.items()
+            },
+        }
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(data, f)
+        os.replace(tmp_path, self.path)
+
+    def is_indexed(self, address: str) -> bool:
+        return address.lower() in self.holdings
+
+    async def track(self, addresses: Iterable[str]):
+        """Add wallets to the index and bring the whole index up to the latest block."""
+        async with self._lock:
+            head = await self.web3.eth.block_number
+            new_wallets = [address.lower() for address in addresses if not self.is_indexed(address)]
+
+            if self.holdings and head - self.last_block > MAX_CATCHUP_BLOCKS:
+                logger.info(f"Holdings index is {head - self.last_block} blocks behind, re-reading balances")
+                await self._seed(list(self.holdings), head)
+            elif self.holdings:
+                await self._catch_up(head)
+
+            if new_wallets:
+                logger.info(f"Reading token balances of {len(new_wallets)} new wallets for the holdings index...")
+                await self._seed(new_wallets, head)
+
+            self.last_block = head
+            self.save()
+
+    async def refresh(self):
+        """Scan the logs of blocks mined since the last refresh."""
+        head = await self.web3.eth.block_number
+        async with self._lock:
+            # Somebody else already caught up while we waited
+            if self.last_block >= head:
+                return
+            if head - self.last_block > MAX_CATCHUP_BLOCKS:
+                await self._seed(list(self.holdings), head)
+            else:
+                await self._catch_up(head)
+            self.last_block = head
+            self.save()
+
+    async def held_tokens(self, address: str, tokens: Iterable[str]) -> Optional[List[str]]:
+        """
+        The tokens the wallet holds, out of the given ones.
+
+        Returns:
+            Token addresses with a non-zero balance, None if the wallet is not indexed
+        """
+        if not self.is_indexed(address):
+            return None
+        try:
+            await self.refresh()
+        except Exception as e:
+            logger.warning(f"Failed to refresh holdings index: {e}")
+            return None
+
+        held = self.holdings[address.lower()]
+        return [token for token in tokens if held.get(token.lower(), 0) > 0]
+
+    async def _seed(self, wallets: List[str], block: int):
+        """Read balances of the known and already seen tokens at the given block."""
+        contract = self.web3.eth.contract(abi=ERC20_ABI)
+        known = _known_tokens()
+        reads = []
+        for wallet in wallets:
+            tokens = dict.fromkeys(known + list(self.holdings.get(wallet, {})))
+            reads += [(wallet, token) for token in tokens]
+
+        balances: Dict[str, Dict[str, int]] = {wallet: {} for wallet in wallets}
+        for start in range(0, len(reads), MAX_BATCH_SIZE):
+            chunk = reads[start : start + MAX_BATCH_SIZE]
+            async with self._batch_web3() as web3:
+                async with web3.batch_requests() as batch:
+                    for wallet, token in chunk:
+                        batch.add(
+                            web3.eth.call(
+                                {
+                                    "to": Web3.to_checksum_address(token),
+                                    "data": contract.encode_abi(
+                                        "balanceOf", args=[Web3.to_checksum_address(wallet)]
+                                    ),
+                                },
+                                block,
+                            )
+                        )
+                    results = await batch.async_execute()
+
+            for (wallet, token), result in zip(chunk, results):
+                balance = int.from_bytes(bytes(result), "big") if result else 0
+                if balance:
+                    balances[wallet][token] = balance
+
+        self.holdings.update(balances)
+
+    async def _catch_up(self, head: int):
+        wallets = list(self.holdings)
+        wmon = WMON_CONTRACT.lower()
+
+        filters = []
+        for from_block in range(self.last_block + 1, head + 1, LOGS_BLOCK_RANGE):
+            to_block = min(from_block + LOGS_BLOCK_RANGE - 1, head)
+            for start in range(0, len(wallets), WALLETS_PER_FILTER):
+                topics = [_topic_address(wallet) for wallet in wallets[start : start + WALLETS_PER_FILTER]]
+                block_range = {"fromBlock": from_block, "toBlock": to_block}
+                # Spent by our wallets: Transfer from, WMON Deposit/Withdrawal by
+                filters.append(("out", {**block_range, "topics": [[TRANSFER_TOPIC, DEPOSIT_TOPIC, WITHDRAWAL_TOPIC], topics]}))
+                # Received by our wallets
+                filters.append(("in", {**block_range, "topics": [TRANSFER_TOPIC, None, topics]}))
+
+        # Logs are applied only after all reads succeed, a failed refresh leaves the table as it was
+        found = []
+        for start in range(0, len(filters), MAX_BATCH_SIZE):
+            chunk = filters[start : start + MAX_BATCH_SIZE]
+            async with self._batch_web3() as web3:
+                async with web3.batch_requests() as batch:
+                    for _, log_filter in chunk:
+                        batch.add(web3.eth.get_logs(log_filter))
+                    results = await batch.async_execute()
+            found += [(side, logs) for (side, _), logs in zip(chunk, results)]
+
+        for side, logs in found:
+            for log in logs:
+                self._apply(side, log, wmon)
+
+    def _batch_web3(self):
+        # Batches stay off the shared client: every account without a proxy uses it
+        provider = self.web3.provider
+        return batch_web3(provider.proxy, provider.endpoint_uri)
+
+    def _apply(self, side: str, log, wmon: str):
+        topics = log["topics"]
+        data = bytes(log["data"])
+        # ERC721 Transfer has the token id indexed and no data
+        if len(data) != 32:
+            return
+        token = log["address"].lower()
+        value = int.from_bytes(data, "big")
+        event = Web3.to_hex(topics[0])
+
+        if event == TRANSFER_TOPIC:
+            if len(topics) != 3:
+                return
+            wallet = _log_address(topics[1] if side == "out" else topics[2])
+            sign = -1 if side == "out" else 1
+        elif token == wmon:
+            wallet = _log_address(topics[1])
+            sign = 1 if event == DEPOSIT_TOPIC else -1
+        else:
+            return
+
+        held = self.holdings.get(wallet)
+        if held is None:
+            return
+        held[token] = max(held.get(token, 0) + sign * value, 0)
+
+
+async def build_holdings_index(private_keys: List[str], config: Config) -> Optional[HoldingsIndex]:
+    """Load the holdings index and catch it up for the run's wallets, if the preset sells everything."""
+    flow_tasks = flatten_tasks(config.FLOW.TASKS)
+    if not any(task in SELL_ALL_TASKS for task in flow_tasks):
+        return None
+
+    index = get_holdings_index()
+    index.load()
+    try:
+        await index.track(Account.from_key(key).address for key in private_keys)
+    except Exception as e:
+        # Without the index the modules probe their token lists as before
+        logger.error(f"Failed to build holdings index: {e}")
+        index.holdings = {}
+        return None
+
+    tokens = sum(len(held) for held in index.holdings.values())
+    logger.info(f"Holdings index at block {index.last_block}: {tokens} token balances")
+    return index
+
+
+# Singleton pattern
+def get_holdings_index() -> HoldingsIndex:
+    """Get holdings index singleton"""
+    if not hasattr(get_holdings_index, "_index"):
+        get_holdings_index._index = HoldingsIndex(create_web3())
+    return get_holdings_index._index
@@ -0,0 +1,216 @@
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional
+
+from eth_account import Account
+from loguru import logger
+from web3 import AsyncWeb3, Web3
+
+from src.utils.config import Config
+from src.utils.constants import RPC_URL, ERC20_ABI
+from src.utils.provider import batch_web3
+from src.model.help.task_plan import flatten_tasks
+from src.model.nfts.morkie import (
+    MONAI_YAKUZA_ABI,
+    MONHOG_CONTRACT_ADDRESS,
+    MONARCH_CONTRACT_ADDRESS,
+    GTM_CONTRACT_ADDRESS,
+)
+from src.model.nfts.monaigg_nft import (
+    MONAI_DeFAI,
+    NFT_CONTRACT_ADDRESS as MONAIGG_CONTRACT_ADDRESS,
+)
+from src.model.lilchogstars_mint.instance import (
+    ERC1155_ABI as LILCHOGSTARS_ABI,
+    NFT_CONTRACT_ADDRESS as LILCHOGSTARS_CONTRACT_ADDRESS,
+)
+from src.model.kintsu.constants import STAKE_ADDRESS as KINTSU_STAKE_ADDRESS
+from src.model.magma.constants import STAKED_TOKEN as MAGMA_STAKED_TOKEN
+
+
+MAX_BATCH_SIZE = 100  # reads per JSON-RPC batch
+
+
+@dataclass
+class Eligibility:
+    """
+    How to tell up front that a task has nothing to do for an account.
+
+    read builds one batchable request for the address, done gets its result.
+    Stable results can only change by the task itself (minted NFTs, staked
+    tokens), unstable ones (MON balance) are changed by other tasks too.
+    """
+
+    read: Callable[[AsyncWeb3, str], Any]
+    done: Callable[[Any], bool]
+    stable: bool = True
+
+
+def _eligibility_rules(config: Config, web3: AsyncWeb3, flow_tasks: List[str]) -> Dict[str, Eligibility]:
+    """task -> Eligibility for the tasks in the preset that check their state before acting"""
+
+    def balance_of(address: str, abi) -> Callable[[AsyncWeb3, str], Any]:
+        contract = web3.eth.contract(address=Web3.to_checksum_address(address), abi=abi)
+        return lambda web3, wallet: contract.functions.balanceOf(wallet)
+
+    def mon_balance(web3: AsyncWeb3, wallet: str):
+        return web3.eth.get_balance(wallet)
+
+    rules = {
+        # Mints stop when the wallet already holds the NFT
+        "morkie_monhog": Eligibility(
+            balance_of(MONHOG_CONTRACT_ADDRESS, MONAI_YAKUZA_ABI), lambda balance: balance >= 1
+        ),
+        "morkie_monarch": Eligibility(
+            balance_of(MONARCH_CONTRACT_ADDRESS, MONAI_YAKUZA_ABI), lambda balance: balance >= 1
+        ),
+        "morkie_gtm": Eligibility(
+            balance_of(GTM_CONTRACT_ADDRESS, MONAI_YAKUZA_ABI), lambda balance: balance >= 1
+        ),
+        # The target is random within the range, the upper bound is always enough
+        "monaigg": Eligibility(
+            balance_of(MONAIGG_CONTRACT_ADDRESS, MONAI_DeFAI),
+            lambda balance: balance >= config.MONAIYAKUZA.MAX_PER_ACCOUNT[1],
+        ),
+        "gaszip": Eligibility(
+            mon_balance,
+            lambda balance: float(Web3.from_wei(balance, "ether")) >= config.GASZIP.MINIMUM_BALANCE_TO_REFUEL,
+            stable=False,
+        ),
+        "memebridge": Eligibility(
+            mon_balance,
+            lambda balance: float(Web3.from_wei(balance, "ether")) > config.MEMEBRIDGE.MINIMUM_BALANCE_TO_REFUEL,
+            stable=False,
+        ),
+        "crusty_refuel": Eligibility(
+            mon_balance,
+            lambda balance: float(Web3.from_wei(balance, "ether")) > config.CRUSTY_SWAP.MINIMUM_BALANCE_TO_REFUEL,
+            stable=False,
+        ),
+    }
+
+    lilchogstars = web3.eth.contract(
+        address=Web3.to_checksum_address(LILCHOGSTARS_CONTRACT_ADDRESS), abi=LILCHOGSTARS_ABI
+    )
+    rules["lilchogstars"] = Eligibility(
+        lambda web3, wallet: lilchogstars.functions.mintedCount(wallet),
+        lambda minted: minted >= config.LILCHOGSTARS.MAX_AMOUNT_FOR_EACH_ACCOUNT[1],
+    )
+
+    # Staking tasks with STAKE off only unstake, nothing staked means nothing to do
+    if not config.KINTSU.STAKE:
+        rules["kintsu"] = Eligibility(
+            balance_of(KINTSU_STAKE_ADDRESS, ERC20_ABI),
+            lambda staked: not config.KINTSU.UNSTAKE or staked == 0,
+        )
+    if not config.MAGMA.STAKE:
+        rules["magma"] = Eligibility(
+            balance_of(MAGMA_STAKED_TOKEN, ERC20_ABI),
+            lambda staked: not config.MAGMA.UNSTAKE or staked == 0,
+        )
+
+    return {task: rule for task, rule in rules.items() if task in flow_tasks}
+
+
+def plan_slots(tasks_list: list) -> List[List[str]]:
+    """
+    Task slots of one account as Start.flow plans them: one slot per task,
+    a [] group is one slot filled by any of its tasks, () and {} add a slot
+    per task.
+    """
+    slots = []
+    for task in tasks_list:
+        if isinstance(task, list):
+            slots.append(flatten_tasks(task))
+        elif isinstance(task, (tuple, set, frozenset)):
+            slots.extend(flatten_tasks([subtask]) for subtask in task)
+        else:
+            slots.append(flatten_tasks([task]))
+    return slots
+
+
+class Preflight:
+    """
+    Tasks found already done for each account: address -> task -> stable.
+
+    Filled once before the run by run_preflight(). Stable results hold for
+    the whole run, unstable ones only until another task of the account ran.
+    """
+
+    def __init__(self):
+        self._done: Dict[str, Dict[str, bool]] = {}
+
+    def set(self, address: str, task: str, stable: bool):
+        self._done.setdefault(address.lower(), {})[task] = stable
+
+    def skip(self, address: str, task: str, changed: bool = False) -> bool:
+        """True if the task would do nothing. changed: some task of the account already ran."""
+        stable = self._done.get(address.lower(), {}).get(task.lower())
+        if stable is None:
+            return False
+        return stable or not changed
+
+    def has_work(self, address: str, tasks: List[str]) -> bool:
+        """
+        False if every task of the preset is done for the account. Nothing
+        runs then, so unstable results are as good as stable ones.
+        """
+        return any(not self.skip(address, task) for task in tasks)
+
+    def skipped_slots(self, address: str, slots: List[List[str]]) -> int:
+        return sum(1 for slot in slots if all(self.skip(address, task) for task in slot))
+
+
+async def run_preflight(private_keys: List[str], config: Config) -> Optional[Preflight]:
+    """
+    Check the declared eligibility of all accounts before the run.
+
+    Reads for all accounts and tasks go to the Monad RPC in JSON-RPC
+    batches on a client of their own. Nothing is checked if no task of
+    the preset declares eligibility.
+    """
+    flow_tasks = flatten_tasks(config.FLOW.TASKS)
+    # Contracts of the rules are bound to the batch-only client, it is held for the whole scan
+    async with batch_web3(rpc_url=RPC_URL) as web3:
+        rules = _eligibility_rules(config, web3, flow_tasks)
+        if not rules:
+            return None
+
+        addresses = [Account.from_key(key).address for key in private_keys]
+        reads = [(address, task) for address in addresses for task in rules]
+        logger.info(
+            f"Preflight: checking {len(rules)} tasks for {len(addresses)} accounts "
+            f"({len(reads)} reads)..."
+        )
+
+        preflight = get_preflight()
+        done = 0
+        for start in range(0, len(reads), MAX_BATCH_SIZE):
+            chunk = reads[start : start + MAX_BATCH_SIZE]
+            try:
+                async with web3.batch_requests() as batch:
+                    for address, task in chunk:
+                        batch.add(rules[task].read(web3, address))
+                    results = await batch.async_execute()
+            except Exception as e:
+                # Unchecked tasks just run as usual
+                logger.error(f"Preflight: failed to read {len(chunk)} values: {e}")
+                continue
+
+            for (address, task), result in zip(chunk, results):
+                try:
+                    if rules[task].done(result):
+                        preflight.set(address, task, rules[task].stable)
+                        done += 1
+                except Exception as e:
+                    logger.warning(f"Preflight: bad {task} result for {address}: {e}")
+
+    logger.info(f"Preflight: {done} of {len(reads)} task checks are already done")
+    return preflight
+
+
+# Singleton pattern
+def get_preflight() -> Preflight:
+    """Get preflight results singleton"""
+    if not hasattr(get_preflight, "_preflight"):
+        get_preflight._preflight = Preflight()
+    return get_preflight._preflight
@@ -1,12 +1,13 @@
+import asyncio
 from web3 import AsyncWeb3
 from eth_account import Account
 from loguru import logger
-from typing import Optional, Tuple
+from typing import List, Optional, Tuple
 from dataclasses import dataclass
 from threading import Lock
 
-from src.utils.constants import RPC_URL
 from src.utils.config import Config
+from src.utils.batch_executor import get_batch_executor
 
 
 @dataclass
@@ -20,12 +21,8 @@ class WalletInfo:
 
 class WalletStats:
     def __init__(self, config: Config, proxy: str):
-        # Используем публичную RPC ноду Base
-        self.w3 = AsyncWeb3(
-            AsyncWeb3.AsyncHTTPProvider(
-                RPC_URL, request_kwargs={"proxy": (f"http://{proxy}") if proxy else None, "ssl": False}
-            )
-        )
+        # Чтения всех аккаунтов идут общими batch-запросами
+        self.executor = get_batch_executor()
         self.config = config
         self._lock = Lock()
 
@@ -47,12 +44,14 @@ class WalletStats:
             account = Account.from_key(private_key)
             address = account.address
 
-            # Получаем баланс
-            balance_wei = await self.w3.eth.get_balance(address)
-            balance_eth = self.w3.from_wei(balance_wei, "ether")
-
-            # Получаем количество транзакций (nonce)
-            tx_count = await self.w3.eth.get_transaction_count(address)
+            # Баланс и количество транзакций (nonce) вместе с другими аккаунтами
+            balance_wei, tx_count = await self.executor.gather(
+                [
+                    lambda w3: w3.eth.get_balance(address),
+                    lambda w3: w3.eth.get_transaction_count(address),
+                ]
+            )
+            balance_eth = AsyncWeb3.from_wei(balance_wei, "ether")
 
             wallet_info = WalletInfo(
                 account_index=account_index,
@@ -75,3 +74,25 @@ class WalletStats:
         except Exception as e:
             logger.error(f"Error getting wallet stats: {e}")
             return False
+
+
+async def collect_wallet_stats(
+    accounts: List[Tuple[int, str]], config: Config
+) -> int:
+    """
+    The logs task for many accounts at once.
+
+    Args:
+        accounts: (account_index, private_key) pairs
+
+    Returns:
+        Number of wallets read successfully
+    """
+    wallet_stats = WalletStats(config, None)
+    results = await asyncio.gather(
+        *(
+            wallet_stats.get_wallet_stats(private_key, account_index)
+            for account_index, private_key in accounts
+        )
+    )
+    return sum(1 for result in results if result)
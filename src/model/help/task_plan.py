@@ -0,0 +1,77 @@
+import random
+from typing import Awaitable, Callable, Dict, List, Optional, Tuple
+
+from src.utils.config import Config
+from src.model.help.stats import collect_wallet_stats
+
+
+# Tasks that only talk to HTTP APIs (or just read the chain) and never send
+# transactions, so they can run next to the account's on-chain tasks
+OFFCHAIN_TASKS = ["superboard", "monsternad_whitelist", "logs"]
+
+PARALLEL = "parallel_group"
+
+# Resource class of the tasks that need more than the account's THREADS slot,
+# limited by the CONCURRENCY section of config.yaml
+TASK_CLASSES = {
+    "dusted": "browser",
+    "cex_withdrawal": "cex",
+    "faucet": "captcha",
+    "swaps": "rpc",
+    "ambient": "rpc",
+    "bean": "rpc",
+    "izumi": "rpc",
+    "collect_all_to_monad": "rpc",
+    "octo_swap": "rpc",
+    "madness_swaps": "rpc",
+}
+
+# Tasks that run for all accounts at once when the preset has nothing else:
+# task -> runner taking [(account_index, private_key)], reads go out in shared batches
+BATCH_RUNNERS: Dict[str, Callable[[List[Tuple[int, str]], Config], Awaitable[int]]] = {
+    "logs": collect_wallet_stats,
+}
+
+
+def flatten_tasks(tasks_list: list) -> List[str]:
+    """All task names of FLOW.TASKS, including the ones inside (), [] and {}."""
+    names = []
+    for task in tasks_list:
+        if isinstance(task, (list, tuple, set, frozenset)):
+            names.extend(flatten_tasks(list(task)))
+        else:
+            names.append(task.lower())
+    return names
+
+
+def task_class(task: str) -> Optional[str]:
+    return TASK_CLASSES.get(task.lower())
+
+
+def is_offchain(task: str) -> bool:
+    return task.lower() in OFFCHAIN_TASKS
+
+
+def order_parallel_group(group: set) -> List[str]:
+    """
+    Tasks of a { } group in execution order.
+
+    Off-chain tasks come first, they are started in background right away.
+    On-chain tasks follow in random order and run one by one as usual.
+    A () inside the group adds all its tasks, a [] is not allowed in a set.
+    """
+    tasks = []
+    for item in group:
+        tasks.extend(item if isinstance(item, tuple) else [item])
+
+    offchain = [task for task in tasks if is_offchain(task)]
+    onchain = [task for task in tasks if not is_offchain(task)]
+    random.shuffle(offchain)
+    random.shuffle(onchain)
+    return offchain + onchain
+
+
+def is_batch_only(tasks: List[str]) -> bool:
+    """True if every task of the preset has a batch runner ("skip" does nothing anyway)"""
+    real_tasks = [task for task in tasks if task != "skip"]
+    return bool(real_tasks) and all(task in BATCH_RUNNERS for task in real_tasks)
@@ -11,6 +11,7 @@ from src.utils.config import Config
 from src.utils.constants import EXPLORER_URL, RPC_URL
 from .constants import STAKE_ADDRESS, STAKE_ABI
 from src.utils.constants import ERC20_ABI
+from src.utils.account_context import AccountContext
 
 
 class Kintsu:
@@ -21,20 +22,26 @@ class Kintsu:
         private_key: str,
         config: Config,
         session: AsyncClient,
+        context: Optional[AccountContext] = None,
     ):
         self.account_index = account_index
         self.proxy = proxy
         self.private_key = private_key
         self.config = config
         self.session = session
+        self.context = context
 
         self.account: Account = Account.from_key(private_key=private_key)
-        self.web3 = AsyncWeb3(
-             AsyncWeb3.AsyncHTTPProvider(
-                 RPC_URL,
-                 request_kwargs={"proxy": (f"http://{proxy}") if proxy else None, "ssl": False},
-             )
-        ) 
+        if context:
+            # Shared client of the account, its transactions reset the balance cache
+            self.web3 = context.web3
+        else:
+            self.web3 = AsyncWeb3(
+                 AsyncWeb3.AsyncHTTPProvider(
+                     RPC_URL,
+                     request_kwargs={"proxy": (f"http://{proxy}") if proxy else None, "ssl": False},
+                 )
+            ) 
     async def get_gas_params(self) -> Dict[str, int]:
         """Get current gas parameters from the network."""
         latest_block = await self.web3.eth.get_block("latest")
@@ -153,7 +160,10 @@ class Kintsu:
     async def get_token_balance(self, token_symbol: str) -> Decimal:
         """Get balance of specified token."""
         if token_symbol == "native":
-            balance_wei = await self.web3.eth.get_balance(self.account.address)
+            if self.context:
+                balance_wei = await self.context.balances.get_balance()
+            else:
+                balance_wei = await self.web3.eth.get_balance(self.account.address)
             return Decimal(balance_wei) / Decimal(10**18)
 
     async def get_staked_token_balance(self) -> int:
@@ -164,9 +174,12 @@ class Kintsu:
             int: The balance in wei
         """
         try:
-            # Create contract instance
-            contract = self.web3.eth.contract(address=STAKE_ADDRESS, abi=ERC20_ABI)
-            balance = await contract.functions.balanceOf(self.account.address).call()
+            if self.context:
+                balance = await self.context.balances.get_token_balance(STAKE_ADDRESS)
+            else:
+                # Create contract instance
+                contract = self.web3.eth.contract(address=STAKE_ADDRESS, abi=ERC20_ABI)
+                balance = await contract.functions.balanceOf(self.account.address).call()
             
             logger.info(f"[{self.account_index}] Staked token balance: {Web3.from_wei(balance, 'ether')} tokens")
             return balance
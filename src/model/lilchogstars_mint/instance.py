@@ -45,6 +45,8 @@ ERC1155_ABI = [
     },
 ]
 
+NFT_CONTRACT_ADDRESS = "0xb33D7138c53e516871977094B249C8f2ab89a4F4"
+
 
 class Lilchogstars:
     def __init__(
@@ -68,9 +70,7 @@ class Lilchogstars:
                  request_kwargs={"proxy": (f"http://{proxy}") if proxy else None, "ssl": False},
              )
         ) 
-        self.nft_contract_address = (
-            "0xb33D7138c53e516871977094B249C8f2ab89a4F4"  # Updated contract address
-        )
+        self.nft_contract_address = NFT_CONTRACT_ADDRESS
         self.nft_contract: Contract = self.web3.eth.contract(
             address=self.nft_contract_address, abi=ERC1155_ABI
         )
@@ -3,7 +3,9 @@ import asyncio
 from loguru import logger
 from eth_account import Account
 from eth_account.signers.local import LocalAccount
-from curl_cffi import requests
+
+from src.utils.client import get_client_manager
+from src.utils.circuit_breaker import get_breaker
 
 # List of common user agents
 USER_AGENTS = [
@@ -43,26 +45,17 @@ async def get_mint_data(
     """
     Get mint data from MagicEden API with improved error handling and headers.
     """
-    if proxy:
-        curl_session = requests.AsyncSession(
-            impersonate="chrome131",
-            proxies={"http": f"http://{proxy}", "https": f"http://{proxy}"},
-            headers=get_random_headers(),
-            verify=False,
-            timeout=30,
-        )
-    else:
-        curl_session = requests.AsyncSession(
-            impersonate="chrome131",
-            headers=get_random_headers(),
-            verify=False,
-            timeout=30,
-        )
+    curl_session = get_client_manager().get_curl(proxy)
+    breaker = get_breaker("MagicEden API")
+    headers = get_random_headers()
 
     error_log_frequency = 5
     error = ""
 
     for attempt in range(1, max_retries + 1):
+        # Fails fast while MagicEden is known to be down
+        breaker.check()
+
         should_log = (
             attempt % error_log_frequency == 0 or attempt == 1 or attempt == max_retries
         )
@@ -88,6 +81,7 @@ async def get_mint_data(
             response = await curl_session.post(
                 "https://api-mainnet.magiceden.io/v4/self_serve/nft/mint_token",
                 json=payload,
+                headers=headers,
             )
 
             # Check if we got an access denied response
@@ -97,10 +91,11 @@ async def get_mint_data(
                         f"Access denied (attempt {attempt}/{max_retries}). Retrying with new headers..."
                     )
                 # Rotate headers and continue
-                curl_session.headers = get_random_headers()
+                headers = get_random_headers()
                 continue
 
             if response.status_code == 200:
+                breaker.record_success()
                 return response.json()
 
             # Handle specific error cases
@@ -113,6 +108,7 @@ async def get_mint_data(
                 return "already_minted"
 
             elif "no healthy upstream" in response.text:
+                breaker.record_failure()
                 if should_log:
                     logger.error(f"❌ MagicEden API is down now. Trying again...")
                 await asyncio.sleep(3)
@@ -134,6 +130,7 @@ async def get_mint_data(
                     )
 
             elif response.status_code >= 500:
+                breaker.record_failure()
                 if attempt < max_retries:
                     wait_time = retry_delay * attempt
                     if should_log:
@@ -152,6 +149,7 @@ async def get_mint_data(
                     )
 
         except Exception as e:
+            breaker.record_failure()
             if attempt < max_retries:
                 wait_time = retry_delay * attempt
                 if "connection" in str(e).lower():
@@ -171,5 +169,4 @@ async def get_mint_data(
                 logger.error(f"❌ Failed after {max_retries} attempts: {str(e)}")
                 return None
 
-    await curl_session.close()
     return error if error else None
@@ -7,6 +7,7 @@ from web3 import AsyncWeb3
 from src.utils.config import Config
 from src.model.magiceden.get_mint_data import get_mint_data
 from src.utils.constants import EXPLORER_URL, RPC_URL
+from src.utils.prefetch import Prefetched
 
 
 class MagicEden:
@@ -30,6 +31,18 @@ class MagicEden:
             AsyncWeb3.AsyncHTTPProvider(RPC_URL, request_kwargs=proxy_settings)
         )
 
+        # (nft_contract, mint_data) fetched during the pause before the task
+        self._prepared_mint = Prefetched()
+
+    async def prepare(self):
+        """Pick the NFT contract and fetch its mint data ahead of mint()"""
+        nft_contract = self.web3.to_checksum_address(
+            random.choice(self.config.MAGICEDEN.NFT_CONTRACTS)
+        )
+        mint_data = await get_mint_data(self.proxy, nft_contract, self.account)
+        if mint_data:
+            self._prepared_mint.put((nft_contract, mint_data))
+
     def get_random_gas_limit(self, min_gas: int = 180000, max_gas: int = 280000) -> int:
         """Generate random gas limit within range"""
         return random.randint(min_gas, max_gas)
@@ -41,16 +54,22 @@ class MagicEden:
             bool: True if minting was successful, False otherwise
         """
         try:
-            # Randomly select NFT contract from config
-            nft_contract_raw = random.choice(self.config.MAGICEDEN.NFT_CONTRACTS)
-            nft_contract = self.web3.to_checksum_address(nft_contract_raw)
+            prepared = self._prepared_mint.take()
+            if prepared:
+                nft_contract, mint_data = prepared
+            else:
+                # Randomly select NFT contract from config
+                nft_contract_raw = random.choice(self.config.MAGICEDEN.NFT_CONTRACTS)
+                nft_contract = self.web3.to_checksum_address(nft_contract_raw)
+                mint_data = None
 
             logger.info(
                 f"[{self.account_index}] | 🚀 Starting MagicEden mint for contract: {nft_contract}"
             )
 
             # Get mint data from MagicEden API
-            mint_data = await get_mint_data(self.proxy, nft_contract, self.account)
+            if mint_data is None:
+                mint_data = await get_mint_data(self.proxy, nft_contract, self.account)
 
             # Handle error cases
             if mint_data == "already_minted":
@@ -1,11 +1,19 @@
-from web3 import AsyncWeb3
+from web3 import AsyncWeb3, Web3
 from eth_account import Account
 from typing import Dict, Optional, List, Tuple
 from decimal import Decimal
 import random
-import asyncio
 from loguru import logger
 from src.utils.config import Config
+from src.utils.fund_watcher import get_fund_watcher
+from src.utils.chains import (
+    get_chain_web3,
+    get_fee_data,
+    get_native_balance,
+    get_native_balances,
+    invalidate_balance,
+)
+from src.model.help.bridge_routes import get_bridge_routes
 from src.model.memebridge.constansts import (
     MEMEBRIDGE_RPCS, 
     MEMEBRIDGE_ADDRESS, 
@@ -47,8 +55,7 @@ class Memebridge:
     async def get_native_balance(self, network: str) -> float:
         """Get native token balance for a specific network."""
         try:
-            web3 = AsyncWeb3(AsyncWeb3.AsyncHTTPProvider(MEMEBRIDGE_RPCS[network]))
-            return await web3.eth.get_balance(self.account.address)
+            return await get_native_balance(MEMEBRIDGE_RPCS[network], self.account.address)
         except Exception as e:
             logger.error(f"[{self.account_index}] Failed to get balance for {network}: {str(e)}")
             return None
@@ -59,32 +66,24 @@ class Memebridge:
         timeout = self.config.MEMEBRIDGE.MAX_WAIT_TIME
         
         logger.info(f"[{self.account_index}] Waiting for balance to increase (max wait time: {timeout} seconds)...")
-        start_time = asyncio.get_event_loop().time()
-        
-        # Check balance every 5 seconds until timeout
-        while asyncio.get_event_loop().time() - start_time < timeout:
-            current_balance = await self.get_monad_balance()
-            if current_balance > initial_balance:
-                logger.success(
-                    f"[{self.account_index}] Balance increased from {initial_balance} to {current_balance} MON"
-                )
-                return True
-            
-            # Log progress every 15 seconds
-            elapsed = int(asyncio.get_event_loop().time() - start_time)
-            if elapsed % 15 == 0:
-                logger.info(f"[{self.account_index}] Still waiting for balance to increase... ({elapsed}/{timeout} seconds)")
-            
-            await asyncio.sleep(5)
-        
+        current_balance = await get_fund_watcher().wait_for_balance(
+            RPC_URL,
+            self.account.address,
+            lambda balance: float(Web3.from_wei(balance, "ether")) > initial_balance,
+            timeout,
+        )
+        if current_balance is not None:
+            logger.success(
+                f"[{self.account_index}] Balance increased from {initial_balance} to {float(Web3.from_wei(current_balance, 'ether'))} MON"
+            )
+            return True
+
         logger.error(f"[{self.account_index}] Balance didn't increase after {timeout} seconds")
         return False
     
     async def get_gas_params(self, web3: AsyncWeb3) -> Dict[str, int]:
         """Get gas parameters for transaction."""
-        latest_block = await web3.eth.get_block('latest')
-        base_fee = latest_block['baseFeePerGas']
-        max_priority_fee = await web3.eth.max_priority_fee
+        base_fee, max_priority_fee = await get_fee_data(web3)
         max_fee = int((base_fee + max_priority_fee) * 1.5)
         
         return {
@@ -96,10 +95,16 @@ class Memebridge:
     async def get_eligible_networks(self):
         try:
             eligible_networks = []
-            networks_to_refuel_from = self.config.MEMEBRIDGE.NETWORKS_TO_REFUEL_FROM
-            for network in networks_to_refuel_from:
-                balance = await self.get_native_balance(network)
-                if self.monad_web3.from_wei(balance, 'ether') > 0.0001:
+            networks_to_refuel_from = get_bridge_routes().networks(
+                "memebridge", self.account.address, self.config.MEMEBRIDGE.NETWORKS_TO_REFUEL_FROM
+            )
+            # Balances of all source chains are read concurrently
+            balances = await get_native_balances(
+                {network: MEMEBRIDGE_RPCS[network] for network in networks_to_refuel_from},
+                self.account.address,
+            )
+            for network, balance in balances.items():
+                if balance is not None and self.monad_web3.from_wei(balance, 'ether') > 0.0001:
                     eligible_networks.append((network, balance))
             return eligible_networks
         except Exception as e:
@@ -131,7 +136,7 @@ class Memebridge:
                 logger.error(f"[{self.account_index}] No network found")
                 return False
             # Get web3 for the selected network
-            web3 = AsyncWeb3(AsyncWeb3.AsyncHTTPProvider(MEMEBRIDGE_RPCS[network]))
+            web3 = get_chain_web3(MEMEBRIDGE_RPCS[network])
             gas_params = await self.get_gas_params(web3)
             # Estimate gas using the same gas parameters from get_balances
             gas_estimate = await web3.eth.estimate_gas({
@@ -183,6 +188,7 @@ class Memebridge:
             # Sign and send transaction
             signed_tx = web3.eth.account.sign_transaction(tx, self.private_key)
             tx_hash = await web3.eth.send_raw_transaction(signed_tx.raw_transaction)
+            invalidate_balance(MEMEBRIDGE_RPCS[network], self.account.address)
             
             logger.info(f"[{self.account_index}] Waiting for refuel transaction confirmation...")
             receipt = await web3.eth.wait_for_transaction_receipt(tx_hash)
@@ -19,20 +19,36 @@ from src.model.monad_xyz.constants import (
 from loguru import logger
 import random
 from src.utils.config import Config
+from src.utils.allowance import get_allowance_index
+from src.utils.account_context import AccountContext, BalanceCache, NATIVE
+from src.model.help.holdings_index import get_holdings_index
 
 
 class AmbientDex:
     def __init__(
-        self, private_key: str, proxy: Optional[str] = None, config: Config = None
+        self,
+        private_key: str,
+        proxy: Optional[str] = None,
+        config: Config = None,
+        context: Optional[AccountContext] = None,
     ):
-        self.web3 = AsyncWeb3(
-             AsyncWeb3.AsyncHTTPProvider(
-                 RPC_URL,
-                 request_kwargs={"proxy": (f"http://{proxy}") if proxy else None, "ssl": False},
-             )
-        ) 
+        if context:
+            self.web3 = context.web3
+        else:
+            self.web3 = AsyncWeb3(
+                AsyncWeb3.AsyncHTTPProvider(
+                    RPC_URL,
+                    request_kwargs={"proxy": (f"http://{proxy}") if proxy else None, "ssl": False},
+                )
+            )
         self.account = Account.from_key(private_key)
         self.proxy = proxy
+        # Without a context nobody reports our transactions, so nothing is cached
+        self.balances = (
+            context.balances
+            if context
+            else BalanceCache(self.web3, self.account.address, proxy, ttl=0)
+        )
         self.router_contract = self.web3.eth.contract(
             address=self.web3.to_checksum_address(AMBIENT_CONTRACT), abi=AMBIENT_ABI
         )
@@ -67,24 +83,29 @@ class AmbientDex:
         """Get list of tokens with non-zero balances, including native token."""
         tokens_with_balance = []
 
+        # The holdings index knows which tokens the wallet has, only those are read
+        tokens = list(AMBIENT_TOKENS)
+        held = await get_holdings_index().held_tokens(
+            self.account.address, [AMBIENT_TOKENS[token]["address"] for token in tokens]
+        )
+        if held is not None:
+            tokens = [token for token in tokens if AMBIENT_TOKENS[token]["address"] in held]
+
+        # Native and token balances come from the account's cache in one batch
+        balances = await self.balances.get_balances(
+            [NATIVE] + [AMBIENT_TOKENS[token]["address"] for token in tokens]
+        )
+
         # Check native token balance
-        native_balance = await self.web3.eth.get_balance(self.account.address)
+        native_balance = balances[NATIVE]
         if native_balance > 0:
             native_amount = float(self.web3.from_wei(native_balance, "ether"))
             tokens_with_balance.append(("native", native_amount))
 
         # Check other tokens
-        for token in AMBIENT_TOKENS:
+        for token in tokens:
             try:
-                token_contract = self.web3.eth.contract(
-                    address=self.web3.to_checksum_address(
-                        AMBIENT_TOKENS[token]["address"]
-                    ),
-                    abi=ERC20_ABI,
-                )
-                balance = await token_contract.functions.balanceOf(
-                    self.account.address
-                ).call()
+                balance = balances[AMBIENT_TOKENS[token]["address"].lower()]
 
                 if balance > 0:
                     decimals = AMBIENT_TOKENS[token]["decimals"]
@@ -221,20 +242,21 @@ class AmbientDex:
             )
 
             # Check current allowance
-            current_allowance = await token_contract.functions.allowance(
-                self.account.address, AMBIENT_CONTRACT
-            ).call()
-
-            if current_allowance >= amount:
+            allowance_index = get_allowance_index()
+            token_address = AMBIENT_TOKENS[token.lower()]["address"]
+            if await allowance_index.has_allowance(
+                self.web3, self.account.address, token_address, AMBIENT_CONTRACT, amount
+            ):
                 logger.info(f"Allowance sufficient for {token}")
                 return None
+            approve_amount = allowance_index.approve_amount(amount)
 
             # Prepare approval transaction
             nonce = await self.web3.eth.get_transaction_count(self.account.address)
             gas_params = await self.get_gas_params()
 
             approve_tx = await token_contract.functions.approve(
-                AMBIENT_CONTRACT, amount
+                AMBIENT_CONTRACT, approve_amount
             ).build_transaction(
                 {
                     "from": self.account.address,
@@ -259,6 +281,9 @@ class AmbientDex:
             )
 
             if receipt["status"] == 1:
+                allowance_index.set(
+                    self.account.address, token_address, AMBIENT_CONTRACT, approve_amount
+                )
                 logger.success(
                     f"Approval successful! Explorer URL: {EXPLORER_URL}{tx_hash.hex()}"
                 )
@@ -9,20 +9,35 @@ from src.utils.constants import RPC_URL, EXPLORER_URL, ERC20_ABI
 from src.model.monad_xyz.constants import BEAN_CONTRACT, BEAN_ABI, BEAN_TOKENS
 import time
 from src.utils.config import Config
+from src.utils.allowance import get_allowance_index
+from src.utils.account_context import AccountContext, BalanceCache, NATIVE
 
 
 class BeanDex:
     def __init__(
-        self, private_key: str, proxy: Optional[str] = None, config: Config = None
+        self,
+        private_key: str,
+        proxy: Optional[str] = None,
+        config: Config = None,
+        context: Optional[AccountContext] = None,
     ):
-        self.web3 = AsyncWeb3(
-             AsyncWeb3.AsyncHTTPProvider(
-                 RPC_URL,
-                 request_kwargs={"proxy": (f"http://{proxy}") if proxy else None, "ssl": False},
-             )
-        )        
+        if context:
+            self.web3 = context.web3
+        else:
+            self.web3 = AsyncWeb3(
+                AsyncWeb3.AsyncHTTPProvider(
+                    RPC_URL,
+                    request_kwargs={"proxy": (f"http://{proxy}") if proxy else None, "ssl": False},
+                )
+            )        
         self.account = Account.from_key(private_key)
         self.proxy = proxy
+        # Without a context nobody reports our transactions, so nothing is cached
+        self.balances = (
+            context.balances
+            if context
+            else BalanceCache(self.web3, self.account.address, proxy, ttl=0)
+        )
         self.router_contract = self.web3.eth.contract(
             address=self.web3.to_checksum_address(BEAN_CONTRACT), abi=BEAN_ABI
         )
@@ -42,16 +57,10 @@ class BeanDex:
     async def get_token_balance(self, token: str) -> float:
         try:
             if token == "native":
-                balance_wei = await self.web3.eth.get_balance(self.account.address)
+                balance_wei = await self.balances.get_balance()
                 return float(self.web3.from_wei(balance_wei, "ether"))
 
-            token_contract = self.web3.eth.contract(
-                address=self.web3.to_checksum_address(BEAN_TOKENS[token]["address"]),
-                abi=ERC20_ABI,
-            )
-            balance = await token_contract.functions.balanceOf(
-                self.account.address
-            ).call()
+            balance = await self.balances.get_token_balance(BEAN_TOKENS[token]["address"])
             decimals = BEAN_TOKENS[token]["decimals"]
             amount = float(Decimal(str(balance)) / Decimal(str(10**decimals)))
             return amount
@@ -64,8 +73,13 @@ class BeanDex:
         """Get list of tokens with non-zero balances."""
         tokens_with_balance = []
 
+        # Native and token balances come from the account's cache in one batch
+        balances = await self.balances.get_balances(
+            [NATIVE] + [BEAN_TOKENS[token]["address"] for token in BEAN_TOKENS]
+        )
+
         # Check native token balance
-        native_balance = await self.web3.eth.get_balance(self.account.address)
+        native_balance = balances[NATIVE]
         if native_balance > 0:
             native_amount = float(self.web3.from_wei(native_balance, "ether"))
             tokens_with_balance.append(("native", native_amount))
@@ -73,15 +87,7 @@ class BeanDex:
         # Check other tokens
         for token in BEAN_TOKENS:
             try:
-                token_contract = self.web3.eth.contract(
-                    address=self.web3.to_checksum_address(
-                        BEAN_TOKENS[token]["address"]
-                    ),
-                    abi=ERC20_ABI,
-                )
-                balance = await token_contract.functions.balanceOf(
-                    self.account.address
-                ).call()
+                balance = balances[BEAN_TOKENS[token]["address"].lower()]
 
                 if balance > 0:
                     decimals = BEAN_TOKENS[token]["decimals"]
@@ -101,19 +107,19 @@ class BeanDex:
                 abi=ERC20_ABI,
             )
 
-            current_allowance = await token_contract.functions.allowance(
-                self.account.address, BEAN_CONTRACT
-            ).call()
-
-            if current_allowance >= amount:
+            allowance_index = get_allowance_index()
+            if await allowance_index.has_allowance(
+                self.web3, self.account.address, BEAN_TOKENS[token]["address"], BEAN_CONTRACT, amount
+            ):
                 logger.info(f"Allowance sufficient for {token}")
                 return None
 
             nonce = await self.web3.eth.get_transaction_count(self.account.address)
             gas_params = await self.get_gas_params()
+            approve_amount = allowance_index.approve_amount(amount)
 
             approve_tx = await token_contract.functions.approve(
-                BEAN_CONTRACT, amount
+                BEAN_CONTRACT, approve_amount
             ).build_transaction(
                 {
                     "from": self.account.address,
@@ -124,7 +130,11 @@ class BeanDex:
                 }
             )
 
-            return await self.execute_transaction(approve_tx)
+            tx_hash = await self.execute_transaction(approve_tx)
+            allowance_index.set(
+                self.account.address, BEAN_TOKENS[token]["address"], BEAN_CONTRACT, approve_amount
+            )
+            return tx_hash
 
         except Exception as e:
             logger.error(f"Failed to approve {token}: {str(e)}")
@@ -285,6 +295,14 @@ class BeanDex:
                     f"Found tokens to collect: {[t[0] for t in tokens_to_swap]}"
                 )
 
+                # One batch request refreshes allowances of all tokens to collect
+                allowance_index = get_allowance_index()
+                await allowance_index.refresh(
+                    self.web3,
+                    self.account.address,
+                    [(BEAN_TOKENS[t]["address"], BEAN_CONTRACT) for t, _ in tokens_to_swap],
+                )
+
                 # Swap all tokens to native
                 for token_in, balance in tokens_to_swap:
                     try:
@@ -293,22 +311,7 @@ class BeanDex:
 
                         # First check and approve if needed
                         logger.info(f"Checking allowance for {balance} {token_in}")
-                        token_contract = self.web3.eth.contract(
-                            address=self.web3.to_checksum_address(
-                                BEAN_TOKENS[token_in]["address"]
-                            ),
-                            abi=ERC20_ABI,
-                        )
-
-                        current_allowance = await token_contract.functions.allowance(
-                            self.account.address, BEAN_CONTRACT
-                        ).call()
-
-                        if current_allowance < amount_wei:
-                            logger.info(
-                                f"Approving {balance} {token_in} for Bean router"
-                            )
-                            await self.approve_token(token_in, amount_wei)
+                        if await self.approve_token(token_in, amount_wei):
                             random_pause = random.randint(
                                 self.config.SETTINGS.PAUSE_BETWEEN_SWAPS[0],
                                 self.config.SETTINGS.PAUSE_BETWEEN_SWAPS[1],
@@ -317,15 +320,19 @@ class BeanDex:
                                 f"Sleeping {random_pause} seconds after approve"
                             )
                             await asyncio.sleep(random_pause)
-                        else:
-                            logger.info(f"Allowance sufficient for {token_in}")
 
                         logger.info(f"Collecting {balance} {token_in} to native")
 
                         tx_data = await self.generate_swap_data(
                             token_in, "native", amount_wei, 0
                         )
-                        await self.execute_transaction(tx_data)
+                        with allowance_index.spending(
+                            self.account.address,
+                            BEAN_TOKENS[token_in]["address"],
+                            BEAN_CONTRACT,
+                            amount_wei,
+                        ):
+                            await self.execute_transaction(tx_data)
 
                         if token_in != tokens_to_swap[-1][0]:
                             await asyncio.sleep(random.randint(5, 10))
@@ -386,15 +393,24 @@ class BeanDex:
 
                     # Approve token spending
                     logger.info(f"Approving {amount_token} {token_in} for Bean router")
-                    await self.approve_token(token_in, amount_wei)
-                    await asyncio.sleep(random.randint(5, 10))
+                    if await self.approve_token(token_in, amount_wei):
+                        await asyncio.sleep(random.randint(5, 10))
 
                 min_amount_out = 0  # Add slippage calculation if needed
                 logger.info(f"Generating swap data for {token_in} -> {token_out}")
                 tx_data = await self.generate_swap_data(
                     token_in, token_out, amount_wei, min_amount_out
                 )
-                return await self.execute_transaction(tx_data)
+                if token_in == "native":
+                    return await self.execute_transaction(tx_data)
+
+                with get_allowance_index().spending(
+                    self.account.address,
+                    BEAN_TOKENS[token_in]["address"],
+                    BEAN_CONTRACT,
+                    amount_wei,
+                ):
+                    return await self.execute_transaction(tx_data)
 
         except Exception as e:
             logger.error(f"Swap failed: {str(e)}")
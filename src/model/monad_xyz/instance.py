@@ -10,6 +10,8 @@ from src.model.monad_xyz.izumi import IzumiDex
 from src.model.monad_xyz.uniswap_swaps import MonadSwap
 from src.model.monad_xyz.faucet import faucet
 from src.utils.config import Config
+from src.utils.account_context import AccountContext
+from src.utils.retry import should_retry
 
 
 class MonadXYZ:
@@ -21,6 +23,7 @@ class MonadXYZ:
         discord_token: str,
         config: Config,
         session: primp.AsyncClient,
+        context: AccountContext | None = None,
     ):
         self.account_index = account_index
         self.proxy = proxy
@@ -28,6 +31,7 @@ class MonadXYZ:
         self.discord_token = discord_token
         self.config = config
         self.session: primp.AsyncClient = session
+        self.context = context
 
         self.wallet = Account.from_key(private_key)
 
@@ -43,7 +47,7 @@ class MonadXYZ:
                     success = False
                     for retry in range(self.config.SETTINGS.ATTEMPTS):
                         try:
-                            swapper = MonadSwap(self.private_key, self.proxy)
+                            swapper = MonadSwap(self.private_key, self.proxy, context=self.context)
                             amount = random.randint(
                                 self.config.FLOW.PERCENT_OF_BALANCE_TO_SWAP[0],
                                 self.config.FLOW.PERCENT_OF_BALANCE_TO_SWAP[1],
@@ -66,13 +70,13 @@ class MonadXYZ:
                             await asyncio.sleep(random_pause)
                             success = True
                             break  # Break retry loop on success
-                            
+
                         except Exception as e:
                             logger.error(
                                 f"[{self.account_index}] | Error swap in monad.xyz ({retry + 1}/{self.config.SETTINGS.ATTEMPTS}): {e}"
                             )
-                            if retry == self.config.SETTINGS.ATTEMPTS - 1:
-                                raise  # Re-raise if all retries failed
+                            if retry == self.config.SETTINGS.ATTEMPTS - 1 or not await should_retry(e, retry):
+                                raise  # Re-raise if all retries failed or the error is fatal
                             continue
                     
                     if not success:
@@ -91,7 +95,7 @@ class MonadXYZ:
                     success = False
                     for retry in range(self.config.SETTINGS.ATTEMPTS):
                         try:
-                            swapper = AmbientDex(self.private_key, self.proxy, self.config)
+                            swapper = AmbientDex(self.private_key, self.proxy, self.config, context=self.context)
                             amount = random.randint(
                                 self.config.FLOW.PERCENT_OF_BALANCE_TO_SWAP[0],
                                 self.config.FLOW.PERCENT_OF_BALANCE_TO_SWAP[1],
@@ -115,8 +119,8 @@ class MonadXYZ:
                             logger.error(
                                 f"[{self.account_index}] | Error swap in ambient ({retry + 1}/{self.config.SETTINGS.ATTEMPTS}): {e}"
                             )
-                            if retry == self.config.SETTINGS.ATTEMPTS - 1:
-                                raise  # Re-raise if all retries failed
+                            if retry == self.config.SETTINGS.ATTEMPTS - 1 or not await should_retry(e, retry):
+                                raise  # Re-raise if all retries failed or the error is fatal
                             continue
                     
                     if not success:
@@ -135,7 +139,7 @@ class MonadXYZ:
                     success = False
                     for retry in range(self.config.SETTINGS.ATTEMPTS):
                         try:
-                            swapper = BeanDex(self.private_key, self.proxy, self.config)
+                            swapper = BeanDex(self.private_key, self.proxy, self.config, context=self.context)
                             amount = random.randint(
                                 self.config.FLOW.PERCENT_OF_BALANCE_TO_SWAP[0],
                                 self.config.FLOW.PERCENT_OF_BALANCE_TO_SWAP[1],
@@ -159,8 +163,8 @@ class MonadXYZ:
                             logger.error(
                                 f"[{self.account_index}] | Error swap in bean ({retry + 1}/{self.config.SETTINGS.ATTEMPTS}): {e}"
                             )
-                            if retry == self.config.SETTINGS.ATTEMPTS - 1:
-                                raise  # Re-raise if all retries failed
+                            if retry == self.config.SETTINGS.ATTEMPTS - 1 or not await should_retry(e, retry):
+                                raise  # Re-raise if all retries failed or the error is fatal
                             continue
                     
                     if not success:
@@ -179,7 +183,7 @@ class MonadXYZ:
                     success = False
                     for retry in range(self.config.SETTINGS.ATTEMPTS):
                         try:
-                            swapper = IzumiDex(self.private_key, self.proxy, self.config)
+                            swapper = IzumiDex(self.private_key, self.proxy, self.config, context=self.context)
                             amount = random.randint(
                                 self.config.FLOW.PERCENT_OF_BALANCE_TO_SWAP[0],
                                 self.config.FLOW.PERCENT_OF_BALANCE_TO_SWAP[1],
@@ -203,8 +207,8 @@ class MonadXYZ:
                             logger.error(
                                 f"[{self.account_index}] | Error swap in izumi ({retry + 1}/{self.config.SETTINGS.ATTEMPTS}): {e}"
                             )
-                            if retry == self.config.SETTINGS.ATTEMPTS - 1:
-                                raise  # Re-raise if all retries failed
+                            if retry == self.config.SETTINGS.ATTEMPTS - 1 or not await should_retry(e, retry):
+                                raise  # Re-raise if all retries failed or the error is fatal
                             continue
                     
                     if not success:
@@ -218,7 +222,7 @@ class MonadXYZ:
                 for retry in range(self.config.SETTINGS.ATTEMPTS):
                     try:
                         # First try collecting via MonadSwap
-                        swapper = MonadSwap(self.private_key, self.proxy)
+                        swapper = MonadSwap(self.private_key, self.proxy, context=self.context)
                         await swapper.swap(
                             percentage_to_swap=100, token_out="native",
                         )
@@ -232,7 +236,7 @@ class MonadXYZ:
                         await asyncio.sleep(random_pause)
 
                         # Then try collecting via Ambient
-                        ambient_swapper = AmbientDex(self.private_key, self.proxy, self.config)
+                        ambient_swapper = AmbientDex(self.private_key, self.proxy, self.config, context=self.context)
                         await ambient_swapper.swap(
                             percentage_to_swap=100, type="collect"
                         )
@@ -246,7 +250,7 @@ class MonadXYZ:
                         await asyncio.sleep(random_pause)
                         
                         # Then try collecting via Bean
-                        bean_swapper = BeanDex(self.private_key, self.proxy, self.config)
+                        bean_swapper = BeanDex(self.private_key, self.proxy, self.config, context=self.context)
                         await bean_swapper.swap(
                             percentage_to_swap=100, type="collect"
                         )
@@ -260,7 +264,7 @@ class MonadXYZ:
                         await asyncio.sleep(random_pause)
 
                         # Then try collecting via Izumi
-                        izumi_swapper = IzumiDex(self.private_key, self.proxy, self.config)
+                        izumi_swapper = IzumiDex(self.private_key, self.proxy, self.config, context=self.context)
                         await izumi_swapper.swap(
                             percentage_to_swap=100, type="collect"
                         )
@@ -9,20 +9,35 @@ from src.utils.constants import RPC_URL, EXPLORER_URL, ERC20_ABI
 from src.model.monad_xyz.constants import IZUMI_ABI, IZUMI_TOKENS, IZUMI_CONTRACT
 import time
 from src.utils.config import Config
+from src.utils.allowance import get_allowance_index
+from src.utils.account_context import AccountContext, BalanceCache, NATIVE
 
 
 class IzumiDex:
     def __init__(
-        self, private_key: str, proxy: Optional[str] = None, config: Config = None
+        self,
+        private_key: str,
+        proxy: Optional[str] = None,
+        config: Config = None,
+        context: Optional[AccountContext] = None,
     ):
-        self.web3 = AsyncWeb3(
-             AsyncWeb3.AsyncHTTPProvider(
-                 RPC_URL,
-                 request_kwargs={"proxy": (f"http://{proxy}") if proxy else None, "ssl": False},
-             )
-        )        
+        if context:
+            self.web3 = context.web3
+        else:
+            self.web3 = AsyncWeb3(
+                AsyncWeb3.AsyncHTTPProvider(
+                    RPC_URL,
+                    request_kwargs={"proxy": (f"http://{proxy}") if proxy else None, "ssl": False},
+                )
+            )        
         self.account = Account.from_key(private_key)
         self.proxy = proxy
+        # Without a context nobody reports our transactions, so nothing is cached
+        self.balances = (
+            context.balances
+            if context
+            else BalanceCache(self.web3, self.account.address, proxy, ttl=0)
+        )
         self.router_contract = self.web3.eth.contract(
             address=self.web3.to_checksum_address(IZUMI_CONTRACT), abi=IZUMI_ABI
         )
@@ -58,8 +73,14 @@ class IzumiDex:
         """Get list of tokens with non-zero balances."""
         tokens_with_balance = []
 
+        # Native and token balances come from the account's cache in one batch
+        balances = await self.balances.get_balances(
+            [NATIVE]
+            + [IZUMI_TOKENS[token]["address"] for token in IZUMI_TOKENS if token != "wmon"]
+        )
+
         # Check native token balance
-        native_balance = await self.web3.eth.get_balance(self.account.address)
+        native_balance = balances[NATIVE]
         if native_balance > 10**14:  # More than 0.0001 MON
             native_amount = float(self.web3.from_wei(native_balance, "ether"))
             tokens_with_balance.append(("native", native_amount))
@@ -69,15 +90,7 @@ class IzumiDex:
             if token == "wmon":  # Skip WMON as we handle it internally
                 continue
             try:
-                token_contract = self.web3.eth.contract(
-                    address=self.web3.to_checksum_address(
-                        IZUMI_TOKENS[token]["address"]
-                    ),
-                    abi=ERC20_ABI,
-                )
-                balance = await token_contract.functions.balanceOf(
-                    self.account.address
-                ).call()
+                balance = balances[IZUMI_TOKENS[token]["address"].lower()]
 
                 # Only add tokens with sufficient balance (more than 0.0001 tokens)
                 min_amount = 10 ** (IZUMI_TOKENS[token]["decimals"] - 4)
@@ -100,19 +113,19 @@ class IzumiDex:
                 abi=ERC20_ABI,
             )
 
-            current_allowance = await token_contract.functions.allowance(
-                self.account.address, IZUMI_CONTRACT
-            ).call()
-
-            if current_allowance >= amount:
+            allowance_index = get_allowance_index()
+            if await allowance_index.has_allowance(
+                self.web3, self.account.address, IZUMI_TOKENS[token]["address"], IZUMI_CONTRACT, amount
+            ):
                 logger.info(f"Allowance sufficient for {token}")
                 return None
 
             nonce = await self.web3.eth.get_transaction_count(self.account.address)
             gas_params = await self.get_gas_params()
+            approve_amount = allowance_index.approve_amount(amount)
 
             approve_tx = await token_contract.functions.approve(
-                IZUMI_CONTRACT, amount
+                IZUMI_CONTRACT, approve_amount
             ).build_transaction(
                 {
                     "from": self.account.address,
@@ -123,7 +136,11 @@ class IzumiDex:
                 }
             )
 
-            return await self.execute_transaction(approve_tx)
+            tx_hash = await self.execute_transaction(approve_tx)
+            allowance_index.set(
+                self.account.address, IZUMI_TOKENS[token]["address"], IZUMI_CONTRACT, approve_amount
+            )
+            return tx_hash
 
         except Exception as e:
             logger.error(f"Failed to approve {token}: {str(e)}")
@@ -170,6 +187,14 @@ class IzumiDex:
                     logger.info("No tokens to collect to native")
                     return None
 
+                # One batch request refreshes allowances of all tokens to collect
+                allowance_index = get_allowance_index()
+                await allowance_index.refresh(
+                    self.web3,
+                    self.account.address,
+                    [(IZUMI_TOKENS[t]["address"], IZUMI_CONTRACT) for t, _ in tokens_to_swap],
+                )
+
                 # Swap all tokens to native
                 for token_in, balance in tokens_to_swap:
                     try:
@@ -185,13 +210,13 @@ class IzumiDex:
                         ).call()
 
                         # Approve token spending
-                        await self.approve_token(token_in, amount_wei)
-                        random_pause = random.randint(
-                            self.config.SETTINGS.PAUSE_BETWEEN_SWAPS[0],
-                            self.config.SETTINGS.PAUSE_BETWEEN_SWAPS[1],
-                        )
-                        logger.info(f"Sleeping {random_pause} seconds after approve")
-                        await asyncio.sleep(random_pause)
+                        if await self.approve_token(token_in, amount_wei):
+                            random_pause = random.randint(
+                                self.config.SETTINGS.PAUSE_BETWEEN_SWAPS[0],
+                                self.config.SETTINGS.PAUSE_BETWEEN_SWAPS[1],
+                            )
+                            logger.info(f"Sleeping {random_pause} seconds after approve")
+                            await asyncio.sleep(random_pause)
 
                         amount_token = self.convert_from_wei(amount_wei, token_in)
                         logger.info(f"Collecting {amount_token} {token_in} to native")
@@ -200,7 +225,13 @@ class IzumiDex:
                         tx_data = await self.generate_swap_data(
                             token_in, "native", amount_wei
                         )
-                        tx_hash = await self.execute_transaction(tx_data)
+                        with allowance_index.spending(
+                            self.account.address,
+                            IZUMI_TOKENS[token_in]["address"],
+                            IZUMI_CONTRACT,
+                            amount_wei,
+                        ):
+                            tx_hash = await self.execute_transaction(tx_data)
 
                         # Wait between swaps
                         if token_in != tokens_to_swap[-1][0]:  # If not the last token
@@ -249,19 +280,28 @@ class IzumiDex:
                     amount_token = self.convert_from_wei(amount_wei, token_in)
 
                     # Approve token spending if not native
-                    await self.approve_token(token_in, amount_wei)
-                    random_pause = random.randint(
-                        self.config.SETTINGS.PAUSE_BETWEEN_SWAPS[0],
-                        self.config.SETTINGS.PAUSE_BETWEEN_SWAPS[1],
-                    )
-                    logger.info(f"Sleeping {random_pause} seconds after approve")
-                    await asyncio.sleep(random_pause)
+                    if await self.approve_token(token_in, amount_wei):
+                        random_pause = random.randint(
+                            self.config.SETTINGS.PAUSE_BETWEEN_SWAPS[0],
+                            self.config.SETTINGS.PAUSE_BETWEEN_SWAPS[1],
+                        )
+                        logger.info(f"Sleeping {random_pause} seconds after approve")
+                        await asyncio.sleep(random_pause)
 
                 logger.info(f"Swapping {amount_token} {token_in} to {token_out}")
 
                 # Generate and execute swap transaction
                 tx_data = await self.generate_swap_data(token_in, token_out, amount_wei)
-                return await self.execute_transaction(tx_data)
+                if token_in == "native":
+                    return await self.execute_transaction(tx_data)
+
+                with get_allowance_index().spending(
+                    self.account.address,
+                    IZUMI_TOKENS[token_in]["address"],
+                    IZUMI_CONTRACT,
+                    amount_wei,
+                ):
+                    return await self.execute_transaction(tx_data)
 
         except Exception as e:
             logger.error(f"Izumi swap failed: {str(e)}")
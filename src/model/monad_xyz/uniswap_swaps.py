@@ -1,14 +1,19 @@
 import random
-from web3 import AsyncWeb3
 from eth_account import Account
 import json
 import asyncio
 from typing import Dict, Any, Optional, List, Tuple
 from decimal import Decimal
-from src.utils.constants import TOKENS, ERC20_ABI, RPC_URL, EXPLORER_URL
+from src.utils.constants import TOKENS, ERC20_ABI, EXPLORER_URL
 from loguru import logger
-from src.utils.client import create_client
+from src.utils.client import get_client_manager
+from src.utils.allowance import get_allowance_index
+from src.utils.circuit_breaker import get_breaker
+from src.utils.retry import should_retry
+from src.utils.tx_builder import TxBuilder
+from src.utils.account_context import AccountContext, BalanceCache
 from src.utils.config import get_config
+from src.model.help.holdings_index import get_holdings_index
 
 
 # Get config singleton
@@ -18,36 +23,30 @@ config = get_config()
 class MonadSwap:
     """Class to handle swaps on Monad network"""
 
-    def __init__(self, private_key: str, proxy: Optional[str] = None):
+    def __init__(
+        self,
+        private_key: str,
+        proxy: Optional[str] = None,
+        context: Optional[AccountContext] = None,
+    ):
         """
         Initialize MonadSwap instance.
 
         Args:
             private_key: Private key for the wallet
             proxy: Optional proxy URL for API requests
+            context: Account state shared between tasks (balances, nonce)
         """
-        self.web3 = AsyncWeb3(
-             AsyncWeb3.AsyncHTTPProvider(
-                 RPC_URL,
-                 request_kwargs={"proxy": (f"http://{proxy}") if proxy else None, "ssl": False},
-             )
-        )     
+        self.tx_builder = context.tx_builder if context else TxBuilder(private_key, proxy)
+        self.web3 = self.tx_builder.web3
         self.account = Account.from_key(private_key)
         self.proxy = proxy
-
-    async def get_gas_params(self) -> Dict[str, int]:
-        """Get current gas parameters from the network."""
-        latest_block = await self.web3.eth.get_block("latest")
-        base_fee = latest_block["baseFeePerGas"]
-        max_priority_fee = await self.web3.eth.max_priority_fee
-
-        # Calculate maxFeePerGas (base fee + priority fee)
-        max_fee = base_fee + max_priority_fee
-
-        return {
-            "maxFeePerGas": max_fee,
-            "maxPriorityFeePerGas": max_priority_fee,
-        }
+        # Without a context nobody reports our transactions, so nothing is cached
+        self.balances = (
+            context.balances
+            if context
+            else BalanceCache(self.web3, self.account.address, proxy, ttl=0)
+        )
 
     async def get_token_balance_ether(self, token_out: str) -> Decimal:
         """Get balance of specified token."""
@@ -56,35 +55,37 @@ class MonadSwap:
         for attempt in range(max_retries):
             try:
                 if token_out == "native":
-                    balance_wei = await self.web3.eth.get_balance(self.account.address)
+                    balance_wei = await self.balances.get_balance()
                     return Decimal(self.web3.from_wei(balance_wei, "ether"))
                 else:
-                    # Prepare the contract call data manually
-                    contract_address = self.web3.to_checksum_address(TOKENS[token_out])
-                    contract = self.web3.eth.contract(
-                        address=contract_address, abi=ERC20_ABI
-                    )
-                    balance_wei = await contract.functions.balanceOf(
-                        self.account.address
-                    ).call()
+                    balance_wei = await self.balances.get_token_balance(TOKENS[token_out])
                     balance_ether = Decimal(self.web3.from_wei(balance_wei, "ether"))
                     logger.info(f"Balance: {balance_ether:.4f} {token_out}")
                     return balance_ether
 
             except Exception as e:
-                if attempt == max_retries - 1:
+                if attempt == max_retries - 1 or not await should_retry(
+                    e, attempt, pause=(0.5, 1.5)
+                ):
                     logger.error(
-                        f"Error getting balance after {max_retries} attempts: {str(e)}"
+                        f"Error getting balance after {attempt + 1} attempts: {str(e)}"
                     )
-                else:
-                    await asyncio.sleep(1)  # Fixed 1 second pause between retries
+                    return None
 
     async def get_tokens_with_balance(self) -> List[Tuple[str, Decimal]]:
         tokens_with_balance = []
         MIN_BALANCE = Decimal("0.0001")  # Minimum balance threshold
-        for token in TOKENS:
-            if token == "native":
-                continue
+        tokens = [token for token in TOKENS if token != "native"]
+        # Tokens the holdings index has never seen in the wallet are not read at all
+        held = await get_holdings_index().held_tokens(
+            self.account.address, [TOKENS[token] for token in tokens]
+        )
+        if held is not None:
+            tokens = [token for token in tokens if TOKENS[token] in held]
+
+        # Warm the cache with all token balances in one batch request
+        await self.balances.get_balances([TOKENS[token] for token in tokens])
+        for token in tokens:
             balance = await self.get_token_balance_ether(token)
             if balance > MIN_BALANCE:  # Only include tokens with sufficient balance
                 tokens_with_balance.append((token, balance))
@@ -161,7 +162,8 @@ class MonadSwap:
     ) -> Dict:
         max_retries = 5
         json_data = {"account": self.account.address, "type": "transaction"}
-        client = await create_client(self.proxy)
+        # Quotes need no cookies, the proxy's shared client keeps its connections open
+        client = get_client_manager().get(self.proxy)
 
         if token_out == "native":
             url = await self._generate_url_amount(
@@ -172,49 +174,61 @@ class MonadSwap:
                 percentage_to_swap_or_amount, token_out
             )
 
-        async with client:
-            for attempt in range(max_retries):
+        breaker = get_breaker("dial.to quotes")
+        for attempt in range(max_retries):
+            # Fails fast while the quote API is known to be down
+            breaker.check()
+            try:
                 try:
                     response = await client.post(url=url, json=json_data)
-                    response_data = response.json()
-
-                    # Check for balance-related error messages
-                    if isinstance(response_data, dict) and "error" in response_data:
-                        error_msg = str(response_data.get("error", "")).lower()
-                        if "number greater than" in error_msg:
-                            logger.warning(
-                                f"Balance too small for swap, skipping: {response_data['error']}"
-                            )
-                            return None
-
-                    if not response_data.get("transaction"):
-                        raise ValueError(
-                            f"No transaction data in response: {response_data}"
+                except Exception:
+                    # Transport errors and timeouts: the API or the way to it is down
+                    breaker.record_failure()
+                    raise
+                if response.status_code >= 500:
+                    breaker.record_failure()
+                    raise Exception(
+                        f"Quote API error {response.status_code}: {response.text[:200]}"
+                    )
+                # The API answered, anything wrong now is about this account's request
+                breaker.record_success()
+                response_data = response.json()
+
+                # Check for balance-related error messages
+                if isinstance(response_data, dict) and "error" in response_data:
+                    error_msg = str(response_data.get("error", "")).lower()
+                    if "number greater than" in error_msg:
+                        logger.warning(
+                            f"Balance too small for swap, skipping: {response_data['error']}"
                         )
+                        return None
 
-                    tx_data = json.loads(response_data["transaction"])
-                    return {
-                        "to": self.web3.to_checksum_address(tx_data["to"]),
-                        "value": int(tx_data["value"], 16),
-                        "data": tx_data["data"],
-                        "gas": tx_data["gas"],
-                    }
-                except Exception as e:
-                    if attempt == max_retries - 1:
-                        raise Exception(
-                            f"Failed to get quote after {max_retries} attempts: {str(e)}"
-                        )
-                    logger.error(f"Attempt {attempt + 1} failed: {str(e)}")
-                    await asyncio.sleep(
-                        random.randint(
-                            config.SETTINGS.PAUSE_BETWEEN_ATTEMPTS[0],
-                            config.SETTINGS.PAUSE_BETWEEN_ATTEMPTS[1],
-                        )
+                if not response_data.get("transaction"):
+                    raise ValueError(
+                        f"No transaction data in response: {response_data}"
                     )
 
+                tx_data = json.loads(response_data["transaction"])
+                return {
+                    "to": self.web3.to_checksum_address(tx_data["to"]),
+                    "value": int(tx_data["value"], 16),
+                    "data": tx_data["data"],
+                    "gas": tx_data["gas"],
+                }
+            except Exception as e:
+                if attempt == max_retries - 1:
+                    raise Exception(
+                        f"Failed to get quote after {max_retries} attempts: {str(e)}"
+                    )
+                logger.error(f"Attempt {attempt + 1} failed: {str(e)}")
+                if not await should_retry(
+                    e, attempt, pause=config.SETTINGS.PAUSE_BETWEEN_ATTEMPTS
+                ):
+                    raise
+
     async def generate_approve_transaction(
         self, token: str, amount: float, swap_tx_data: Dict
-    ) -> Dict:
+    ) -> Optional[Dict]:
         """
         Generate an approve transaction for the token.
 
@@ -224,10 +238,10 @@ class MonadSwap:
             swap_tx_data: Swap transaction data containing the spender address
 
         Returns:
-            Dict containing the approval transaction data
+            Dict containing the approval transaction data, None if the
+            allowance already covers the amount
         """
         try:
-            # Get the token contract
             token_address = self.web3.to_checksum_address(TOKENS[token])
             token_contract = self.web3.eth.contract(
                 address=token_address, abi=ERC20_ABI
@@ -235,39 +249,29 @@ class MonadSwap:
 
             # Get the spender address from swap transaction data
             spender_address = self.web3.to_checksum_address(swap_tx_data["to"])
-
-            # Convert amount to Wei
             amount_wei = self.web3.to_wei(amount, "ether")
 
-            # Generate the approve function data
-            function_signature = self.web3.keccak(text="approve(address,uint256)")[0:4]
-            padded_address = spender_address[2:].zfill(64)
-            padded_amount = hex(amount_wei)[2:].zfill(64)
-            approve_data = function_signature.hex() + padded_address + padded_amount
-
-            # Estimate gas for the approval
-            gas_estimate = await self.web3.eth.estimate_gas(
-                {
-                    "to": token_address,
-                    "from": self.account.address,
-                    "data": "0x" + approve_data,
-                    "value": 0,
-                }
-            )
+            allowance_index = get_allowance_index()
+            if await allowance_index.has_allowance(
+                self.web3, self.account.address, token_address, spender_address, amount_wei
+            ):
+                logger.info(f"Allowance sufficient for {token}")
+                return None
 
-            # Add 10% buffer to gas estimate
-            gas_limit = int(gas_estimate * 1.1)
-
-            # Create the transaction data
+            approve_amount = allowance_index.approve_amount(amount_wei)
+            # approve стоит одинаково для одного токена, лимит газа берем из кеша
             tx_data = {
                 "to": token_address,
-                "data": "0x" + approve_data,
+                "data": token_contract.functions.approve(
+                    spender_address, approve_amount
+                )._encode_transaction_data(),
                 "value": 0,
-                "gas": gas_limit,
+                "gas": None,
+                "approve_amount": approve_amount,
             }
 
             logger.info(
-                f"Generated approve transaction for {amount} {token} to spender {spender_address} (Gas: {gas_limit})"
+                f"Generated approve transaction for {amount} {token} to spender {spender_address}"
             )
             return tx_data
 
@@ -276,38 +280,27 @@ class MonadSwap:
             raise
 
     async def execute_transaction(self, tx_data: Dict) -> str:
-        nonce = await self.web3.eth.get_transaction_count(self.account.address)
-        gas_params = await self.get_gas_params()
-
-        transaction = {
-            "from": self.account.address,
-            "nonce": nonce,
-            "type": 2,
-            "chainId": 10143,
-            **tx_data,
-            **gas_params,
-        }
-
-        signed_txn = self.web3.eth.account.sign_transaction(
-            transaction, self.account.key
-        )
-        tx_hash = await self.web3.eth.send_raw_transaction(signed_txn.raw_transaction)
-
         logger.info("Waiting for transaction confirmation...")
-        receipt = await self.web3.eth.wait_for_transaction_receipt(
-            tx_hash, poll_latency=2
+        # Quote data already carries the gas limit, approves take it from
+        # the gas cache, so the builder only has to send the transaction
+        tx_hash, receipt = await self.tx_builder.send_and_wait(
+            to=tx_data["to"],
+            data=tx_data["data"],
+            value=tx_data["value"],
+            gas=tx_data["gas"],
+            cache_gas=tx_data["gas"] is None,
         )
 
         if receipt["status"] == 1:
             logger.success(
-                f"Transaction successful! Explorer URL: {EXPLORER_URL}{tx_hash.hex()}"
+                f"Transaction successful! Explorer URL: {EXPLORER_URL}{tx_hash}"
             )
         else:
             logger.error(
-                f"Transaction failed! Explorer URL: {EXPLORER_URL}{tx_hash.hex()}"
+                f"Transaction failed! Explorer URL: {EXPLORER_URL}{tx_hash}"
             )
             raise Exception("Transaction failed")
-        return tx_hash.hex()
+        return tx_hash
 
     async def swap(self, percentage_to_swap: float, token_out: str) -> str:
         """Swap tokens."""
@@ -315,24 +308,41 @@ class MonadSwap:
             if token_out == "native":
                 logger.info("Swapping all token balances back to MON one by one...")
                 tokens_with_balance = await self.get_tokens_with_balance()
+                allowance_index = get_allowance_index()
                 for token, balance in tokens_with_balance:
                     swap_tx_data = await self.get_swap_quote(
                         balance, "native", token_in=token
                     )
+                    if swap_tx_data is None:
+                        continue
+
                     approve_tx_data = await self.generate_approve_transaction(
                         token, balance, swap_tx_data
                     )
-                    await self.execute_transaction(approve_tx_data)
-                    random_pause = random.randint(
-                        config.SETTINGS.PAUSE_BETWEEN_SWAPS[0],
-                        config.SETTINGS.PAUSE_BETWEEN_SWAPS[1],
-                    )
-                    logger.info(
-                        f"Swapping {balance} {token} to MON. Sleeping {random_pause} seconds after approve"
-                    )
-                    await asyncio.sleep(random_pause)
-
-                    await self.execute_transaction(swap_tx_data)
+                    if approve_tx_data:
+                        await self.execute_transaction(approve_tx_data)
+                        allowance_index.set(
+                            self.account.address,
+                            TOKENS[token],
+                            swap_tx_data["to"],
+                            approve_tx_data["approve_amount"],
+                        )
+                        random_pause = random.randint(
+                            config.SETTINGS.PAUSE_BETWEEN_SWAPS[0],
+                            config.SETTINGS.PAUSE_BETWEEN_SWAPS[1],
+                        )
+                        logger.info(
+                            f"Swapping {balance} {token} to MON. Sleeping {random_pause} seconds after approve"
+                        )
+                        await asyncio.sleep(random_pause)
+
+                    with allowance_index.spending(
+                        self.account.address,
+                        TOKENS[token],
+                        swap_tx_data["to"],
+                        self.web3.to_wei(balance, "ether"),
+                    ):
+                        await self.execute_transaction(swap_tx_data)
             else:
                 logger.info(f"Swapping MON to {token_out}...")
                 tx_data = await self.get_swap_quote(percentage_to_swap, token_out)
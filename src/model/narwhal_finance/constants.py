@@ -1,4 +1,5 @@
 MINT_CONTRACT_ABI = ""
+USDT_ADDRESS = "0x6593F49Ca8D3038cA002314C187b63dD348c2F94"
 SLOTS_ABI = [
     {
         "inputs": [
@@ -6,9 +6,14 @@ from primp import AsyncClient
 from web3 import AsyncWeb3, Web3
 from typing import Dict
 
-from src.model.narwhal_finance.constants import SLOTS_ABI
+from src.model.narwhal_finance.constants import SLOTS_ABI, USDT_ADDRESS
 from src.utils.config import Config
 from src.utils.constants import RPC_URL, EXPLORER_URL
+from src.utils.call_cache import register_global_call
+from src.utils.allowance import get_allowance_index
+
+# Token decimals never change
+register_global_call(USDT_ADDRESS, "decimals()")
 
 
 class NarwhalFinance:
@@ -68,7 +73,7 @@ class NarwhalFinance:
         for retry in range(self.config.SETTINGS.ATTEMPTS):
             try:
                 # USDT token address
-                usdt_address = "0x6593F49Ca8D3038cA002314C187b63dD348c2F94"
+                usdt_address = USDT_ADDRESS
 
                 # USDT faucet contract address
                 faucet_contract_address = "0xFF85587E991E16bcB9a6A0C52ff919305944f011"
@@ -289,7 +294,7 @@ class NarwhalFinance:
                 )  # Convert to wei
 
                 # USDT token address and spender address
-                usdt_address = "0x6593F49Ca8D3038cA002314C187b63dD348c2F94"
+                usdt_address = USDT_ADDRESS
                 spender_address = "0x5939199FC366f741c5f4981BF343aC5A3ddf748d"
 
                 # First approve USDT spending
@@ -344,6 +349,7 @@ class NarwhalFinance:
                     f"[{self.account_index}] Waiting for Slots_Play transaction confirmation..."
                 )
                 receipt = await self.web3.eth.wait_for_transaction_receipt(tx_hash)
+                self._record_bet(spender_address, usdt_amount, receipt)
 
                 logger.success(
                     f"[{self.account_index}] Successfully played Slots with {usdt_amount / (10**18)} USDT. TX: {EXPLORER_URL}{tx_hash.hex()}"
@@ -364,9 +370,18 @@ class NarwhalFinance:
 
     async def _approve_usdt(self, spender: str, amount: int, contract_address: str):
         """
-        Approve a specified amount of USDT for a spender.
+        Approve a specified amount of USDT for a spender, unless the
+        allowance index shows enough is approved already.
         """
         try:
+            allowance_index = get_allowance_index()
+            if await allowance_index.has_allowance(
+                self.web3, self.account.address, contract_address, spender, amount
+            ):
+                logger.info(f"[{self.account_index}] USDT allowance for {spender} is sufficient")
+                return True
+            approve_amount = allowance_index.approve_amount(amount)
+
             # ABI for the approve function
             approve_abi = [
                 {
@@ -401,7 +416,7 @@ class NarwhalFinance:
 
             # Build the approval transaction
             transaction = await usdt_contract.functions.approve(
-                spender, amount
+                spender, approve_amount
             ).build_transaction(
                 {
                     "from": self.account.address,
@@ -430,6 +445,8 @@ class NarwhalFinance:
                 f"[{self.account_index}] Waiting for approval transaction confirmation..."
             )
             receipt = await self.web3.eth.wait_for_transaction_receipt(tx_hash)
+            if receipt["status"] == 1:
+                allowance_index.set(self.account.address, contract_address, spender, approve_amount)
 
             logger.success(
                 f"[{self.account_index}] Successfully approved {amount / (10**18)} USDT for spender {spender}. TX: {EXPLORER_URL}{tx_hash.hex()}"
@@ -440,6 +457,14 @@ class NarwhalFinance:
             logger.error(f"[{self.account_index}] Error in approval: {e}")
             return False
 
+    def _record_bet(self, spender: str, amount: int, receipt):
+        """Keep the allowance index in step with the USDT the game contract took"""
+        allowance_index = get_allowance_index()
+        if receipt["status"] == 1:
+            allowance_index.spend(self.account.address, USDT_ADDRESS, spender, amount)
+        else:
+            allowance_index.forget(self.account.address, USDT_ADDRESS, spender)
+
     async def coinflip(self):
         for retry in range(self.config.SETTINGS.ATTEMPTS):
             try:
@@ -455,7 +480,7 @@ class NarwhalFinance:
                 )  # Convert to wei
 
                 # USDT token address and CoinFlip contract address
-                usdt_address = "0x6593F49Ca8D3038cA002314C187b63dD348c2F94"
+                usdt_address = USDT_ADDRESS
                 coinflip_address = "0x5c1C68a709427Cfdb184399304251658f91d4ea8"
 
                 # First approve USDT spending
@@ -511,6 +536,7 @@ class NarwhalFinance:
                     f"[{self.account_index}] Waiting for CoinFlip_Play transaction confirmation..."
                 )
                 receipt = await self.web3.eth.wait_for_transaction_receipt(tx_hash)
+                self._record_bet(coinflip_address, usdt_amount, receipt)
 
                 logger.success(
                     f"[{self.account_index}] Successfully played CoinFlip with {usdt_amount / (10**18)} USDT. TX: {EXPLORER_URL}{tx_hash.hex()}"
@@ -561,7 +587,7 @@ class NarwhalFinance:
                 )
 
                 # USDT token address and Dice contract address
-                usdt_address = "0x6593F49Ca8D3038cA002314C187b63dD348c2F94"
+                usdt_address = USDT_ADDRESS
                 dice_address = "0xc552a88f2FAB0b7800F2F54141ACe8C4C06f50A2"
 
                 # First approve USDT spending
@@ -617,6 +643,7 @@ class NarwhalFinance:
                     f"[{self.account_index}] Waiting for Dice_Play transaction confirmation with multiplier {multiplier}x and amount {usdt_amount / (10**18)} USDT..."
                 )
                 receipt = await self.web3.eth.wait_for_transaction_receipt(tx_hash)
+                self._record_bet(dice_address, usdt_amount, receipt)
 
                 logger.success(
                     f"[{self.account_index}] Successfully played Dice with {usdt_amount / (10**18)} USDT and multiplier {multiplier}x. TX: {EXPLORER_URL}{tx_hash.hex()}"
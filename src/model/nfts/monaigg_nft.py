@@ -31,6 +31,8 @@ MONAI_DeFAI = [
     },
 ]
 
+NFT_CONTRACT_ADDRESS = "0xd29959795a350C63e0315139A71ff6ec7ee9f0fd"
+
 
 class Monai:
     def __init__(
@@ -56,9 +58,7 @@ class Monai:
         )
 
         # Изменяем адрес контракта на новый
-        self.nft_contract_address = Web3.to_checksum_address(
-            "0xd29959795a350C63e0315139A71ff6ec7ee9f0fd"
-        )
+        self.nft_contract_address = Web3.to_checksum_address(NFT_CONTRACT_ADDRESS)
         # Используем MONAI_QINGYI_ABI вместо MONAI_YAKUZA_ABI
         self.nft_contract: Contract = self.web3.eth.contract(
             address=self.nft_contract_address, abi=MONAI_DeFAI
@@ -53,6 +53,12 @@ MONAI_QINGYI_ABI = [
 ]
 
 
+MONHOG_CONTRACT_ADDRESS = "0x8fb9EeDC9ae174C22B87FC8Cb87B902373D2a284"
+MONARCH_CONTRACT_ADDRESS = "0x0442309dC7f467F380836de685b650A3F1C10CF7"
+MORKIE_CONTRACT_ADDRESS = "0xdC8eDF8e9cA33EDBBd81b42b303bFE12298E717E"
+GTM_CONTRACT_ADDRESS = "0xC5349931A6D89a01F46f9197FeAc282b181F8ee7"
+
+
 class Morkie:
     def __init__(
         self,
@@ -78,16 +84,16 @@ class Morkie:
 
         # Изменяем адрес контракта на MonAI Qingyi (Week2NFT)
         self.monhog_contract_address = Web3.to_checksum_address(
-            "0x8fb9EeDC9ae174C22B87FC8Cb87B902373D2a284"
+            MONHOG_CONTRACT_ADDRESS
         )  # price 0.5 MON
         self.monarch_contract_address = Web3.to_checksum_address(
-            "0x0442309dC7f467F380836de685b650A3F1C10CF7"
+            MONARCH_CONTRACT_ADDRESS
         )  # price 0.1 MON
         self.morkie_contract_address = Web3.to_checksum_address(
-            "0xdC8eDF8e9cA33EDBBd81b42b303bFE12298E717E"
+            MORKIE_CONTRACT_ADDRESS
         )  # price 0
         self.gtm_contract_address = Web3.to_checksum_address(
-            "0xC5349931A6D89a01F46f9197FeAc282b181F8ee7"
+            GTM_CONTRACT_ADDRESS
         )  # price 0.1
 
         # Создаем контракты для каждого NFT
@@ -2,11 +2,12 @@ import asyncio
 import random
 from eth_account import Account
 from primp import AsyncClient
-from web3 import AsyncWeb3, Web3
+from web3 import Web3
 from web3.contract import Contract
 
-from src.utils.constants import EXPLORER_URL, RPC_URL
+from src.utils.constants import EXPLORER_URL
 from src.utils.config import Config
+from src.utils.tx_builder import TxBuilder
 from loguru import logger
 
 # Обновляем ABI для ERC1155
@@ -69,12 +70,8 @@ class Nerzo:
         self.session = session
 
         self.account: Account = Account.from_key(private_key=private_key)
-        self.web3 = AsyncWeb3(
-            AsyncWeb3.AsyncHTTPProvider(
-                RPC_URL,
-                request_kwargs={"proxy": (f"http://{proxy}") if proxy else None, "ssl": False},
-            )
-        )
+        self.tx_builder = TxBuilder(private_key, proxy)
+        self.web3 = self.tx_builder.web3
 
         # Изменяем адрес контракта на новый
         self.nft_contract_address = Web3.to_checksum_address(
@@ -127,52 +124,22 @@ class Nerzo:
                 # Формируем данные для пейлоада - метод claim с адресом кошелька
                 data = f"0x84bb1e42000000000000000000000000{wallet_address_without_0x}0000000000000000000000000000000000000000000000000000000000000001000000000000000000000000eeeeeeeeeeeeeeeeeeeeeeeeeeeeeeeeeeeeeeee00000000000000000000000000000000000000000000000002c68af0bb14000000000000000000000000000000000000000000000000000000000000000000c0000000000000000000000000000000000000000000000000000000000000016000000000000000000000000000000000000000000000000000000000000000800000000000000000000000000000000000000000000000000000000000000000ffffffffffffffffffffffffffffffffffffffffffffffffffffffffffffffff000000000000000000000000000000000000000000000000000000000000000000000000000000000000000000000000000000000000000000000000000000000000000000000000000000000000000000000000000000000000000000000000"
                 
-                # Формируем предварительную транзакцию для расчета газа
-                transaction = {
-                    "from": self.account.address,
-                    "to": contract_address,
-                    "value": value_in_wei,
-                    "data": data,
-                    "nonce": await self.web3.eth.get_transaction_count(
-                        self.account.address
-                    ),
-                    "maxFeePerGas": await self.web3.eth.gas_price,
-                    "maxPriorityFeePerGas": await self.web3.eth.gas_price,
-                    "chainId": 10143,
-                }
-
-                # Получаем оценку газа
-                try:
-                    estimated_gas = await self.web3.eth.estimate_gas(transaction)
-                    # Добавляем небольшой запас для надежности (10%)
-                    gas_limit = int(estimated_gas * 1.1)
-                except Exception as gas_error:
-                    raise gas_error
-
-                # Добавляем gas_limit в транзакцию
-                transaction["gas"] = gas_limit
-
-                # Подписываем транзакцию
-                signed_txn = self.web3.eth.account.sign_transaction(
-                    transaction, self.private_key
-                )
-
-                # Отправляем транзакцию
-                tx_hash = await self.web3.eth.send_raw_transaction(
-                    signed_txn.raw_transaction
+                # Calldata differs only by wallet address, gas is the same for every mint
+                tx_hash, receipt = await self.tx_builder.send_and_wait(
+                    to=contract_address,
+                    data=data,
+                    value=value_in_wei,
+                    cache_gas=True,
                 )
 
-                # Ждем подтверждения
-                receipt = await self.web3.eth.wait_for_transaction_receipt(tx_hash)
-
                 if receipt["status"] == 1:
                     logger.success(
-                        f"[{self.account_index}] Successfully minted Nerzo Soulbound. TX: {EXPLORER_URL}{tx_hash.hex()}"
+                        f"[{self.account_index}] Successfully minted Nerzo Soulbound. TX: {EXPLORER_URL}{tx_hash}"
                     )
                     return True
                 else:
                     logger.error(
-                        f"[{self.account_index}] Transaction failed. TX: {EXPLORER_URL}{tx_hash.hex()}"
+                        f"[{self.account_index}] Transaction failed. TX: {EXPLORER_URL}{tx_hash}"
                     )
                     return False
 
@@ -12,6 +12,7 @@ from functools import wraps
 
 from src.utils.config import Config
 from src.utils.constants import EXPLORER_URL, RPC_URL
+from src.utils.allowance import MAX_UINT256, get_allowance_index
 
 from .constants import (
     WMON_CONTRACT, USDC_CONTRACT, USDT_CONTRACT, CDP_MANAGER,
@@ -179,11 +180,9 @@ class Nostra:
     
     async def check_allowance(self, token_address: str, spender_address: str, amount_wei: int) -> bool:
         """Check if token allowance is sufficient."""
-        token_contract = self.web3.eth.contract(address=token_address, abi=ERC20_ABI)
-        current_allowance = await token_contract.functions.allowance(
-            self.account.address, spender_address
-        ).call()
-        return current_allowance >= amount_wei
+        return await get_allowance_index().has_allowance(
+            self.web3, self.account.address, token_address, spender_address, amount_wei
+        )
     
     async def approve_token(self, token_address: str, spender_address: str) -> bool:
         """Approve token for spending."""
@@ -192,13 +191,11 @@ class Nostra:
             
             # Create transaction for approval
             gas_params = await self.get_gas_params()
-            max_uint256 = (2**256) - 1  # Max uint256 value for unlimited approval
-            
             transaction = {
                 "from": self.account.address,
                 "to": token_address,
                 "data": token_contract.functions.approve(
-                    spender_address, max_uint256
+                    spender_address, MAX_UINT256
                 )._encode_transaction_data(),
                 "chainId": 10143,
                 "type": 2,
@@ -220,6 +217,9 @@ class Nostra:
             receipt = await self.web3.eth.wait_for_transaction_receipt(tx_hash)
             
             if receipt["status"] == 1:
+                get_allowance_index().set(
+                    self.account.address, token_address, spender_address, MAX_UINT256
+                )
                 logger.success(
                     f"[{self.account_index}] Successfully approved token. TX: {EXPLORER_URL}{tx_hash.hex()}"
                 )
@@ -3,11 +3,11 @@ from typing import Dict
 from eth_account import Account
 from primp import AsyncClient
 from web3 import AsyncWeb3
-import asyncio
 
 from src.model.orbiter.constants import SEPOLIA_EXPLORER_URL, SEPOLIA_RPC_URL, MONAD_SEPOLIA_ETHEREUM_ADDRESS
 from src.utils.client import create_client
 from src.utils.config import Config
+from src.utils.fund_watcher import get_fund_watcher
 from loguru import logger
 from src.utils.constants import RPC_URL, ERC20_ABI
 
@@ -60,26 +60,18 @@ class Orbiter:
     
     async def wait_for_funds(self, initial_balance: int):
         """Wait for funds to arrive in Monad network."""
-        max_attempts = self.config.ORBITER.MAX_WAIT_TIME // 10  # Convert total wait time to number of 10-second attempts
-        
         logger.info(f"[{self.account_index}] Waiting for funds to arrive in Monad (max wait time: {self.config.ORBITER.MAX_WAIT_TIME} seconds)...")
-        for attempt in range(max_attempts):
-            try:
-                current_balance = await self.monad_sepolia.functions.balanceOf(
-                    self.account.address
-                ).call()
-                
-                if current_balance > initial_balance:
-                    logger.success(f"[{self.account_index}] Funds arrived in Monad!")
-                    return True
-                
-                logger.info(f"[{self.account_index}] Still waiting for funds... (attempt {attempt + 1}/{max_attempts}, {(max_attempts - attempt) * 10} seconds remaining)")
-                await asyncio.sleep(10)  # Check every 10 seconds
-                
-            except Exception as e:
-                logger.error(f"[{self.account_index}] Error checking token balance: {str(e)}")
-                await asyncio.sleep(10)
-                
+        current_balance = await get_fund_watcher().wait_for_balance(
+            RPC_URL,
+            self.account.address,
+            lambda balance: balance > initial_balance,
+            self.config.ORBITER.MAX_WAIT_TIME,
+            token=MONAD_SEPOLIA_ETHEREUM_ADDRESS,
+        )
+        if current_balance is not None:
+            logger.success(f"[{self.account_index}] Funds arrived in Monad!")
+            return True
+
         logger.warning(f"[{self.account_index}] Timeout waiting for funds after {self.config.ORBITER.MAX_WAIT_TIME} seconds")
         return False
 
@@ -7,6 +7,7 @@ from web3 import AsyncWeb3
 from src.utils.config import Config
 from src.utils.constants import EXPLORER_URL, RPC_URL
 from src.model.shmonad.constants import SHMONAD_ADDRESS, SHMONAD_ABI, STAKE_POLICY_ID
+from src.utils.account_context import AccountContext
 from typing import Dict
 
 
@@ -18,24 +19,36 @@ class Shmonad:
         private_key: str,
         config: Config,
         session: AsyncClient,
+        context: AccountContext | None = None,
     ):
         self.account_index = account_index
         self.proxy = proxy
         self.private_key = private_key
         self.config = config
         self.session = session
+        self.context = context
 
         self.account: Account = Account.from_key(private_key=private_key)
-        self.web3 = AsyncWeb3(
-             AsyncWeb3.AsyncHTTPProvider(
-                 RPC_URL,
-                 request_kwargs={"proxy": (f"http://{proxy}") if proxy else None, "ssl": False},
-             )
-        ) 
+        if context:
+            # Общий клиент аккаунта: его транзакции сбрасывают кеш балансов
+            self.web3 = context.web3
+        else:
+            self.web3 = AsyncWeb3(
+                 AsyncWeb3.AsyncHTTPProvider(
+                     RPC_URL,
+                     request_kwargs={"proxy": (f"http://{proxy}") if proxy else None, "ssl": False},
+                 )
+            ) 
 
     async def _get_shmon_balance(self):
         for retry in range(self.config.SETTINGS.ATTEMPTS):
             try:
+                if self.context:
+                    balance = await self.context.balances.get_token_balance(
+                        SHMONAD_ADDRESS
+                    )
+                    return balance, balance / 10**18
+
                 contract = self.web3.eth.contract(
                     address=SHMONAD_ADDRESS, abi=SHMONAD_ABI
                 )
@@ -198,7 +211,10 @@ class Shmonad:
     async def buy_shmon(self) -> bool:
         for retry in range(self.config.SETTINGS.ATTEMPTS):
             try:
-                mon_balance = await self.web3.eth.get_balance(self.account.address)
+                if self.context:
+                    mon_balance = await self.context.balances.get_balance()
+                else:
+                    mon_balance = await self.web3.eth.get_balance(self.account.address)
 
                 random_percent = random.randint(
                     self.config.SHMONAD.PERCENT_OF_BALANCE_TO_SWAP[0],
@@ -1,7 +1,9 @@
+from eth_account import Account
 from loguru import logger
 import primp
 import random
 import asyncio
+import time
 
 from src.model.nfts.nerzo_rebels import NerzoRebels
 from src.model.others.superboard import Superboard
@@ -40,9 +42,26 @@ from src.model.magma.instance import Magma
 from src.model.apriori import Apriori
 from src.model.monad_xyz.instance import MonadXYZ
 from src.model.nad_domains.instance import NadDomains
-from src.utils.client import create_client
+from src.utils.client import create_client, get_client_manager
+from src.utils.proxy_pool import get_proxy_pool, mask_proxy
 from src.utils.config import Config
+from src.utils.account_context import AccountContext
 from src.model.help.stats import WalletStats
+from src.model.help.preflight import get_preflight
+from src.model.help.task_plan import (
+    PARALLEL,
+    is_offchain,
+    order_parallel_group,
+    task_class,
+)
+from src.utils.circuit_breaker import retry_time, track_tripped
+from src.utils.scheduler import get_task_classes, parked
+from src.utils.retry import retry_budget
+from src.utils.control import get_run_control
+
+
+# Times a task stopped by an open circuit is retried at the end of the flow
+DEFERRED_ROUNDS = 3
 
 
 class Start:
@@ -65,10 +84,26 @@ class Start:
         self.config = config
 
         self.session: primp.AsyncClient | None = None
+        self.context: AccountContext | None = None
+
+        # task name -> (module, its prepare() running in background)
+        self.prepared: dict[str, tuple[object, asyncio.Task]] = {}
+        # off-chain tasks of the current {} group
+        self.background: list[asyncio.Task] = []
+        # upstreams whose open circuit stopped the current task
+        self.tripped: set[str] = set()
+        # (task index, task, upstreams) put off until their circuits close
+        self.deferred: list[tuple[int, str, set[str]]] = []
 
     async def initialize(self):
         try:
-            self.session = await create_client(self.proxy)
+            # initialize() is retried, keep the session of the first attempt
+            if self.session is None:
+                self.session = await create_client(self.proxy)
+            if self.context is None:
+                self.context = AccountContext(
+                    self.account_index, self.private_key, self.proxy
+                )
 
             return True
         except Exception as e:
@@ -77,19 +112,15 @@ class Start:
 
     async def flow(self):
         try:
-            monad = MonadXYZ(
-                self.account_index,
-                self.proxy,
-                self.private_key,
-                self.discord_token,
-                self.config,
-                self.session,
-            )
+            monad = self.create_monad()
 
             if "farm_faucet" in self.config.FLOW.TASKS:
                 await monad.faucet()
                 return True
 
+            track_tripped(self.tripped)
+            self.deferred.clear()
+
             # Заранее определяем все задачи
             planned_tasks = []
             task_plan_msg = []
@@ -112,6 +143,14 @@ class Start:
                         planned_tasks.append((task_index, subtask, "shuffled_item"))
                         task_plan_msg.append(f"{task_index}. {subtask}")
                         task_index += 1
+                elif isinstance(task_item, (set, frozenset)):
+                    # For tasks in curly brackets {}, off-chain tasks run next to on-chain ones
+                    group = (PARALLEL, task_index)
+                    for subtask in order_parallel_group(task_item):
+                        planned_tasks.append((task_index, subtask, group))
+                        marker = "&" if is_offchain(subtask) else ""
+                        task_plan_msg.append(f"{task_index}. {marker}{subtask}")
+                        task_index += 1
                 else:
                     planned_tasks.append((task_index, task_item, "single"))
                     task_plan_msg.append(f"{task_index}. {task_item}")
@@ -122,12 +161,59 @@ class Start:
                 f"[{self.account_index}] Task execution plan: {' | '.join(task_plan_msg)}"
             )
 
+            planned_tasks = self.skip_done_tasks(planned_tasks)
+
             # Выполняем задачи по плану
-            for i, task, task_type in planned_tasks:
+            for n, (i, task, task_type) in enumerate(planned_tasks):
+                # Если прокси аккаунта умер, переезжаем на живой до следующей задачи
+                # (не посреди группы: фоновые задачи работают со старой сессией)
+                if not self.background and await self.switch_dead_proxy():
+                    monad = self.create_monad()
+
+                in_group = isinstance(task_type, tuple) and task_type[0] == PARALLEL
+                group_ends = n + 1 == len(planned_tasks) or planned_tasks[n + 1][2] != task_type
+
+                # Задачу выключили с control-сервера посреди прогона
+                if get_run_control().skip_task(self.account_index, task):
+                    logger.info(f"[{self.account_index}] Skipping task {i}: {task}, switched off by control")
+                    if in_group and group_ends:
+                        await self.finish_background()
+                    continue
+
+                if in_group and is_offchain(task):
+                    # HTTP-only task runs in background, the on-chain queue goes on
+                    logger.info(f"[{self.account_index}] Starting task {i} in background: {task}")
+                    self.background.append(
+                        asyncio.create_task(self.execute_task(task, monad))
+                    )
+                    if group_ends:
+                        await self.finish_background()
+                        await self.sleep(task)
+                    continue
+
                 logger.info(f"[{self.account_index}] Executing task {i}: {task}")
+                self.tripped.clear()
                 await self.execute_task(task, monad)
+                # Catch transactions sent around the shared client before the next task
+                if self.context:
+                    await self.context.sync()
+
+                # Upstream of the task is down: retry it at the end instead of sleeping in the slot
+                if self.tripped:
+                    self.defer(i, task)
+                    if in_group and group_ends:
+                        await self.finish_background()
+                    continue
+
+                # Пока идет пауза, заранее готовим данные для следующей задачи
+                if n + 1 < len(planned_tasks):
+                    self.start_prepare(planned_tasks[n + 1][1])
                 await self.sleep(task)
 
+                if in_group and group_ends:
+                    await self.finish_background()
+
+            await self.run_deferred(monad)
             return True
         except Exception as e:
             # import traceback
@@ -135,9 +221,28 @@ class Start:
             # input()
             logger.error(f"[{self.account_index}] | Error: {e}")
             return False
+        finally:
+            for background_task in self.background:
+                background_task.cancel()
+            self.background.clear()
+            for _, prepare in self.prepared.values():
+                prepare.cancel()
+            self.prepared.clear()
 
     async def execute_task(self, task, monad):
-        """Execute a single task"""
+        """Execute a single task within its retry budget and its class's concurrency limit"""
+        try:
+            async with get_task_classes().slot(task_class(task)):
+                with retry_budget(
+                    task,
+                    self.config.RETRY.TASK_MAX_RETRIES,
+                    self.config.RETRY.TASK_MAX_TIME,
+                ):
+                    await self.run_task(task, monad)
+        finally:
+            get_run_control().task_finished(self.account_index, task)
+
+    async def run_task(self, task, monad):
         task = task.lower()
 
         if task == "faucet":
@@ -241,6 +346,7 @@ class Start:
                 self.private_key,
                 self.config,
                 self.session,
+                context=self.context,
             )
             await shmonad.swaps()
 
@@ -285,6 +391,7 @@ class Start:
                 self.private_key,
                 self.config,
                 self.session,
+                context=self.context,
             )
             await kintsu.execute()
 
@@ -327,13 +434,7 @@ class Start:
             await nostra.execute()
 
         elif task == "magiceden":
-            magiceden = MagicEden(
-                self.account_index,
-                self.proxy,
-                self.config,
-                self.private_key,
-                self.session,
-            )
+            magiceden = await self.take_prepared(task)
             await magiceden.mint()
 
         # elif task == "aircraft":
@@ -382,6 +483,7 @@ class Start:
                 self.private_key,
                 self.config,
                 self.session,
+                context=self.context,
             )
             await octo_swap.execute()
 
@@ -435,13 +537,7 @@ class Start:
             await multiplifi.stake()
         
         elif task == "flapsh":
-            flapsh = Flapsh(
-                self.account_index,
-                self.proxy,
-                self.private_key,
-                self.config,
-                self.session,
-            )
+            flapsh = await self.take_prepared(task)
             await flapsh.execute()
         
         elif task.startswith("morkie_"):
@@ -496,6 +592,7 @@ class Start:
                 self.private_key,
                 self.config,
                 self.session,
+                context=self.context,
             )
             await madness.execute()
         
@@ -538,6 +635,160 @@ class Start:
             )
             await superboard.quests()
             
+    def defer(self, i: int, task: str):
+        logger.warning(
+            f"[{self.account_index}] {', '.join(sorted(self.tripped))} is down, "
+            f"task {i}: {task} will be retried later"
+        )
+        self.deferred.append((i, task, set(self.tripped)))
+
+    async def run_deferred(self, monad: MonadXYZ):
+        """Retry tasks stopped by an open circuit once their upstreams may be tried again"""
+        for _ in range(DEFERRED_ROUNDS):
+            if not self.deferred:
+                return
+            pending, self.deferred = self.deferred, []
+
+            wait = retry_time(set().union(*(names for _, _, names in pending))) - time.monotonic()
+            if wait > 0:
+                logger.info(
+                    f"[{self.account_index}] Waiting {wait:.0f}s to retry {len(pending)} deferred tasks"
+                )
+                # Пока ждем, слот отдаем другому аккаунту
+                async with parked():
+                    await asyncio.sleep(wait)
+
+            for i, task, _ in pending:
+                if get_run_control().skip_task(self.account_index, task):
+                    logger.info(f"[{self.account_index}] Skipping deferred task {i}: {task}, switched off by control")
+                    continue
+                logger.info(f"[{self.account_index}] Executing deferred task {i}: {task}")
+                self.tripped.clear()
+                await self.execute_task(task, monad)
+                if self.context:
+                    await self.context.sync()
+                if self.tripped:
+                    self.defer(i, task)
+                    continue
+                await self.sleep(task)
+
+        if self.deferred:
+            logger.error(
+                f"[{self.account_index}] Giving up on tasks with upstreams still down: "
+                f"{' | '.join(f'{i}. {task}' for i, task, _ in self.deferred)}"
+            )
+            self.deferred.clear()
+
+    async def finish_background(self):
+        """Wait for the off-chain tasks of the group, fail like a regular task would"""
+        results = await asyncio.gather(*self.background, return_exceptions=True)
+        self.background.clear()
+        for result in results:
+            if isinstance(result, BaseException):
+                raise result
+
+    def create_monad(self) -> MonadXYZ:
+        return MonadXYZ(
+            self.account_index,
+            self.proxy,
+            self.private_key,
+            self.discord_token,
+            self.config,
+            self.session,
+            context=self.context,
+        )
+
+    async def switch_dead_proxy(self) -> bool:
+        """Move the account to another proxy if the pool marked its own one dead"""
+        new_proxy = get_proxy_pool().replacement(self.proxy)
+        if new_proxy is None:
+            return False
+
+        logger.warning(
+            f"[{self.account_index}] Proxy {mask_proxy(self.proxy)} is dead, "
+            f"switching to {mask_proxy(new_proxy)}"
+        )
+        # Prepared modules hold the old session
+        for _, prepare in self.prepared.values():
+            prepare.cancel()
+        self.prepared.clear()
+
+        await self.close()
+        self.proxy = new_proxy
+        return await self.initialize()
+
+    async def close(self):
+        """Release account state kept between tasks"""
+        if self.context:
+            self.context.close()
+            self.context = None
+        if self.session:
+            await get_client_manager().release(self.session)
+            self.session = None
+
+    def create_preparable(self, task: str):
+        """Create module of a task that has a prepare() step, None for other tasks"""
+        if task == "magiceden":
+            return MagicEden(
+                self.account_index,
+                self.proxy,
+                self.config,
+                self.private_key,
+                self.session,
+            )
+        if task == "flapsh":
+            return Flapsh(
+                self.account_index,
+                self.proxy,
+                self.private_key,
+                self.config,
+                self.session,
+            )
+        return None
+
+    def skip_done_tasks(self, planned_tasks: list) -> list:
+        """Drop planned tasks the preflight scan found already done"""
+        preflight = get_preflight()
+        address = Account.from_key(self.private_key).address
+        kept = []
+        skipped = []
+        for entry in planned_tasks:
+            # Balance-based results are stale once any earlier task has run
+            if preflight.skip(address, entry[1], changed=bool(kept)):
+                skipped.append(f"{entry[0]}. {entry[1]}")
+            else:
+                kept.append(entry)
+
+        if skipped:
+            logger.info(
+                f"[{self.account_index}] Skipping tasks already done: {' | '.join(skipped)}"
+            )
+        return kept
+
+    def start_prepare(self, task: str):
+        """Run prepare() of the task's module in background during the pause"""
+        task = task.lower()
+        module = self.create_preparable(task)
+        if module is None:
+            return
+        self.prepared[task] = (module, asyncio.create_task(self._prepare(task, module)))
+
+    async def _prepare(self, task: str, module):
+        try:
+            await module.prepare()
+        except Exception as e:
+            # Prepare is an optimization only, the task fetches its data itself
+            logger.warning(f"[{self.account_index}] Failed to prepare {task}: {e}")
+
+    async def take_prepared(self, task: str):
+        """Get the prepared module of the task or create a fresh one"""
+        module, prepare = self.prepared.pop(task, (None, None))
+        if module is None:
+            return self.create_preparable(task)
+        # The task would fetch the same data itself, so wait for prepare to finish
+        await prepare
+        return module
+
     async def sleep(self, task_name: str):
         """Делает рандомную паузу между действиями"""
         pause = random.randint(
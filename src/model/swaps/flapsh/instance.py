@@ -10,10 +10,15 @@ from web3.types import TxParams, Wei, ChecksumAddress
 from eth_account import Account
 from loguru import logger
 from primp import AsyncClient
-import aiohttp
 
 from src.utils.config import Config
 from src.utils.constants import EXPLORER_URL, RPC_URL
+from src.utils.prefetch import Prefetched
+from src.utils.http_cache import shared_response
+from src.utils.client import get_client_manager
+
+# Top coins list is the same for all accounts, refreshed this often
+TOKENS_LIST_TTL = 120  # seconds
 
 
 class Flapsh:
@@ -42,6 +47,14 @@ class Flapsh:
             )
         )
 
+        # Список токенов, полученный заранее во время паузы перед задачей
+        self._prepared_tokens = Prefetched()
+
+    async def prepare(self):
+        """Заранее получает список токенов с API, если он не задан в конфиге."""
+        if not self.config.FLAPSH.TOKEN_ADDRESS:
+            self._prepared_tokens.put(await self._parse_tokens())
+
     async def execute(self):
         """
         Основной метод для выполнения операций покупки мемкоинов.
@@ -62,7 +75,9 @@ class Flapsh:
                 logger.info(
                     "No token addresses specified in config, fetching from API..."
                 )
-                token_addresses = await self._parse_tokens()
+                token_addresses = (
+                    self._prepared_tokens.take() or await self._parse_tokens()
+                )
 
                 if not token_addresses:
                     logger.error("Failed to get token addresses from API")
@@ -264,6 +279,7 @@ class Flapsh:
         except Exception as e:
             raise e
 
+    @shared_response(ttl=TOKENS_LIST_TTL)
     async def _parse_tokens(self) -> List[str] | None:
         """
         Получает список адресов токенов с API Flapsh.
@@ -293,54 +309,54 @@ class Flapsh:
 
                 api_url = "https://v8xq3y0pc5.execute-api.eu-west-3.amazonaws.com/v1"
 
-                # Используем контекстный менеджер для сессии aiohttp
-                async with aiohttp.ClientSession() as session:
-                    # Настраиваем прокси для запроса
-                    async with session.post(
-                        api_url,
-                        headers=headers,
-                        data=data,
-                        proxy=proxy_url,
-                        ssl=False,  # Отключаем проверку SSL
-                    ) as response:
-                        if response.status != 200:
-                            logger.error(
-                                f"API returned non-200 status: {response.status}"
-                            )
-                            continue
-
-                        response_json = await response.json()
-
-                        # Проверяем структуру ответа
-                        if (
-                            "data" not in response_json
-                            or "coins" not in response_json["data"]
-                        ):
-                            logger.error("Invalid API response structure")
-                            continue
-
-                        # Извлекаем адреса контрактов
-                        contracts = []
-                        for coin in response_json["data"]["coins"]:
-                            try:
-                                if "address" in coin and coin["address"]:
-                                    contracts.append(coin["address"])
-                            except Exception as e:
-                                logger.warning(
-                                    f"Error extracting contract address: {str(e)}"
-                                )
-                                continue
-
-                        if not contracts:
+                # Общая сессия aiohttp, прокси передаётся в запросе
+                session = get_client_manager().get_aiohttp()
+                # Настраиваем прокси для запроса
+                async with session.post(
+                    api_url,
+                    headers=headers,
+                    data=data,
+                    proxy=proxy_url,
+                    ssl=False,  # Отключаем проверку SSL
+                ) as response:
+                    if response.status != 200:
+                        logger.error(
+                            f"API returned non-200 status: {response.status}"
+                        )
+                        continue
+
+                    response_json = await response.json()
+
+                    # Проверяем структуру ответа
+                    if (
+                        "data" not in response_json
+                        or "coins" not in response_json["data"]
+                    ):
+                        logger.error("Invalid API response structure")
+                        continue
+
+                    # Извлекаем адреса контрактов
+                    contracts = []
+                    for coin in response_json["data"]["coins"]:
+                        try:
+                            if "address" in coin and coin["address"]:
+                                contracts.append(coin["address"])
+                        except Exception as e:
                             logger.warning(
-                                "No contract addresses found in API response"
+                                f"Error extracting contract address: {str(e)}"
                             )
                             continue
 
-                        logger.success(
-                            f"Successfully retrieved {len(contracts)} contract addresses"
+                    if not contracts:
+                        logger.warning(
+                            "No contract addresses found in API response"
                         )
-                        return contracts
+                        continue
+
+                    logger.success(
+                        f"Successfully retrieved {len(contracts)} contract addresses"
+                    )
+                    return contracts
 
             except Exception as e:
                 random_sleep = random.uniform(
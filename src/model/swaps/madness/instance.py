@@ -13,6 +13,10 @@ from primp import AsyncClient
 
 from src.utils.config import Config
 from src.utils.constants import EXPLORER_URL, RPC_URL
+from src.utils.account_context import AccountContext
+from src.utils.retry import should_retry
+from src.model.help.holdings_index import get_holdings_index
+from src.utils.allowance import MAX_UINT256, get_allowance_index
 from .constants import (
     ROUTER_CONTRACT,
     WMON_CONTRACT,
@@ -31,23 +35,29 @@ class Madness:
         private_key: str,
         config: Config,
         session: AsyncClient,
+        context: AccountContext | None = None,
     ):
         self.account_index = account_index
         self.proxy = proxy
         self.private_key = private_key
         self.config = config
         self.session = session
+        self.context = context
 
         # Создаем аккаунт из приватного ключа
         self.account: Account = Account.from_key(private_key=private_key)
 
-        # Создаем настроенный Web3 клиент с middleware для повторных попыток
-        self.web3 = AsyncWeb3(
-            AsyncWeb3.AsyncHTTPProvider(
-                RPC_URL,
-                request_kwargs={"proxy": (f"http://{proxy}") if proxy else None, "ssl": False},
+        if context:
+            # Общий клиент аккаунта: его транзакции сбрасывают кеш балансов
+            self.web3 = context.web3
+        else:
+            # Создаем настроенный Web3 клиент с middleware для повторных попыток
+            self.web3 = AsyncWeb3(
+                AsyncWeb3.AsyncHTTPProvider(
+                    RPC_URL,
+                    request_kwargs={"proxy": (f"http://{proxy}") if proxy else None, "ssl": False},
+                )
             )
-        )
 
     async def execute(self):
         """
@@ -224,6 +234,15 @@ class Madness:
             try:
                 wallet_address = Web3.to_checksum_address(wallet_address)
 
+                if self.context and wallet_address == self.account.address:
+                    if token["native"]:
+                        balance_wei = await self.context.balances.get_balance()
+                        return float(Web3.from_wei(balance_wei, "ether"))
+                    balance_wei = await self.context.balances.get_token_balance(
+                        token["address"]
+                    )
+                    return float(balance_wei) / (10 ** token["decimals"])
+
                 if token["native"]:
                     balance_wei = await self.web3.eth.get_balance(wallet_address)
                     return float(Web3.from_wei(balance_wei, "ether"))
@@ -236,7 +255,8 @@ class Madness:
             except Exception as e:
                 retries += 1
                 last_exception = e
-                await asyncio.sleep(1)
+                if not await should_retry(e, retries - 1, pause=(0.5, 1.5)):
+                    break
 
         logger.error(
             f"[{self.account_index}] All {max_retries} retry attempts failed when checking balance. Last error: {last_exception}"
@@ -247,11 +267,9 @@ class Madness:
         self, token_address: str, spender_address: str, amount_wei: int
     ) -> bool:
         """Check if allowance is sufficient for token."""
-        token_contract = await self.get_token_contract(token_address)
-        current_allowance = await token_contract.functions.allowance(
-            self.account.address, spender_address
-        ).call()
-        return current_allowance >= amount_wei
+        return await get_allowance_index().has_allowance(
+            self.web3, self.account.address, token_address, spender_address, amount_wei
+        )
 
     async def approve_token(
         self, token: Dict, amount_wei: int, spender_address: str
@@ -278,14 +296,11 @@ class Madness:
             f"[{self.account_index}] 🔑 [APPROVAL] Approving {token['name']}..."
         )
 
-        # Maximum value for approve (uint256 max)
-        max_uint256 = 2**256 - 1
-
         # Create token contract
         token_contract = await self.get_token_contract(token["address"])
 
         # Prepare approve function
-        approve_func = token_contract.functions.approve(spender_address, max_uint256)
+        approve_func = token_contract.functions.approve(spender_address, MAX_UINT256)
 
         # Get gas parameters
         gas_params = await self.get_gas_params()
@@ -324,6 +339,9 @@ class Madness:
         receipt = await self.web3.eth.wait_for_transaction_receipt(tx_hash)
 
         if receipt["status"] == 1:
+            get_allowance_index().set(
+                self.account.address, token["address"], spender_address, MAX_UINT256
+            )
             logger.success(
                 f"[{self.account_index}] ✅ [APPROVAL] {token['name']} approved. TX: {EXPLORER_URL}{tx_hash.hex()}"
             )
@@ -581,11 +599,20 @@ class Madness:
         # Default threshold for any token not in the list
         default_threshold = 0.0000001
 
-        # Iterate through all available tokens
-        for symbol, token in AVAILABLE_TOKENS.items():
-            # Skip MON, as it's the target token
-            if token["native"]:
-                continue
+        # Only tokens the holdings index has seen in the wallet are checked
+        tokens = {
+            symbol: token for symbol, token in AVAILABLE_TOKENS.items() if not token["native"]
+        }
+        held = await get_holdings_index().held_tokens(
+            self.account.address, [token["address"] for token in tokens.values()]
+        )
+        if held is not None:
+            tokens = {
+                symbol: token for symbol, token in tokens.items() if token["address"] in held
+            }
+
+        # Iterate through the held tokens
+        for symbol, token in tokens.items():
 
             # Get token balance
             balance = await self.get_token_balance(self.account.address, token)
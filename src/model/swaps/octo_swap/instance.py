@@ -4,7 +4,7 @@ import random
 import asyncio
 from decimal import Decimal
 from typing import Dict, List, Optional, Union, Tuple
-from web3 import AsyncWeb3, Web3
+from web3 import Web3
 from web3.contract import Contract
 from web3.types import TxParams, Wei, ChecksumAddress
 from eth_account import Account
@@ -12,7 +12,12 @@ from loguru import logger
 from primp import AsyncClient
 
 from src.utils.config import Config
-from src.utils.constants import EXPLORER_URL, RPC_URL
+from src.utils.constants import EXPLORER_URL
+from src.utils.allowance import MAX_UINT256, get_allowance_index
+from src.utils.tx_builder import TxBuilder
+from src.utils.account_context import AccountContext
+from src.utils.retry import should_retry
+from src.model.help.holdings_index import get_holdings_index
 
 from .constants import (
     ROUTER_CONTRACT,
@@ -35,6 +40,7 @@ class OctoSwap:
         private_key: str,
         config: Config,
         session: AsyncClient,
+        context: AccountContext | None = None,
     ):
         """
         Инициализация OctoSwap
@@ -45,23 +51,21 @@ class OctoSwap:
             private_key: Приватный ключ кошелька
             config: Конфигурация
             session: HTTP сессия
+            context: Общее состояние аккаунта между задачами (балансы, nonce)
         """
         self.account_index = account_index
         self.proxy = proxy
         self.private_key = private_key
         self.config = config
         self.session = session
+        self.context = context
 
         # Создаем аккаунт из приватного ключа
         self.account: Account = Account.from_key(private_key=private_key)
 
-        # Создаем настроенный Web3 клиент с middleware для повторных попыток
-        self.web3 = AsyncWeb3(
-            AsyncWeb3.AsyncHTTPProvider(
-                RPC_URL,
-                request_kwargs={"proxy": (f"http://{proxy}") if proxy else None, "ssl": False},
-            )
-        )
+        # Сборщик транзакций: nonce, комиссии и лимит газа кешируются локально
+        self.tx_builder = context.tx_builder if context else TxBuilder(private_key, proxy)
+        self.web3 = self.tx_builder.web3
 
     async def get_gas_params(self) -> Dict[str, int]:
         """Получить текущие параметры газа из сети."""
@@ -122,6 +126,15 @@ class OctoSwap:
             try:
                 wallet_address = Web3.to_checksum_address(wallet_address)
 
+                if self.context and wallet_address == self.account.address:
+                    if token["native"]:
+                        balance_wei = await self.context.balances.get_balance()
+                        return float(Web3.from_wei(balance_wei, "ether"))
+                    balance_wei = await self.context.balances.get_token_balance(
+                        token["address"]
+                    )
+                    return float(balance_wei) / (10 ** token["decimals"])
+
                 if token["native"]:
                     balance_wei = await self.web3.eth.get_balance(wallet_address)
                     return float(Web3.from_wei(balance_wei, "ether"))
@@ -134,7 +147,8 @@ class OctoSwap:
             except Exception as e:
                 retries += 1
                 last_exception = e
-                await asyncio.sleep(1)
+                if not await should_retry(e, retries - 1, pause=(0.5, 1.5)):
+                    break
 
         logger.error(
             f"[{self.account_index}] All {max_retries} retry attempts failed when checking balance. Last error: {last_exception}"
@@ -145,11 +159,9 @@ class OctoSwap:
         self, token_address: str, spender_address: str, amount_wei: int
     ) -> bool:
         """Проверить, достаточно ли allowance для токена."""
-        token_contract = await self.get_token_contract(token_address)
-        current_allowance = await token_contract.functions.allowance(
-            self.account.address, spender_address
-        ).call()
-        return current_allowance >= amount_wei
+        return await get_allowance_index().has_allowance(
+            self.web3, self.account.address, token_address, spender_address, amount_wei
+        )
 
     async def approve_token(self, token: Dict, amount_wei: int) -> Optional[str]:
         """
@@ -173,56 +185,27 @@ class OctoSwap:
             f"[{self.account_index}] 🔑 [APPROVAL] Approving {token['name']}..."
         )
 
-        # Максимальное значение для approve (uint256 max)
-        max_uint256 = 2**256 - 1
-
         # Создаем контракт токена
         token_contract = await self.get_token_contract(token["address"])
 
         # Подготовка функции approve
-        approve_func = token_contract.functions.approve(ROUTER_CONTRACT, max_uint256)
-
-        # Получаем параметры газа
-        gas_params = await self.get_gas_params()
-
-        # Создаем транзакцию
-        transaction = {
-            "from": self.account.address,
-            "to": token["address"],
-            "data": approve_func._encode_transaction_data(),
-            "chainId": 10143,
-            "type": 2,
-            "nonce": await self.web3.eth.get_transaction_count(
-                self.account.address, "latest"
-            ),
-        }
+        approve_func = token_contract.functions.approve(ROUTER_CONTRACT, MAX_UINT256)
 
-        # Оценка газа
-        try:
-            estimated_gas = await self.estimate_gas(transaction)
-            transaction.update({"gas": estimated_gas, **gas_params})
-        except Exception as e:
-            logger.error(
-                f"[{self.account_index}] Failed to estimate gas for approval: {str(e)}"
-            )
-            raise ValueError(
-                f"Gas estimation failed for {token['name']} approval: {str(e)}"
-            )
-
-        # Подписание и отправка транзакции
-        signed_tx = self.web3.eth.account.sign_transaction(
-            transaction, self.private_key
+        # approve(router, max) всегда стоит одинаково, лимит газа берем из кеша
+        tx_hash, receipt = await self.tx_builder.send_and_wait(
+            to=token["address"],
+            data=approve_func._encode_transaction_data(),
+            cache_gas=True,
         )
-        tx_hash = await self.web3.eth.send_raw_transaction(signed_tx.raw_transaction)
-
-        # Ожидание подтверждения транзакции
-        receipt = await self.web3.eth.wait_for_transaction_receipt(tx_hash)
 
         if receipt["status"] == 1:
+            get_allowance_index().set(
+                self.account.address, token["address"], ROUTER_CONTRACT, MAX_UINT256
+            )
             logger.success(
-                f"[{self.account_index}] ✅ [APPROVAL] {token['name']} approved. TX: {EXPLORER_URL}{tx_hash.hex()}"
+                f"[{self.account_index}] ✅ [APPROVAL] {token['name']} approved. TX: {EXPLORER_URL}{tx_hash}"
             )
-            return Web3.to_hex(tx_hash)
+            return "0x" + tx_hash
         else:
             logger.error(f"[{self.account_index}] Approval transaction failed.")
             return None
@@ -444,55 +427,26 @@ class OctoSwap:
                 # Подготавливаем функцию deposit
                 deposit_func = wmon_contract.functions.deposit()
 
-                # Получаем параметры газа
-                gas_params = await self.get_gas_params()
-
-                # Создаем транзакцию
-                transaction = {
-                    "from": self.account.address,
-                    "to": WMON_CONTRACT,
-                    "value": amount_wei,
-                    "data": deposit_func._encode_transaction_data(),
-                    "chainId": 10143,
-                    "type": 2,
-                    "nonce": await self.web3.eth.get_transaction_count(
-                        self.account.address, "latest"
-                    ),
-                }
-
-                # Оценка газа
-                try:
-                    estimated_gas = await self.estimate_gas(transaction)
-                    transaction.update({"gas": estimated_gas, **gas_params})
-                except Exception as e:
-                    logger.error(
-                        f"[{self.account_index}] Failed to estimate gas for deposit: {str(e)}"
-                    )
-                    raise ValueError(f"Gas estimation failed for deposit: {str(e)}")
-
                 logger.info(
                     f"[{self.account_index}] 💰 [DEPOSIT] Converting MON to WMON via deposit..."
                 )
 
-                # Подписываем и отправляем транзакцию
-                signed_tx = self.web3.eth.account.sign_transaction(
-                    transaction, self.private_key
-                )
-                tx_hash = await self.web3.eth.send_raw_transaction(
-                    signed_tx.raw_transaction
+                # deposit() стоит одинаково при любой сумме, лимит газа берем из кеша
+                tx_hash, receipt = await self.tx_builder.send_and_wait(
+                    to=WMON_CONTRACT,
+                    data=deposit_func._encode_transaction_data(),
+                    value=amount_wei,
+                    cache_gas=True,
                 )
                 logger.info(
-                    f"[{self.account_index}] 🚀 [TX SENT] Transaction hash: {EXPLORER_URL}{tx_hash.hex()}"
+                    f"[{self.account_index}] 🚀 [TX SENT] Transaction hash: {EXPLORER_URL}{tx_hash}"
                 )
-
-                # Ожидаем подтверждения транзакции
-                receipt = await self.web3.eth.wait_for_transaction_receipt(tx_hash)
                 block_number = receipt["blockNumber"]
 
                 if receipt["status"] == 1:
                     return {
                         "success": True,
-                        "tx_hash": Web3.to_hex(tx_hash),
+                        "tx_hash": "0x" + tx_hash,
                         "block_number": block_number,
                         "from_token": "MON",
                         "to_token": "WMON",
@@ -538,54 +492,25 @@ class OctoSwap:
                 # Подготавливаем функцию withdraw
                 withdraw_func = wmon_contract.functions.withdraw(amount_wei)
 
-                # Получаем параметры газа
-                gas_params = await self.get_gas_params()
-
-                # Создаем транзакцию
-                transaction = {
-                    "from": self.account.address,
-                    "to": WMON_CONTRACT,
-                    "data": withdraw_func._encode_transaction_data(),
-                    "chainId": 10143,
-                    "type": 2,
-                    "nonce": await self.web3.eth.get_transaction_count(
-                        self.account.address, "latest"
-                    ),
-                }
-
-                # Оценка газа
-                try:
-                    estimated_gas = await self.estimate_gas(transaction)
-                    transaction.update({"gas": estimated_gas, **gas_params})
-                except Exception as e:
-                    logger.error(
-                        f"[{self.account_index}] Failed to estimate gas for withdraw: {str(e)}"
-                    )
-                    raise ValueError(f"Gas estimation failed for withdraw: {str(e)}")
-
                 logger.info(
                     f"[{self.account_index}] 💸 [WITHDRAW] Converting WMON to MON via withdraw..."
                 )
 
-                # Подписываем и отправляем транзакцию
-                signed_tx = self.web3.eth.account.sign_transaction(
-                    transaction, self.private_key
-                )
-                tx_hash = await self.web3.eth.send_raw_transaction(
-                    signed_tx.raw_transaction
+                # withdraw() стоит одинаково при любой сумме, лимит газа берем из кеша
+                tx_hash, receipt = await self.tx_builder.send_and_wait(
+                    to=WMON_CONTRACT,
+                    data=withdraw_func._encode_transaction_data(),
+                    cache_gas=True,
                 )
                 logger.info(
-                    f"[{self.account_index}] 🚀 [TX SENT] Transaction hash: {EXPLORER_URL}{tx_hash.hex()}"
+                    f"[{self.account_index}] 🚀 [TX SENT] Transaction hash: {EXPLORER_URL}{tx_hash}"
                 )
-
-                # Ожидаем подтверждения транзакции
-                receipt = await self.web3.eth.wait_for_transaction_receipt(tx_hash)
                 block_number = receipt["blockNumber"]
 
                 if receipt["status"] == 1:
                     return {
                         "success": True,
-                        "tx_hash": Web3.to_hex(tx_hash),
+                        "tx_hash": "0x" + tx_hash,
                         "block_number": block_number,
                         "from_token": "WMON",
                         "to_token": "MON",
@@ -657,11 +582,20 @@ class OctoSwap:
         target_token = AVAILABLE_TOKENS["MON"]
         logger.info(f"[{self.account_index}] 🔄 Swapping all tokens to MON")
 
-        # Перебираем все доступные токены
-        for symbol, token in AVAILABLE_TOKENS.items():
-            # Пропускаем MON, так как это целевой токен
-            if token["native"]:
-                continue
+        # Токены, которых нет в индексе балансов кошелька, не проверяем
+        tokens = {
+            symbol: token for symbol, token in AVAILABLE_TOKENS.items() if not token["native"]
+        }
+        held = await get_holdings_index().held_tokens(
+            self.account.address, [token["address"] for token in tokens.values()]
+        )
+        if held is not None:
+            tokens = {
+                symbol: token for symbol, token in tokens.items() if token["address"] in held
+            }
+
+        # Перебираем токены с балансом
+        for symbol, token in tokens.items():
 
             # Получаем баланс токена
             balance = await self.get_token_balance(self.account.address, token)
@@ -5,6 +5,15 @@ import random
 import asyncio
 from loguru import logger
 from src.utils.config import Config
+from src.utils.fund_watcher import get_fund_watcher
+from src.utils.chains import (
+    get_chain_web3,
+    get_fee_data,
+    get_native_balance,
+    get_native_balances,
+    invalidate_balance,
+)
+from src.model.help.bridge_routes import get_bridge_routes
 from src.model.testnet_bridge.constants import (
     TESTNET_BRIDGE_RPCS, 
     TESTNET_BRIDGE_ADDRESS, 
@@ -33,9 +42,7 @@ class TestnetBridge:
         # Initialize Web3 connections for each network
         self.web3_connections = {}
         for network, rpc in TESTNET_BRIDGE_RPCS.items():
-            self.web3_connections[network] = AsyncWeb3(
-                AsyncWeb3.AsyncHTTPProvider(rpc, request_kwargs={"proxy": (f"http://{proxy}") if proxy else None, "ssl": False})
-            )
+            self.web3_connections[network] = get_chain_web3(rpc, proxy)
             
         # Initialize contract objects for each network
         self.bridge_contracts = {}
@@ -67,8 +74,10 @@ class TestnetBridge:
                 logger.error(f"[{self.account_index}] No web3 connection for {network}")
                 raise ValueError(f"No web3 connection for {network}")
                 
-            balance_wei = await self.web3_connections[network].eth.get_balance(self.account.address)
-            return float(self.web3_connections[network].from_wei(balance_wei, 'ether'))
+            balance_wei = await get_native_balance(
+                TESTNET_BRIDGE_RPCS[network], self.account.address, self.proxy
+            )
+            return float(Web3.from_wei(balance_wei, 'ether'))
         except Exception as e:
             logger.error(f"[{self.account_index}] Failed to get balance for {network}: {str(e)}")
             raise e
@@ -79,24 +88,18 @@ class TestnetBridge:
         timeout = self.config.TESTNET_BRIDGE.MAX_WAIT_TIME
         
         logger.info(f"[{self.account_index}] Waiting for Sepolia balance to increase (max wait time: {timeout} seconds)...")
-        start_time = asyncio.get_event_loop().time()
-        
-        # Check balance every 5 seconds until timeout
-        while asyncio.get_event_loop().time() - start_time < timeout:
-            current_balance = await self.get_sepolia_balance()
-            if current_balance > initial_balance:
-                logger.success(
-                    f"[{self.account_index}] Sepolia balance increased from {initial_balance} to {current_balance} ETH"
-                )
-                return True
-            
-            # Log progress every 15 seconds
-            elapsed = int(asyncio.get_event_loop().time() - start_time)
-            if elapsed % 15 == 0:
-                logger.info(f"[{self.account_index}] Still waiting for Sepolia balance to increase... ({elapsed}/{timeout} seconds)")
-            
-            await asyncio.sleep(5)
-        
+        current_balance = await get_fund_watcher().wait_for_balance(
+            TESTNET_BRIDGE_RPCS["Sepolia"],
+            self.account.address,
+            lambda balance: float(Web3.from_wei(balance, "ether")) > initial_balance,
+            timeout,
+        )
+        if current_balance is not None:
+            logger.success(
+                f"[{self.account_index}] Sepolia balance increased from {initial_balance} to {float(Web3.from_wei(current_balance, 'ether'))} ETH"
+            )
+            return True
+
         logger.error(f"[{self.account_index}] Sepolia balance didn't increase after {timeout} seconds")
         raise TimeoutError(f"Sepolia balance didn't increase after {timeout} seconds")
 
@@ -129,8 +132,19 @@ class TestnetBridge:
                 logger.info(f"[{self.account_index}] Checking balances for bridging {amount_to_bridge} ETH to Sepolia")
             
             
-            for network in self.config.TESTNET_BRIDGE.NETWORKS_TO_REFUEL_FROM:
-                balance = await self.get_native_balance(network)
+            networks_to_refuel_from = get_bridge_routes().networks(
+                "testnet_bridge", self.account.address, self.config.TESTNET_BRIDGE.NETWORKS_TO_REFUEL_FROM
+            )
+            # Balances of all source chains are read concurrently
+            balances = await get_native_balances(
+                {network: TESTNET_BRIDGE_RPCS[network] for network in networks_to_refuel_from},
+                self.account.address,
+                self.proxy,
+            )
+            for network, balance_wei in balances.items():
+                if balance_wei is None:
+                    continue
+                balance = float(Web3.from_wei(balance_wei, 'ether'))
                 logger.info(f"[{self.account_index}] {network} balance: {balance}")
                 
                 # Adjust the check to ensure there's enough for the bridge plus gas
@@ -153,9 +167,7 @@ class TestnetBridge:
     async def get_gas_params(self, web3: AsyncWeb3) -> Dict[str, int]:
         """Get gas parameters for transaction."""
         try:
-            latest_block = await web3.eth.get_block('latest')
-            base_fee = latest_block['baseFeePerGas']
-            max_priority_fee = await web3.eth.max_priority_fee
+            base_fee, max_priority_fee = await get_fee_data(web3)
             max_fee = int((base_fee + max_priority_fee) * 2)
             
             return {
@@ -441,6 +453,7 @@ class TestnetBridge:
             # Sign and send the transaction
             signed_tx = web3.eth.account.sign_transaction(built_transaction, self.private_key)
             tx_hash = await web3.eth.send_raw_transaction(signed_tx.raw_transaction)
+            invalidate_balance(TESTNET_BRIDGE_RPCS[network], self.account.address)
             
             logger.info(f"[{self.account_index}] Waiting for bridge transaction confirmation...")
             receipt = await web3.eth.wait_for_transaction_receipt(tx_hash)
@@ -0,0 +1,132 @@
+import time
+from typing import Dict, Iterable, Optional, Tuple
+
+from eth_account import Account
+from loguru import logger
+from web3 import AsyncWeb3
+
+from src.utils.constants import ERC20_ABI
+from src.utils.provider import batch_web3
+from src.utils.tx_builder import TxBuilder
+
+
+# Safety net for balance changes nobody reported, e.g. incoming transfers
+BALANCE_CACHE_TTL = 30  # seconds
+
+# Key of the native MON balance in BalanceCache
+NATIVE = None
+
+
+class BalanceCache:
+    """
+    Native and ERC20 balances (in wei) of one wallet.
+
+    Entries stay valid until the wallet sends a transaction or a watcher
+    reports a transfer to it (invalidate()), missing entries are read
+    together in one JSON-RPC batch.
+    """
+
+    def __init__(
+        self,
+        web3: AsyncWeb3,
+        address: str,
+        proxy: Optional[str] = None,
+        ttl: float = BALANCE_CACHE_TTL,
+    ):
+        self.web3 = web3
+        self.address = web3.to_checksum_address(address)
+        self.proxy = proxy
+        self.ttl = ttl
+        self._balances: Dict[Optional[str], Tuple[float, int]] = {}
+
+    def invalidate(self):
+        self._balances.clear()
+
+    def _cached(self, token: Optional[str]) -> Optional[int]:
+        entry = self._balances.get(token)
+        if entry and time.monotonic() - entry[0] < self.ttl:
+            return entry[1]
+        return None
+
+    async def get_balances(
+        self, tokens: Iterable[Optional[str]]
+    ) -> Dict[Optional[str], int]:
+        """Balances of tokens (NATIVE for MON), reading all missing ones at once."""
+        tokens = [token.lower() if token else NATIVE for token in tokens]
+        missing = [token for token in dict.fromkeys(tokens) if self._cached(token) is None]
+
+        if missing:
+            # A batch on the shared client would break concurrent TxBuilder calls
+            async with batch_web3(self.proxy, self.web3.provider.endpoint_uri) as web3:
+                async with web3.batch_requests() as batch:
+                    for token in missing:
+                        if token is NATIVE:
+                            batch.add(web3.eth.get_balance(self.address))
+                        else:
+                            contract = web3.eth.contract(
+                                address=web3.to_checksum_address(token), abi=ERC20_ABI
+                            )
+                            batch.add(contract.functions.balanceOf(self.address))
+                    results = await batch.async_execute()
+
+            now = time.monotonic()
+            for token, balance in zip(missing, results):
+                self._balances[token] = (now, int(balance))
+
+        return {token: self._balances[token][1] for token in tokens}
+
+    async def get_balance(self) -> int:
+        return (await self.get_balances([NATIVE]))[NATIVE]
+
+    async def get_token_balance(self, token: str) -> int:
+        return (await self.get_balances([token]))[token.lower()]
+
+
+class AccountContext:
+    """
+    Everything one account needs across the tasks of Start.flow.
+
+    Holds the signer, the shared web3 client, the TxBuilder with its local
+    nonce and the balance cache. The cache is invalidated when the account
+    sends a transaction through the shared provider, and sync() catches
+    transactions sent by modules that still use their own clients.
+    """
+
+    def __init__(self, account_index: int, private_key: str, proxy: Optional[str] = None):
+        self.account_index = account_index
+        self.proxy = proxy
+        self.account = Account.from_key(private_key)
+
+        self.tx_builder = TxBuilder(private_key, proxy)
+        self.web3 = self.tx_builder.web3
+        self.balances = BalanceCache(self.web3, self.address, proxy)
+
+        self.web3.provider.add_send_listener(self._on_send)
+
+    @property
+    def address(self) -> str:
+        return self.account.address
+
+    def _on_send(self, sender: str):
+        if sender == self.address:
+            self.balances.invalidate()
+
+    async def sync(self):
+        """
+        Reconcile local state with the chain after a task.
+
+        If the pending nonce differs from the one TxBuilder expects, some
+        transaction went around the shared provider: cached balances are
+        dropped and the local nonce is moved to the chain's value.
+        """
+        pending = await self.web3.eth.get_transaction_count(self.address, "pending")
+        if pending != self.tx_builder.local_nonce:
+            if self.tx_builder.local_nonce is not None:
+                logger.debug(
+                    f"[{self.account_index}] Nonce moved outside of the shared client, refreshing account state"
+                )
+            self.balances.invalidate()
+            self.tx_builder.set_nonce(pending)
+
+    def close(self):
+        self.web3.provider.remove_send_listener(self._on_send)
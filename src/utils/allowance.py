@@ -0,0 +1,173 @@
+import asyncio
+import json
+import os
+from contextlib import contextmanager
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from loguru import logger
+from web3 import AsyncWeb3
+
+from src.utils.config import get_config
+from src.utils.batch_executor import get_batch_executor
+
+
+MAX_UINT256 = 2**256 - 1
+ALLOWANCES_FILE = "data/allowances.json"
+# Changes within this many seconds go to disk in one write
+SAVE_DELAY = 2.0
+
+ALLOWANCE_ABI = [
+    {
+        "inputs": [
+            {"internalType": "address", "name": "owner", "type": "address"},
+            {"internalType": "address", "name": "spender", "type": "address"},
+        ],
+        "name": "allowance",
+        "outputs": [{"internalType": "uint256", "name": "", "type": "uint256"}],
+        "stateMutability": "view",
+        "type": "function",
+    }
+]
+
+
+class AllowanceIndex:
+    """
+    Persisted ERC20 allowances per (wallet, token, spender).
+
+    Approve sites ask the index before sending an approve transaction and
+    report what they approved and spent, so repeated swaps through the same
+    router skip the approve (and its receipt wait) while the allowance lasts.
+    Unknown entries are read on-chain, several at once in one JSON-RPC batch.
+    """
+
+    def __init__(self, path: str = ALLOWANCES_FILE):
+        self.path = path
+        self._allowances: Dict[str, int] = {}
+        self._save_handle: Optional[asyncio.TimerHandle] = None
+        self._load()
+
+    @staticmethod
+    def _key(owner: str, token: str, spender: str) -> str:
+        return f"{owner.lower()}:{token.lower()}:{spender.lower()}"
+
+    def _load(self):
+        if not os.path.exists(self.path):
+            return
+        try:
+            with open(self.path, "r") as f:
+                self._allowances = {k: int(v) for k, v in json.load(f).items()}
+        except Exception as e:
+            logger.warning(f"Failed to load allowance index, starting empty: {e}")
+
+    def save(self):
+        """Schedule a write, changes made meanwhile go in the same write."""
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            self.flush()
+            return
+        if self._save_handle is None:
+            self._save_handle = loop.call_later(SAVE_DELAY, self.flush)
+
+    def flush(self):
+        if self._save_handle is not None:
+            self._save_handle.cancel()
+            self._save_handle = None
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, "w") as f:
+            # uint256 does not fit into JSON numbers of most readers, keep strings
+            json.dump({k: str(v) for k, v in self._allowances.items()}, f)
+        os.replace(tmp_path, self.path)
+
+    def get(self, owner: str, token: str, spender: str) -> Optional[int]:
+        return self._allowances.get(self._key(owner, token, spender))
+
+    def set(self, owner: str, token: str, spender: str, amount: int):
+        self._allowances[self._key(owner, token, spender)] = amount
+        self.save()
+
+    def forget(self, owner: str, token: str, spender: str):
+        if self._allowances.pop(self._key(owner, token, spender), None) is not None:
+            self.save()
+
+    def spend(self, owner: str, token: str, spender: str, amount: int):
+        """Account for a transferFrom done by spender."""
+        current = self.get(owner, token, spender)
+        # Unknown entries are re-read on demand, unlimited ones never run out
+        if current is None or current == MAX_UINT256:
+            return
+        self.set(owner, token, spender, max(current - amount, 0))
+
+    @contextmanager
+    def spending(self, owner: str, token: str, spender: str, amount: int):
+        """
+        Wrap a transaction that spends the allowance.
+
+        On success the allowance is decreased, on failure the entry is dropped
+        so that the next check re-reads it from the chain.
+        """
+        try:
+            yield
+        except Exception:
+            self.forget(owner, token, spender)
+            raise
+        self.spend(owner, token, spender, amount)
+
+    async def refresh(
+        self, web3: AsyncWeb3, owner: str, pairs: Iterable[Tuple[str, str]]
+    ) -> List[int]:
+        """
+        Read allowances of owner for (token, spender) pairs.
+
+        The reads go out in the shared batches of the batch executor, together
+        with the allowance checks of other accounts.
+        """
+        pairs = list(pairs)
+        if not pairs:
+            return []
+
+        owner = web3.to_checksum_address(owner)
+
+        def allowance_call(token: str, spender: str):
+            def build(w3: AsyncWeb3):
+                contract = w3.eth.contract(
+                    address=w3.to_checksum_address(token), abi=ALLOWANCE_ABI
+                )
+                return contract.functions.allowance(
+                    owner, w3.to_checksum_address(spender)
+                )
+
+            return build
+
+        allowances = await get_batch_executor().gather(
+            [allowance_call(token, spender) for token, spender in pairs]
+        )
+
+        for (token, spender), allowance in zip(pairs, allowances):
+            self._allowances[self._key(owner, token, spender)] = int(allowance)
+        self.save()
+        return allowances
+
+    async def has_allowance(
+        self, web3: AsyncWeb3, owner: str, token: str, spender: str, amount: int
+    ) -> bool:
+        current = self.get(owner, token, spender)
+        if current is None:
+            current = (await self.refresh(web3, owner, [(token, spender)]))[0]
+        return current >= amount
+
+    @staticmethod
+    def approve_amount(amount: int) -> int:
+        """Amount to approve for a spend of amount under the configured policy."""
+        if get_config().SETTINGS.APPROVE_UNLIMITED:
+            return MAX_UINT256
+        return amount
+
+
+# Singleton pattern
+def get_allowance_index() -> AllowanceIndex:
+    """Get allowance index singleton"""
+    if not hasattr(get_allowance_index, "_index"):
+        get_allowance_index._index = AllowanceIndex()
+    return get_allowance_index._index
@@ -0,0 +1,106 @@
+import asyncio
+from typing import Any, Callable, List, Optional, Tuple
+
+from loguru import logger
+from web3 import AsyncWeb3
+
+from src.utils.constants import RPC_URL
+from src.utils.provider import BATCH_CLIENTS, batch_web3, create_web3
+
+
+MAX_BATCH_SIZE = 100  # requests per JSON-RPC batch, the Monad RPC limit
+# Reads arriving within this window from any account go into one batch
+BATCH_WINDOW = 0.05  # seconds
+MAX_BATCHES_IN_FLIGHT = BATCH_CLIENTS  # each batch holds a batch-only client
+
+
+class BatchExecutor:
+    """
+    Collects read requests of all accounts into JSON-RPC batches.
+
+    submit() takes a function building one batchable request (a web3 call
+    or a contract function) and returns its result. Requests submitted by
+    any account within BATCH_WINDOW, or until MAX_BATCH_SIZE of them are
+    waiting, go out as one batch; every caller gets back its own result.
+    If a batch fails as a whole its requests are retried one by one, so
+    one bad read doesn't fail the other accounts.
+
+    Batches go out on batch-only clients (provider.batch_web3), web3 is
+    used only for the one-by-one retries, which are ordinary calls.
+    """
+
+    def __init__(self, web3: AsyncWeb3, max_batch_size: int = MAX_BATCH_SIZE):
+        self.web3 = web3
+        self.max_batch_size = max_batch_size
+        self._pending: List[Tuple[Callable[[AsyncWeb3], Any], asyncio.Future]] = []
+        self._flusher: Optional[asyncio.Task] = None
+        self._slots = asyncio.Semaphore(MAX_BATCHES_IN_FLIGHT)
+        self.batches = 0
+        self.requests = 0
+
+    async def submit(self, build: Callable[[AsyncWeb3], Any]) -> Any:
+        future = asyncio.get_running_loop().create_future()
+        self._pending.append((build, future))
+
+        if len(self._pending) >= self.max_batch_size:
+            self._send(self._take())
+        elif self._flusher is None or self._flusher.done():
+            self._flusher = asyncio.create_task(self._flush_later())
+
+        return await future
+
+    async def gather(self, builds: List[Callable[[AsyncWeb3], Any]]) -> List[Any]:
+        """Results of many reads, in order"""
+        return await asyncio.gather(*(self.submit(build) for build in builds))
+
+    def _take(self) -> list:
+        chunk = self._pending[: self.max_batch_size]
+        self._pending = self._pending[self.max_batch_size :]
+        return chunk
+
+    async def _flush_later(self):
+        await asyncio.sleep(BATCH_WINDOW)
+        while self._pending:
+            self._send(self._take())
+
+    def _send(self, chunk: list):
+        asyncio.create_task(self._execute(chunk))
+
+    async def _execute(self, chunk: list):
+        async with self._slots:
+            self.batches += 1
+            self.requests += len(chunk)
+            try:
+                provider = self.web3.provider
+                async with batch_web3(provider.proxy, provider.endpoint_uri) as web3:
+                    async with web3.batch_requests() as batch:
+                        for build, _ in chunk:
+                            batch.add(build(web3))
+                        results = await batch.async_execute()
+            except Exception as e:
+                logger.debug(f"Batch of {len(chunk)} reads failed, retrying one by one: {e}")
+                await asyncio.gather(*(self._execute_one(build, future) for build, future in chunk))
+                return
+
+        for (_, future), result in zip(chunk, results):
+            if not future.done():
+                future.set_result(result)
+
+    async def _execute_one(self, build: Callable[[AsyncWeb3], Any], future: asyncio.Future):
+        try:
+            request = build(self.web3)
+            # Contract functions are sent with call(), web3 methods are awaitable already
+            result = await (request.call() if hasattr(request, "call") else request)
+            if not future.done():
+                future.set_result(result)
+        except Exception as e:
+            if not future.done():
+                future.set_exception(e)
+
+
+# Singleton pattern
+def get_batch_executor() -> BatchExecutor:
+    """Get cross-account batch executor singleton"""
+    if not hasattr(get_batch_executor, "_executor"):
+        get_batch_executor._executor = BatchExecutor(create_web3(rpc_url=RPC_URL))
+    return get_batch_executor._executor
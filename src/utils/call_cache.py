@@ -0,0 +1,182 @@
+import asyncio
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+
+from eth_utils import keccak
+
+
+# The chain head is asked once per this interval, not once per cached call
+HEAD_TTL = 1  # seconds
+MAX_ENTRIES = 10000
+
+BLOCK_TAGS = ("latest", "pending", "safe", "finalized", "earliest")
+
+
+@dataclass
+class CallRule:
+    """
+    How long the result of a registered eth_call stays valid.
+
+    ttl: seconds, blocks: number of blocks. With neither, the result
+    never changes (decimals, immutable settings).
+    """
+
+    ttl: Optional[float] = None
+    blocks: Optional[int] = None
+
+
+class CallCache:
+    """
+    Process-wide memo of account-independent eth_call results.
+
+    Only calls registered with register() are cached; they are keyed by
+    (rpc url, to, calldata, block tag), so every account reading the same
+    global contract state shares one request. Calls pinned to a block
+    number are cached for good. Identical calls in flight wait for the
+    first one instead of going out again. The least recently used entry
+    is dropped when the cache is full.
+    """
+
+    def __init__(self):
+        self._rules: Dict[Tuple[str, str], CallRule] = {}
+        self._entries: "OrderedDict[tuple, Tuple[float, Optional[int], Any]]" = OrderedDict()
+        self._heads: Dict[str, Tuple[float, int]] = {}
+        self._inflight: Dict[tuple, asyncio.Future] = {}
+        self.hits = 0
+
+    def register(
+        self,
+        to: str,
+        signature: str,
+        ttl: Optional[float] = None,
+        blocks: Optional[int] = None,
+    ):
+        """
+        Mark a view function as the same for every account.
+
+        Args:
+            to: Contract address
+            signature: Function signature, e.g. "minimumDeposit()"
+        """
+        selector = "0x" + keccak(text=signature).hex()[:8]
+        self._rules[(to.lower(), selector)] = CallRule(ttl=ttl, blocks=blocks)
+
+    def rule_for(self, params: Any) -> Optional[CallRule]:
+        transaction = params[0] if params else None
+        if not isinstance(transaction, dict) or not transaction.get("to"):
+            return None
+        data = transaction.get("data") or transaction.get("input") or ""
+        return self._rules.get((str(transaction["to"]).lower(), str(data)[:10].lower()))
+
+    async def call(
+        self,
+        endpoint: str,
+        params: Any,
+        rule: CallRule,
+        fetch: Callable[[], Awaitable[Dict]],
+        fetch_head: Callable[[], Awaitable[int]],
+        request_id: Any = None,
+    ) -> Dict:
+        """
+        Serve a registered eth_call from the cache, fetch() it otherwise.
+
+        The response carries request_id, not the id of the request that
+        filled the cache.
+        """
+        transaction = params[0]
+        tag = params[1] if len(params) > 1 else "latest"
+        if isinstance(tag, int):
+            tag = hex(tag)
+        pinned = tag not in BLOCK_TAGS
+
+        key = (
+            endpoint,
+            str(transaction["to"]).lower(),
+            str(transaction.get("data") or transaction.get("input")).lower(),
+            tag,
+        )
+
+        head = None
+        if rule.blocks and not pinned:
+            head = await self._shared(("head", endpoint), lambda: self._head(endpoint, fetch_head))
+
+        entry = self._entries.get(key)
+        if entry is not None and (pinned or self._fresh(entry, rule, head)):
+            self._entries.move_to_end(key)
+            self.hits += 1
+            response = entry[2]
+        else:
+            if key in self._inflight:
+                self.hits += 1
+            response = await self._shared(key, lambda: self._fetch(key, head, fetch))
+
+        # Callers get their own copy of the shared response
+        response = dict(response)
+        if request_id is not None:
+            response["id"] = request_id
+        return response
+
+    def _fresh(self, entry: tuple, rule: CallRule, head: Optional[int]) -> bool:
+        stored_at, block, _ = entry
+        if rule.ttl is not None and time.monotonic() - stored_at >= rule.ttl:
+            return False
+        if rule.blocks is not None and (head is None or block is None or head - block >= rule.blocks):
+            return False
+        return True
+
+    async def _fetch(self, key: tuple, head: Optional[int], fetch) -> Dict:
+        response = await fetch()
+        if "error" not in response:
+            self._entries[key] = (time.monotonic(), head, response)
+            self._entries.move_to_end(key)
+            while len(self._entries) > MAX_ENTRIES:
+                self._entries.popitem(last=False)
+        return response
+
+    async def _head(self, endpoint: str, fetch_head) -> int:
+        cached = self._heads.get(endpoint)
+        if cached and time.monotonic() - cached[0] < HEAD_TTL:
+            return cached[1]
+        head = await fetch_head()
+        self._heads[endpoint] = (time.monotonic(), head)
+        return head
+
+    async def _shared(self, key: tuple, fetch: Callable[[], Awaitable[Any]]) -> Any:
+        """Run fetch once for all concurrent callers with the same key."""
+        inflight = self._inflight.get(key)
+        if inflight is not None:
+            return await asyncio.shield(inflight)
+
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        try:
+            result = await fetch()
+            future.set_result(result)
+            return result
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as e:
+            future.set_exception(e)
+            # Nobody may be waiting, don't let asyncio warn about it
+            future.exception()
+            raise
+        finally:
+            del self._inflight[key]
+
+
+# Singleton pattern
+def get_call_cache() -> CallCache:
+    """Get eth_call cache singleton"""
+    if not hasattr(get_call_cache, "_cache"):
+        get_call_cache._cache = CallCache()
+    return get_call_cache._cache
+
+
+def register_global_call(
+    to: str, signature: str, ttl: Optional[float] = None, blocks: Optional[int] = None
+):
+    """Shortcut for get_call_cache().register()"""
+    get_call_cache().register(to, signature, ttl=ttl, blocks=blocks)
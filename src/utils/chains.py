@@ -0,0 +1,116 @@
+import asyncio
+import time
+from typing import Dict, List, Optional, Tuple
+
+from loguru import logger
+from web3 import AsyncWeb3
+
+from src.utils.provider import batch_web3, create_web3
+
+
+# Balances and fees are reused for about one routing decision
+CHAIN_CACHE_TTL = 10  # seconds
+MAX_BATCH_SIZE = 100  # balance reads per JSON-RPC batch
+
+_balance_cache: Dict[Tuple[str, str], Tuple[float, int]] = {}
+_fee_cache: Dict[str, Tuple[float, Tuple[int, int]]] = {}
+
+
+def get_chain_web3(rpc_url: str, proxy: Optional[str] = None) -> AsyncWeb3:
+    """Pooled client of a source chain (Arbitrum, Base, Optimism, Sepolia...)."""
+    return create_web3(proxy, rpc_url)
+
+
+def invalidate_balance(rpc_url: str, address: str):
+    _balance_cache.pop((rpc_url, address.lower()), None)
+
+
+async def get_native_balance(
+    rpc_url: str, address: str, proxy: Optional[str] = None
+) -> int:
+    """Native balance in wei, cached per (chain, address) for CHAIN_CACHE_TTL."""
+    key = (rpc_url, address.lower())
+    cached = _balance_cache.get(key)
+    if cached and time.monotonic() - cached[0] < CHAIN_CACHE_TTL:
+        return cached[1]
+
+    web3 = get_chain_web3(rpc_url, proxy)
+    balance = await web3.eth.get_balance(web3.to_checksum_address(address))
+    _balance_cache[key] = (time.monotonic(), balance)
+    return balance
+
+
+async def get_native_balances(
+    rpcs: Dict[str, str], address: str, proxy: Optional[str] = None
+) -> Dict[str, Optional[int]]:
+    """
+    Native balances on several chains, read concurrently.
+
+    Args:
+        rpcs: Network name -> RPC url
+        address: Wallet address
+
+    Returns:
+        Network name -> balance in wei, None for chains that failed
+    """
+    networks = list(rpcs)
+    results = await asyncio.gather(
+        *(get_native_balance(rpcs[network], address, proxy) for network in networks),
+        return_exceptions=True,
+    )
+
+    balances = {}
+    for network, result in zip(networks, results):
+        if isinstance(result, Exception):
+            logger.error(f"Failed to get balance of {address} on {network}: {result}")
+            balances[network] = None
+        else:
+            balances[network] = result
+    return balances
+
+
+async def get_native_balances_bulk(
+    rpc_url: str, addresses: List[str], proxy: Optional[str] = None
+) -> Dict[str, Optional[int]]:
+    """
+    Native balances of many wallets on one chain, read in JSON-RPC batches.
+
+    Returns:
+        Address -> balance in wei, None for wallets whose batch failed
+    """
+    balances: Dict[str, Optional[int]] = {}
+
+    for start in range(0, len(addresses), MAX_BATCH_SIZE):
+        chunk = addresses[start : start + MAX_BATCH_SIZE]
+        try:
+            async with batch_web3(proxy, rpc_url) as web3:
+                async with web3.batch_requests() as batch:
+                    for address in chunk:
+                        batch.add(web3.eth.get_balance(web3.to_checksum_address(address)))
+                    results = await batch.async_execute()
+        except Exception as e:
+            logger.error(f"Failed to read {len(chunk)} balances from {rpc_url}: {e}")
+            balances.update({address: None for address in chunk})
+            continue
+
+        now = time.monotonic()
+        for address, balance in zip(chunk, results):
+            balances[address] = int(balance)
+            _balance_cache[(rpc_url, address.lower())] = (now, int(balance))
+
+    return balances
+
+
+async def get_fee_data(web3: AsyncWeb3) -> Tuple[int, int]:
+    """(base fee, max priority fee) of the chain, cached for CHAIN_CACHE_TTL."""
+    key = web3.provider.endpoint_uri
+    cached = _fee_cache.get(key)
+    if cached and time.monotonic() - cached[0] < CHAIN_CACHE_TTL:
+        return cached[1]
+
+    latest_block, max_priority_fee = await asyncio.gather(
+        web3.eth.get_block("latest"), web3.eth.max_priority_fee
+    )
+    fee_data = (latest_block["baseFeePerGas"], max_priority_fee)
+    _fee_cache[key] = (time.monotonic(), fee_data)
+    return fee_data
@@ -0,0 +1,113 @@
+import time
+from contextvars import ContextVar
+from typing import Dict, Optional, Set
+
+from loguru import logger
+
+
+FAILURE_THRESHOLD = 5  # failures in a row that open the circuit
+RESET_TIMEOUT = 60  # seconds the circuit stays open before a probe is let through
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+# Upstreams whose open circuit stopped the task running in this context
+_tripped: ContextVar[Optional[Set[str]]] = ContextVar("tripped_circuits", default=None)
+
+
+class CircuitOpenError(Exception):
+    """The upstream is known to be down, the call was not made."""
+
+    def __init__(self, name: str, retry_at: float):
+        super().__init__(f"{name} is unavailable, circuit is open")
+        self.name = name
+        self.retry_at = retry_at
+
+
+class CircuitBreaker:
+    """
+    Fail-fast guard for one upstream API, shared by all accounts.
+
+    Closed: calls go through, failure_threshold failures in a row open
+    the circuit. Open: calls raise CircuitOpenError right away until
+    reset_timeout has passed. Half-open: one probe call goes through, its
+    success closes the circuit, its failure opens it again.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        failure_threshold: int = FAILURE_THRESHOLD,
+        reset_timeout: float = RESET_TIMEOUT,
+    ):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = CLOSED
+        self.failures = 0
+        self.opened_at = 0.0
+        self._probing = False
+        self._probe_started = 0.0
+
+    @property
+    def retry_at(self) -> float:
+        return self.opened_at + self.reset_timeout
+
+    def check(self):
+        """Raise CircuitOpenError if the call should not be made now."""
+        if self.state == CLOSED:
+            return
+        if self.state == OPEN and time.monotonic() >= self.retry_at:
+            self.state = HALF_OPEN
+            self._probing = False
+        # A probe that never reported back doesn't block the circuit forever
+        probe_lost = time.monotonic() - self._probe_started > self.reset_timeout
+        if self.state == HALF_OPEN and (not self._probing or probe_lost):
+            self._probing = True
+            self._probe_started = time.monotonic()
+            return
+
+        tripped = _tripped.get()
+        if tripped is not None:
+            tripped.add(self.name)
+        raise CircuitOpenError(self.name, self.retry_at)
+
+    def record_success(self):
+        if self.state != CLOSED:
+            logger.success(f"{self.name} is back, circuit closed")
+        self.state = CLOSED
+        self.failures = 0
+        self._probing = False
+
+    def record_failure(self):
+        self.failures += 1
+        if self.state == HALF_OPEN or (
+            self.state == CLOSED and self.failures >= self.failure_threshold
+        ):
+            self.state = OPEN
+            self.opened_at = time.monotonic()
+            self._probing = False
+            logger.warning(
+                f"{self.name} failed {self.failures} times, pausing calls for {self.reset_timeout}s"
+            )
+
+
+def get_breaker(name: str) -> CircuitBreaker:
+    """Get the circuit breaker of an upstream, created on first use"""
+    if not hasattr(get_breaker, "_breakers"):
+        get_breaker._breakers: Dict[str, CircuitBreaker] = {}
+    if name not in get_breaker._breakers:
+        get_breaker._breakers[name] = CircuitBreaker(name)
+    return get_breaker._breakers[name]
+
+
+def track_tripped(tripped: Set[str]):
+    """Collect the upstreams whose open circuit stops calls made in this context"""
+    _tripped.set(tripped)
+
+
+def retry_time(names: Set[str]) -> float:
+    """monotonic() time at which all of the upstreams may be tried again"""
+    return max(get_breaker(name).retry_at for name in names)
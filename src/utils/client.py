@@ -1,11 +1,60 @@
+import asyncio
+import inspect
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+import aiohttp
 import primp
+from curl_cffi import requests as curl_requests
+from loguru import logger
 
+from src.utils.proxy_pool import get_proxy_pool
 
-async def create_client(proxy: str) -> primp.AsyncClient:
-    session = primp.AsyncClient(impersonate="chrome_131", verify=False)
+
+DEFAULT_PROFILE = "chrome_131"
+MAX_SHARED_CLIENTS = 64  # (proxy, profile) pairs kept open at once
+CURL_POOL_SIZE = 10  # connections per curl_cffi session
+AIOHTTP_POOL_SIZE = 100  # connections of the shared aiohttp session
+# Evicted clients may still be serving a request, they are closed after the request timeout
+EVICT_GRACE = 60  # seconds
+
+
+class TrackedClient(primp.AsyncClient):
+    """primp client that reports the outcome of its requests to the proxy pool"""
+
+    pool_proxy: Optional[str] = None
+
+    async def request(self, method, url, *args, **kwargs):
+        started = time.monotonic()
+        try:
+            response = await super().request(method, url, *args, **kwargs)
+        except Exception as e:
+            get_proxy_pool().report_error(self.pool_proxy, e, url)
+            raise
+        get_proxy_pool().report_success(self.pool_proxy, time.monotonic() - started, url)
+        return response
+
+
+class CookielessSession(curl_requests.AsyncSession):
+    """curl_cffi session shared by accounts, cookies of one request never reach the next"""
+
+    async def request(self, *args, **kwargs):
+        self.cookies.clear()
+        try:
+            return await super().request(*args, **kwargs)
+        finally:
+            self.cookies.clear()
+
+
+def _new_client(proxy: str, profile: str, cookie_store: bool = True) -> primp.AsyncClient:
+    session = TrackedClient(
+        impersonate=profile, verify=False, cookie_store=cookie_store
+    )
 
     if proxy:
         session.proxy = proxy
+        session.pool_proxy = proxy
 
     session.timeout = 30
 
@@ -14,6 +63,124 @@ async def create_client(proxy: str) -> primp.AsyncClient:
     return session
 
 
+async def _close(client: Any):
+    """Close any of the supported clients, whatever its close method looks like."""
+    close = getattr(client, "close", None) or getattr(client, "aclose", None)
+    if close is None:
+        return
+    try:
+        result = close()
+        if inspect.isawaitable(result):
+            await result
+    except Exception as e:
+        logger.warning(f"Failed to close HTTP client: {e}")
+
+
+async def _close_later(client: Any, delay: float):
+    await asyncio.sleep(delay)
+    await _close(client)
+
+
+class ClientManager:
+    """
+    Owner of every HTTP client of the process.
+
+    Stateless API calls (quotes, mint data, public lists) share one
+    cookie-less client per (proxy, impersonation profile), so repeated
+    calls reuse open connections instead of doing new TLS and proxy
+    handshakes. At most MAX_SHARED_CLIENTS are kept, the least recently
+    used one is closed first. Account sessions keep their cookies and
+    belong to one account; they are closed by release() or at shutdown.
+    """
+
+    def __init__(self, max_shared: int = MAX_SHARED_CLIENTS):
+        self.max_shared = max_shared
+        self._shared: "OrderedDict[Tuple[str, str, str], Any]" = OrderedDict()
+        self._accounts: Dict[int, Any] = {}
+        self._aiohttp: Optional[aiohttp.ClientSession] = None
+
+    def _get_shared(self, kind: str, proxy: str, profile: str, factory):
+        key = (kind, proxy or "", profile)
+        client = self._shared.get(key)
+        if client is None:
+            client = factory()
+            self._shared[key] = client
+            while len(self._shared) > self.max_shared:
+                _, evicted = self._shared.popitem(last=False)
+                asyncio.ensure_future(_close_later(evicted, EVICT_GRACE))
+        self._shared.move_to_end(key)
+        return client
+
+    def get(self, proxy: str, profile: str = DEFAULT_PROFILE) -> primp.AsyncClient:
+        """Shared primp client without cookies."""
+        return self._get_shared(
+            "primp", proxy, profile, lambda: _new_client(proxy, profile, cookie_store=False)
+        )
+
+    def get_curl(self, proxy: str, profile: str = "chrome131") -> curl_requests.AsyncSession:
+        """Shared curl_cffi session without cookies, headers go with each request."""
+        proxies = {"http": f"http://{proxy}", "https": f"http://{proxy}"} if proxy else None
+        return self._get_shared(
+            "curl",
+            proxy,
+            profile,
+            lambda: CookielessSession(
+                impersonate=profile,
+                proxies=proxies,
+                verify=False,
+                timeout=30,
+                max_clients=CURL_POOL_SIZE,
+            ),
+        )
+
+    def get_aiohttp(self) -> aiohttp.ClientSession:
+        """One aiohttp session for everybody, the proxy is passed per request."""
+        if self._aiohttp is None or self._aiohttp.closed:
+            self._aiohttp = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit=AIOHTTP_POOL_SIZE, ssl=False),
+                cookie_jar=aiohttp.DummyCookieJar(),
+            )
+        return self._aiohttp
+
+    def account_client(self, proxy: str, profile: str = DEFAULT_PROFILE) -> primp.AsyncClient:
+        """Client with its own cookies for one account."""
+        client = _new_client(proxy, profile)
+        self._accounts[id(client)] = client
+        return client
+
+    async def release(self, client: Any):
+        if self._accounts.pop(id(client), None) is not None:
+            await _close(client)
+
+    async def close_all(self):
+        clients = list(self._shared.values()) + list(self._accounts.values())
+        self._shared.clear()
+        self._accounts.clear()
+        if self._aiohttp is not None:
+            clients.append(self._aiohttp)
+            self._aiohttp = None
+        await asyncio.gather(*(_close(client) for client in clients))
+
+
+# Singleton pattern
+def get_client_manager() -> ClientManager:
+    """Get HTTP client manager singleton"""
+    if not hasattr(get_client_manager, "_manager"):
+        get_client_manager._manager = ClientManager()
+    return get_client_manager._manager
+
+
+async def close_clients():
+    """Close every HTTP client the manager handed out."""
+    if hasattr(get_client_manager, "_manager"):
+        await get_client_manager._manager.close_all()
+
+
+async def create_client(proxy: str) -> primp.AsyncClient:
+    """Session of one account, closed with release() or at shutdown."""
+    return get_client_manager().account_client(proxy)
+
+
 HEADERS = {
     "accept": "*/*",
     "accept-language": "en-GB,en-US;q=0.9,en;q=0.8,ru;q=0.7,zh-TW;q=0.6,zh;q=0.5",
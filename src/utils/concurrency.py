@@ -0,0 +1,199 @@
+import asyncio
+import time
+from collections import deque
+from dataclasses import dataclass
+from typing import List, Optional
+
+from loguru import logger
+
+
+METRICS_WINDOW = 30  # seconds of RPC requests the controller looks at
+ADJUST_INTERVAL = 15  # seconds between adjustments
+MIN_SAMPLES = 20  # fewer requests in the window say nothing, the limit stays
+
+ERROR_RATE_LIMIT = 0.05  # more errors than this means overload
+LATENCY_FACTOR = 2.0  # p95 this many times above the baseline means overload
+# The baseline is the best p95 of this many last adjustments, so it follows
+# an RPC that got slower for good instead of cutting limits forever
+BASELINE_WINDOWS = 20
+DECREASE_FACTOR = 0.7
+INCREASE_STEP = 1
+
+RATE_LIMIT_MARKERS = ("rate limit", "too many requests", "limit exceeded", "429")
+
+
+class AdjustableSemaphore:
+    """
+    Semaphore whose limit can change while it is in use.
+
+    Has the asyncio.Semaphore methods the scheduler uses (acquire,
+    release, locked, async with). Lowering the limit doesn't interrupt
+    holders, new acquires just wait until enough of them are gone.
+    Waiters are woken in FIFO order as slots free up.
+    """
+
+    def __init__(self, limit: int):
+        self.limit = limit
+        self.in_use = 0
+        self._waiters: deque = deque()
+
+    def locked(self) -> bool:
+        return self.in_use >= self.limit
+
+    async def acquire(self) -> bool:
+        if not self._waiters and self.in_use < self.limit:
+            self.in_use += 1
+            return True
+
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        try:
+            await waiter
+        except asyncio.CancelledError:
+            if waiter.done() and not waiter.cancelled():
+                # The slot was handed over already, give it back
+                self.release()
+            raise
+        finally:
+            if waiter in self._waiters:
+                self._waiters.remove(waiter)
+        return True
+
+    def release(self):
+        self.in_use -= 1
+        self._wake()
+
+    def set_limit(self, limit: int):
+        self.limit = limit
+        self._wake()
+
+    def _wake(self):
+        while self.in_use < self.limit and self._waiters:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                # The slot goes straight to the waiter, nobody can take it meanwhile
+                self.in_use += 1
+                waiter.set_result(None)
+
+    async def __aenter__(self):
+        await self.acquire()
+
+    async def __aexit__(self, *args):
+        self.release()
+
+
+def is_rate_limited(response) -> bool:
+    """JSON-RPC error answer that means the node is throttling us"""
+    if not isinstance(response, dict) or "error" not in response:
+        return False
+    message = str(response["error"]).lower()
+    return any(marker in message for marker in RATE_LIMIT_MARKERS)
+
+
+class RpcMetrics:
+    """Latency and outcome of the RPC requests of the last METRICS_WINDOW seconds."""
+
+    def __init__(self):
+        # (time, latency, failed)
+        self._samples: deque = deque()
+
+    def record(self, latency: float, failed: bool):
+        now = time.monotonic()
+        self._samples.append((now, latency, failed))
+        while self._samples and now - self._samples[0][0] > METRICS_WINDOW:
+            self._samples.popleft()
+
+    def snapshot(self) -> Optional[tuple]:
+        """(p50, p95, error rate) of the window, None if there is too little traffic"""
+        now = time.monotonic()
+        samples = [sample for sample in self._samples if now - sample[0] <= METRICS_WINDOW]
+        if len(samples) < MIN_SAMPLES:
+            return None
+        latencies = sorted(latency for _, latency, _ in samples)
+        errors = sum(1 for _, _, failed in samples if failed)
+        return (
+            latencies[len(latencies) // 2],
+            latencies[min(int(len(latencies) * 0.95), len(latencies) - 1)],
+            errors / len(samples),
+        )
+
+
+# Singleton pattern
+def get_rpc_metrics() -> RpcMetrics:
+    """Get RPC metrics singleton"""
+    if not hasattr(get_rpc_metrics, "_metrics"):
+        get_rpc_metrics._metrics = RpcMetrics()
+    return get_rpc_metrics._metrics
+
+
+@dataclass
+class ControlledLimit:
+    name: str
+    semaphore: AdjustableSemaphore
+    minimum: int
+    maximum: int
+
+
+class ConcurrencyController:
+    """
+    AIMD control of the scheduler's concurrency limits.
+
+    Every ADJUST_INTERVAL seconds it looks at the RPC requests of the
+    shared provider: when the error rate is above ERROR_RATE_LIMIT or the
+    p95 latency is LATENCY_FACTOR times above the best p95 of the last
+    BASELINE_WINDOWS adjustments, every
+    limit is cut by DECREASE_FACTOR; when the RPC is healthy and a limit
+    is fully used, it grows by INCREASE_STEP. Limits stay within their
+    min/max bounds.
+    """
+
+    def __init__(self, limits: List[ControlledLimit]):
+        self.limits = limits
+        self._p95_history: deque = deque(maxlen=BASELINE_WINDOWS)
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def baseline_p95(self) -> Optional[float]:
+        return min(self._p95_history) if self._p95_history else None
+
+    def start(self):
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+
+    async def _run(self):
+        while True:
+            await asyncio.sleep(ADJUST_INTERVAL)
+            try:
+                self.adjust()
+            except Exception as e:
+                logger.warning(f"Concurrency controller failed to adjust: {e}")
+
+    def adjust(self):
+        snapshot = get_rpc_metrics().snapshot()
+        if snapshot is None:
+            return
+        p50, p95, error_rate = snapshot
+        self._p95_history.append(p95)
+
+        overloaded = error_rate > ERROR_RATE_LIMIT or p95 > self.baseline_p95 * LATENCY_FACTOR
+        for limit in self.limits:
+            current = limit.semaphore.limit
+            if overloaded:
+                new = max(limit.minimum, int(current * DECREASE_FACTOR))
+            elif limit.semaphore.locked():
+                new = min(limit.maximum, current + INCREASE_STEP)
+            else:
+                continue
+            if new == current:
+                continue
+
+            limit.semaphore.set_limit(new)
+            logger.info(
+                f"Concurrency of {limit.name}: {current} -> {new} "
+                f"(rpc p50 {p50 * 1000:.0f}ms, p95 {p95 * 1000:.0f}ms, errors {error_rate:.0%})"
+            )
@@ -19,9 +19,49 @@ class SettingsConfig:
     RANDOM_PAUSE_BETWEEN_ACTIONS: Tuple[int, int]
     BROWSER_PAUSE_MULTIPLIER: float
     RANDOM_INITIALIZATION_PAUSE: Tuple[int, int]
+    APPROVE_UNLIMITED: bool
     TELEGRAM_USERS_IDS: List[int]
     TELEGRAM_BOT_TOKEN: str
 
+
+@dataclass
+class ScheduleConfig:
+    TARGET_HOURS: float
+
+
+@dataclass
+class ControlConfig:
+    PORT: int
+    TOKEN: str
+
+
+@dataclass
+class ConcurrencyConfig:
+    BROWSER: int
+    CEX: int
+    CAPTCHA: int
+    RPC: int
+    ADAPTIVE: bool
+    MIN_THREADS: int
+    MAX_THREADS: int
+
+
+@dataclass
+class RetryConfig:
+    ACCOUNT_MAX_RETRIES: int
+    ACCOUNT_MAX_TIME: int
+    TASK_MAX_RETRIES: int
+    TASK_MAX_TIME: int
+
+
+@dataclass
+class ProxiesConfig:
+    CHECK_BEFORE_START: bool
+    CHECK_URL: str
+    CHECK_TIMEOUT: int
+    MAX_ERRORS: int
+
+
 @dataclass
 class FaucetConfig:
     USE_SOLVIUM_FOR_CLOUDFLARE: bool
@@ -156,6 +196,8 @@ class MadnessConfig:
 @dataclass
 class DisperseConfig:
     MIN_BALANCE_FOR_DISPERSE: Tuple[float, float]
+    MAX_IN_FLIGHT: int
+    MULTISEND_CONTRACT: str
 
 
 @dataclass
@@ -232,6 +274,11 @@ class ZkcodexConfig:
 @dataclass
 class Config:
     SETTINGS: SettingsConfig
+    PROXIES: ProxiesConfig
+    RETRY: RetryConfig
+    CONCURRENCY: ConcurrencyConfig
+    SCHEDULE: ScheduleConfig
+    CONTROL: ControlConfig
     EXCHANGES: ExchangesConfig
     FAUCET: FaucetConfig
     FLOW: FlowConfig
@@ -326,9 +373,38 @@ class Config:
                     data["SETTINGS"]["RANDOM_INITIALIZATION_PAUSE"]
                 ),
                 BROWSER_PAUSE_MULTIPLIER=data["SETTINGS"]["BROWSER_PAUSE_MULTIPLIER"],
+                APPROVE_UNLIMITED=data["SETTINGS"]["APPROVE_UNLIMITED"],
                 TELEGRAM_USERS_IDS=data["SETTINGS"]["TELEGRAM_USERS_IDS"],
                 TELEGRAM_BOT_TOKEN=data["SETTINGS"]["TELEGRAM_BOT_TOKEN"],
             ),
+            SCHEDULE=ScheduleConfig(
+                TARGET_HOURS=data["SCHEDULE"]["TARGET_HOURS"],
+            ),
+            CONTROL=ControlConfig(
+                PORT=data["CONTROL"]["PORT"],
+                TOKEN=data["CONTROL"]["TOKEN"],
+            ),
+            CONCURRENCY=ConcurrencyConfig(
+                BROWSER=data["CONCURRENCY"]["BROWSER"],
+                CEX=data["CONCURRENCY"]["CEX"],
+                CAPTCHA=data["CONCURRENCY"]["CAPTCHA"],
+                RPC=data["CONCURRENCY"]["RPC"],
+                ADAPTIVE=data["CONCURRENCY"]["ADAPTIVE"],
+                MIN_THREADS=data["CONCURRENCY"]["MIN_THREADS"],
+                MAX_THREADS=data["CONCURRENCY"]["MAX_THREADS"],
+            ),
+            RETRY=RetryConfig(
+                ACCOUNT_MAX_RETRIES=data["RETRY"]["ACCOUNT_MAX_RETRIES"],
+                ACCOUNT_MAX_TIME=data["RETRY"]["ACCOUNT_MAX_TIME"],
+                TASK_MAX_RETRIES=data["RETRY"]["TASK_MAX_RETRIES"],
+                TASK_MAX_TIME=data["RETRY"]["TASK_MAX_TIME"],
+            ),
+            PROXIES=ProxiesConfig(
+                CHECK_BEFORE_START=data["PROXIES"]["CHECK_BEFORE_START"],
+                CHECK_URL=data["PROXIES"]["CHECK_URL"],
+                CHECK_TIMEOUT=data["PROXIES"]["CHECK_TIMEOUT"],
+                MAX_ERRORS=data["PROXIES"]["MAX_ERRORS"],
+            ),
             EXCHANGES=ExchangesConfig(
                 name=data["EXCHANGES"]["name"],
                 apiKey=data["EXCHANGES"]["apiKey"],
@@ -452,6 +528,8 @@ class Config:
                 MIN_BALANCE_FOR_DISPERSE=tuple(
                     data["DISPERSE"]["MIN_BALANCE_FOR_DISPERSE"]
                 ),
+                MAX_IN_FLIGHT=data["DISPERSE"]["MAX_IN_FLIGHT"],
+                MULTISEND_CONTRACT=data["DISPERSE"]["MULTISEND_CONTRACT"],
             ),
             LILCHOGSTARS=LilchogstarsConfig(
                 MAX_AMOUNT_FOR_EACH_ACCOUNT=tuple(
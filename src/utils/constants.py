@@ -1,5 +1,6 @@
 EXPLORER_URL = "https://testnet.monadexplorer.com/tx/0x"
 RPC_URL = "https://testnet-rpc.monad.xyz"
+CHAIN_ID = 10143
 ETH_RPC_URL = "https://eth1.lava.build"
 
 TOKENS = {
@@ -0,0 +1,245 @@
+import asyncio
+import hmac
+import secrets
+import time
+from collections import Counter
+from typing import Dict, List, Optional
+
+from aiohttp import web
+from loguru import logger
+
+from src.utils.scheduler import parked
+
+
+class RunControl:
+    """
+    Live state of the run and the switches an operator can flip.
+
+    process.start asks admit() before an account takes its THREADS slot
+    and again once it holds it, Start asks skip_task() before every
+    task. The control server changes the state; nothing here touches
+    accounts that are already running except for the task skip list.
+    A drain is final: pause() and resume() refuse to undo it.
+    """
+
+    def __init__(self):
+        self.paused = False
+        self.draining = False
+        self.skipped_tasks: set = set()
+        self._resumed = asyncio.Event()
+        self._resumed.set()
+
+        self.total = 0
+        self.finished = 0
+        self.dropped = 0
+        # account index -> tasks it is running now (background ones included)
+        self.in_flight: Dict[int, List[str]] = {}
+        self.task_counts: Dict[str, Counter] = {}
+        self.started_at = time.monotonic()
+
+        # Limits the server may resize: name -> AdjustableSemaphore
+        self.limits: Dict[str, object] = {}
+        # Pacer of a paced run, it follows pause, resume and drain
+        self.pacer = None
+
+    def pause(self) -> bool:
+        if self.draining:
+            logger.warning("Control: the run is draining, pause refused")
+            return False
+        self.paused = True
+        self._resumed.clear()
+        if self.pacer:
+            self.pacer.pause()
+        logger.warning("Control: paused, no new accounts will start")
+        return True
+
+    def resume(self) -> bool:
+        if self.draining:
+            logger.warning("Control: the run is draining, resume refused")
+            return False
+        self.paused = False
+        self._resumed.set()
+        if self.pacer:
+            self.pacer.resume()
+        logger.success("Control: resumed")
+        return True
+
+    def drain(self):
+        self.draining = True
+        self.paused = False
+        # Waiting accounts must see the drain instead of waiting for a resume or their pacing turn
+        self._resumed.set()
+        if self.pacer:
+            self.pacer.drain()
+        logger.warning("Control: draining, running accounts finish, queued ones are dropped")
+
+    async def admit(self, account_index: int) -> bool:
+        """Wait while paused, with the THREADS slot given away. False if the account must not start."""
+        if not self._resumed.is_set():
+            async with parked():
+                await self._resumed.wait()
+        if self.draining:
+            self.dropped += 1
+            logger.info(f"[{account_index}] Run is draining, account not started")
+            return False
+        return True
+
+    def account_started(self, account_index: int):
+        self.in_flight[account_index] = []
+
+    def account_finished(self, account_index: int):
+        self.in_flight.pop(account_index, None)
+        self.finished += 1
+
+    def skip_task(self, account_index: int, task: str) -> bool:
+        """True if the operator switched the task off, otherwise the task is counted as running"""
+        task = task.lower()
+        counts = self.task_counts.setdefault(task, Counter())
+        if task in self.skipped_tasks:
+            counts["skipped"] += 1
+            return True
+        counts["started"] += 1
+        if account_index in self.in_flight:
+            self.in_flight[account_index].append(task)
+        return False
+
+    def task_finished(self, account_index: int, task: str):
+        task = task.lower()
+        self.task_counts.setdefault(task, Counter())["finished"] += 1
+        running = self.in_flight.get(account_index, [])
+        if task in running:
+            running.remove(task)
+
+    def resize(self, name: str, limit: int):
+        semaphore = self.limits[name]
+        old = semaphore.limit
+        semaphore.set_limit(limit)
+        logger.warning(f"Control: {name} limit {old} -> {limit}")
+
+    def status(self) -> dict:
+        return {
+            "paused": self.paused,
+            "draining": self.draining,
+            "uptime": round(time.monotonic() - self.started_at),
+            "accounts": {
+                "total": self.total,
+                "in_flight": len(self.in_flight),
+                "finished": self.finished,
+                "dropped": self.dropped,
+                "queued": max(self.total - len(self.in_flight) - self.finished - self.dropped, 0),
+            },
+            "in_flight": {str(index): list(tasks) for index, tasks in sorted(self.in_flight.items())},
+            "tasks": {task: dict(counts) for task, counts in sorted(self.task_counts.items())},
+            "skipped_tasks": sorted(self.skipped_tasks),
+            "limits": {
+                name: {"limit": semaphore.limit, "in_use": semaphore.in_use}
+                for name, semaphore in self.limits.items()
+            },
+        }
+
+
+# Singleton pattern
+def get_run_control() -> RunControl:
+    """Get run control singleton"""
+    if not hasattr(get_run_control, "_control"):
+        get_run_control._control = RunControl()
+    return get_run_control._control
+
+
+class ControlServer:
+    """
+    Localhost HTTP interface to RunControl.
+
+    GET  /status                 live state as JSON
+    POST /pause, /resume, /drain
+    POST /limits?accounts=20&browser=2
+    POST /skip?task=dusted, POST /unskip?task=dusted
+
+    POSTs must carry the token in X-Control-Token. A web page open in a
+    browser on this machine can send simple POSTs to localhost but can't
+    add custom headers to them without a CORS preflight, which is never
+    answered here.
+    """
+
+    def __init__(self, control: RunControl, port: int, token: str = ""):
+        self.control = control
+        self.port = port
+        self.token = token or secrets.token_urlsafe(16)
+        self._runner: Optional[web.AppRunner] = None
+
+    @web.middleware
+    async def _check_token(self, request: web.Request, handler):
+        if request.method != "GET":
+            token = request.headers.get("X-Control-Token", "")
+            if not hmac.compare_digest(token.encode(), self.token.encode()):
+                return web.json_response({"error": "missing or wrong X-Control-Token"}, status=403)
+        return await handler(request)
+
+    async def start(self):
+        app = web.Application(middlewares=[self._check_token])
+        app.router.add_get("/status", self._status)
+        app.router.add_post("/pause", self._pause)
+        app.router.add_post("/resume", self._resume)
+        app.router.add_post("/drain", self._drain)
+        app.router.add_post("/limits", self._limits)
+        app.router.add_post("/skip", self._skip)
+        app.router.add_post("/unskip", self._unskip)
+
+        self._runner = web.AppRunner(app, access_log=None)
+        await self._runner.setup()
+        # Only this machine can reach it
+        await web.TCPSite(self._runner, "127.0.0.1", self.port).start()
+        logger.info(f"Control server: http://127.0.0.1:{self.port}/status, X-Control-Token: {self.token}")
+
+    async def stop(self):
+        if self._runner is not None:
+            await self._runner.cleanup()
+            self._runner = None
+
+    async def _status(self, request: web.Request) -> web.Response:
+        return web.json_response(self.control.status())
+
+    async def _pause(self, request: web.Request) -> web.Response:
+        if not self.control.pause():
+            return web.json_response({"error": "the run is draining"}, status=409)
+        return web.json_response(self.control.status())
+
+    async def _resume(self, request: web.Request) -> web.Response:
+        if not self.control.resume():
+            return web.json_response({"error": "the run is draining"}, status=409)
+        return web.json_response(self.control.status())
+
+    async def _drain(self, request: web.Request) -> web.Response:
+        self.control.drain()
+        return web.json_response(self.control.status())
+
+    async def _limits(self, request: web.Request) -> web.Response:
+        # All or nothing: every value is checked before any limit changes
+        limits = {}
+        for name, value in request.query.items():
+            if name not in self.control.limits:
+                return web.json_response({"error": f"unknown limit {name}"}, status=400)
+            try:
+                limits[name] = int(value)
+            except ValueError:
+                return web.json_response({"error": f"limit of {name} must be a number"}, status=400)
+            if limits[name] < 1:
+                return web.json_response({"error": f"limit of {name} must be at least 1"}, status=400)
+
+        for name, limit in limits.items():
+            self.control.resize(name, limit)
+        return web.json_response(self.control.status())
+
+    async def _skip(self, request: web.Request) -> web.Response:
+        task = request.query.get("task", "").lower()
+        if not task:
+            return web.json_response({"error": "task is required"}, status=400)
+        self.control.skipped_tasks.add(task)
+        logger.warning(f"Control: skipping {task} from now on")
+        return web.json_response(self.control.status())
+
+    async def _unskip(self, request: web.Request) -> web.Response:
+        task = request.query.get("task", "").lower()
+        self.control.skipped_tasks.discard(task)
+        logger.info(f"Control: {task} is back on")
+        return web.json_response(self.control.status())
@@ -1,8 +1,8 @@
 from functools import wraps
-import asyncio
 from typing import TypeVar, Callable, Any, Optional
 from loguru import logger
 from src.utils.config import get_config
+from src.utils.retry import should_retry
 
 T = TypeVar("T")
 
@@ -30,13 +30,14 @@ def retry_async(
     """
     Async retry decorator with exponential backoff.
     If attempts is not provided, uses SETTINGS.ATTEMPTS from config.
+    Retries are charged to the account's and task's retry budgets,
+    fatal errors are not retried.
     """
     def decorator(func: Callable[..., T]) -> Callable[..., T]:
         @wraps(func)
         async def wrapper(*args, **kwargs):
             # Get attempts from config if not provided
             retry_attempts = attempts if attempts is not None else get_config().SETTINGS.ATTEMPTS
-            current_delay = delay
 
             for attempt in range(retry_attempts):
                 try:
@@ -45,10 +46,10 @@ def retry_async(
                     if attempt < retry_attempts - 1:  # Don't sleep on the last attempt
                         logger.warning(
                             f"Attempt {attempt + 1}/{retry_attempts} failed for {func.__name__}: {str(e)}. "
-                            f"Retrying in {current_delay:.1f} seconds..."
+                            f"Retrying..."
                         )
-                        await asyncio.sleep(current_delay)
-                        current_delay *= backoff
+                        if not await should_retry(e, attempt, pause=(delay, delay * backoff)):
+                            raise
                     else:
                         logger.error(
                             f"All {retry_attempts} attempts failed for {func.__name__}: {str(e)}"
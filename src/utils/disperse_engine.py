@@ -0,0 +1,238 @@
+import asyncio
+import time
+from dataclasses import dataclass, field
+from typing import Awaitable, Callable, Dict, List, Optional
+
+from eth_account import Account
+from loguru import logger
+from web3 import AsyncWeb3
+
+from src.utils.provider import batch_web3
+from src.utils.tx_builder import get_gas_params
+
+
+# Gas of a plain value transfer to a wallet (EOA)
+NATIVE_TRANSFER_GAS = 21000
+
+DEFAULT_MAX_IN_FLIGHT = 16  # pending transactions of one funder at a time
+MULTISEND_BATCH_SIZE = 100  # recipients per disperseEther call
+MAX_BATCH_SIZE = 100  # receipt reads per JSON-RPC batch
+CONFIRM_POLL_INTERVAL = 2  # seconds
+CONFIRM_TIMEOUT = 300  # seconds without any transaction being mined
+
+# disperse.app compatible multi-send contract
+DISPERSE_ABI = [
+    {
+        "inputs": [
+            {"internalType": "address[]", "name": "recipients", "type": "address[]"},
+            {"internalType": "uint256[]", "name": "values", "type": "uint256[]"},
+        ],
+        "name": "disperseEther",
+        "outputs": [],
+        "stateMutability": "payable",
+        "type": "function",
+    }
+]
+
+
+@dataclass
+class Transfer:
+    to: str
+    value: int  # wei
+    data: str = "0x"
+    gas: Optional[int] = None  # estimated when not given
+    nonce: Optional[int] = None
+    tx_hash: Optional[str] = None
+    success: Optional[bool] = None
+    # Transfers packed into this multi-send call
+    parts: List["Transfer"] = field(default_factory=list)
+
+
+class DisperseEngine:
+    """
+    Sends many transfers from one funder without waiting for each receipt.
+
+    Up to max_in_flight transactions are pending at once, signed locally with
+    consecutive nonces. Confirmation is done in bulk: one nonce read shows
+    how many of them are mined, and receipts of the mined ones are read in a
+    single batch, on a client of its own so that sends going on meanwhile
+    are not caught in it. With multisend_address, plain value transfers are packed
+    into disperseEther calls of MULTISEND_BATCH_SIZE recipients each.
+    """
+
+    def __init__(
+        self,
+        private_key: str,
+        web3: AsyncWeb3,
+        max_in_flight: int = DEFAULT_MAX_IN_FLIGHT,
+        multisend_address: Optional[str] = None,
+        gas_params: Optional[Callable[[], Awaitable[Dict[str, int]]]] = None,
+        gas_buffer: float = 1.1,
+        proxy: Optional[str] = None,
+    ):
+        self.account = Account.from_key(private_key)
+        self.web3 = web3
+        self.max_in_flight = max(1, max_in_flight)
+        self.multisend_address = multisend_address or None
+        self.gas_params = gas_params or (lambda: get_gas_params(self.web3))
+        self.gas_buffer = gas_buffer
+        self.proxy = proxy or getattr(web3.provider, "proxy", None)
+
+        self._pending: Dict[int, Transfer] = {}
+        self._window: Optional[asyncio.Semaphore] = None
+        self._aborted = False
+
+    @property
+    def address(self) -> str:
+        return self.account.address
+
+    def _pack(self, transfers: List[Transfer]) -> List[Transfer]:
+        """Pack plain value transfers into multi-send calls, the rest is sent as is."""
+        plain = [transfer for transfer in transfers if transfer.data in ("", "0x")]
+        other = [transfer for transfer in transfers if transfer.data not in ("", "0x")]
+
+        contract = self.web3.eth.contract(
+            address=self.web3.to_checksum_address(self.multisend_address),
+            abi=DISPERSE_ABI,
+        )
+        packed = []
+        for start in range(0, len(plain), MULTISEND_BATCH_SIZE):
+            chunk = plain[start : start + MULTISEND_BATCH_SIZE]
+            packed.append(
+                Transfer(
+                    to=contract.address,
+                    value=sum(transfer.value for transfer in chunk),
+                    data=contract.functions.disperseEther(
+                        [self.web3.to_checksum_address(transfer.to) for transfer in chunk],
+                        [transfer.value for transfer in chunk],
+                    )._encode_transaction_data(),
+                    parts=chunk,
+                )
+            )
+        return packed + other
+
+    async def run(self, transfers: List[Transfer]) -> List[Transfer]:
+        """
+        Send all transfers and wait until each one is mined or failed.
+
+        Returns:
+            The same transfers with nonce, tx_hash and success filled in
+        """
+        if not transfers:
+            return transfers
+
+        to_send = self._pack(transfers) if self.multisend_address else list(transfers)
+        logger.info(
+            f"{self.address[:8]}... | Sending {len(transfers)} transfers in {len(to_send)} transactions, "
+            f"up to {self.max_in_flight} in flight"
+        )
+
+        chain_id = await self.web3.eth.chain_id
+        nonce = await self.web3.eth.get_transaction_count(self.address, "pending")
+
+        self._pending = {}
+        self._window = asyncio.Semaphore(self.max_in_flight)
+        self._aborted = False
+        sending_done = asyncio.Event()
+        confirmer = asyncio.create_task(self._confirm(sending_done))
+
+        try:
+            for transfer in to_send:
+                await self._window.acquire()
+                if self._aborted:
+                    self._window.release()
+                    self._finish(transfer, False)
+                    continue
+
+                try:
+                    await self._send(transfer, nonce, chain_id)
+                except Exception as e:
+                    logger.error(f"{self.address[:8]}... | Failed to send transfer to {transfer.to[:8]}...: {e}")
+                    self._finish(transfer, False)
+                    self._window.release()
+                    # The node may have taken the nonce or not, ask it
+                    nonce = await self.web3.eth.get_transaction_count(self.address, "pending")
+                    continue
+
+                self._pending[nonce] = transfer
+                nonce += 1
+        finally:
+            sending_done.set()
+            await confirmer
+
+        succeeded = sum(1 for transfer in transfers if transfer.success)
+        logger.info(f"{self.address[:8]}... | Disperse finished: {succeeded}/{len(transfers)} transfers confirmed")
+        return transfers
+
+    async def _send(self, transfer: Transfer, nonce: int, chain_id: int):
+        transaction = {
+            "from": self.address,
+            "to": self.web3.to_checksum_address(transfer.to),
+            "value": transfer.value,
+            "data": transfer.data,
+            "nonce": nonce,
+            "chainId": chain_id,
+            "type": 2,
+            **(await self.gas_params()),
+        }
+        if transfer.gas is None:
+            transfer.gas = int(await self.web3.eth.estimate_gas(transaction) * self.gas_buffer)
+        transaction["gas"] = transfer.gas
+
+        signed_tx = self.account.sign_transaction(transaction)
+        tx_hash = await self.web3.eth.send_raw_transaction(signed_tx.raw_transaction)
+        transfer.nonce = nonce
+        transfer.tx_hash = tx_hash.hex()
+
+    def _finish(self, transfer: Transfer, success: bool):
+        transfer.success = success
+        for part in transfer.parts:
+            part.nonce, part.tx_hash, part.success = transfer.nonce, transfer.tx_hash, success
+
+    async def _confirm(self, sending_done: asyncio.Event):
+        last_progress = time.monotonic()
+
+        while not (sending_done.is_set() and not self._pending):
+            await asyncio.sleep(CONFIRM_POLL_INTERVAL)
+            if not self._pending:
+                last_progress = time.monotonic()
+                continue
+
+            try:
+                mined_nonce = await self.web3.eth.get_transaction_count(self.address, "latest")
+                mined = sorted(nonce for nonce in self._pending if nonce < mined_nonce)
+                for start in range(0, len(mined), MAX_BATCH_SIZE):
+                    chunk = mined[start : start + MAX_BATCH_SIZE]
+                    async with batch_web3(self.proxy, self.web3.provider.endpoint_uri) as web3:
+                        async with web3.batch_requests() as batch:
+                            for nonce in chunk:
+                                batch.add(
+                                    web3.eth.get_transaction_receipt(self._pending[nonce].tx_hash)
+                                )
+                            receipts = await batch.async_execute()
+
+                    for nonce, receipt in zip(chunk, receipts):
+                        # The node may not serve the receipt yet, the transfer stays pending
+                        if not receipt:
+                            continue
+                        success = receipt["status"] == 1
+                        transfer = self._pending.pop(nonce)
+                        try:
+                            self._finish(transfer, success)
+                            if not success:
+                                logger.error(f"{self.address[:8]}... | Transfer to {transfer.to[:8]}... reverted: {transfer.tx_hash}")
+                        finally:
+                            self._window.release()
+                        last_progress = time.monotonic()
+            except Exception as e:
+                logger.warning(f"{self.address[:8]}... | Failed to check pending transfers: {e}")
+
+            if self._pending and time.monotonic() - last_progress > CONFIRM_TIMEOUT:
+                logger.error(
+                    f"{self.address[:8]}... | {len(self._pending)} transfers not mined after "
+                    f"{CONFIRM_TIMEOUT} seconds, giving up on the rest"
+                )
+                self._aborted = True
+                for nonce in list(self._pending):
+                    self._finish(self._pending.pop(nonce), False)
+                    self._window.release()
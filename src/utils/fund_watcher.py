@@ -0,0 +1,129 @@
+import asyncio
+from typing import Callable, Dict, List, Optional
+
+from loguru import logger
+from web3 import AsyncWeb3
+
+from src.utils.constants import ERC20_ABI
+from src.utils.provider import batch_web3, create_web3
+from src.utils.scheduler import parked
+
+
+POLL_INTERVAL = 2  # seconds between block number checks per chain
+MAX_BATCH_SIZE = 100  # balance reads per JSON-RPC batch
+
+
+class _Waiter:
+    def __init__(
+        self,
+        address: str,
+        token: Optional[str],
+        condition: Callable[[int], bool],
+        future: asyncio.Future,
+    ):
+        self.address = address
+        self.token = token
+        self.condition = condition
+        self.future = future
+
+
+class FundWatcher:
+    """
+    One balance watcher for all accounts waiting on incoming funds.
+
+    Each chain gets a single loop that reads the balances of all waiting
+    accounts in batched requests once per new block. Waiting accounts are
+    parked: their THREADS slot is free until the funds land.
+    """
+
+    def __init__(self, poll_interval: float = POLL_INTERVAL):
+        self.poll_interval = poll_interval
+        self._waiters: Dict[str, List[_Waiter]] = {}
+        self._loops: Dict[str, asyncio.Task] = {}
+
+    async def wait_for_balance(
+        self,
+        rpc_url: str,
+        address: str,
+        condition: Callable[[int], bool],
+        timeout: float,
+        token: Optional[str] = None,
+    ) -> Optional[int]:
+        """
+        Wait until condition(balance in wei) is true for address on the chain.
+
+        Args:
+            rpc_url: RPC of the chain where the funds arrive
+            address: Wallet to watch
+            condition: Check for the balance, e.g. lambda b: b > initial
+            timeout: Max seconds to wait
+            token: ERC20 address, None for the native balance
+
+        Returns:
+            The balance that satisfied the condition, None on timeout
+        """
+        waiter = _Waiter(
+            AsyncWeb3.to_checksum_address(address),
+            token,
+            condition,
+            asyncio.get_running_loop().create_future(),
+        )
+        self._waiters.setdefault(rpc_url, []).append(waiter)
+
+        loop = self._loops.get(rpc_url)
+        if loop is None or loop.done():
+            self._loops[rpc_url] = asyncio.create_task(self._watch(rpc_url))
+
+        try:
+            async with parked():
+                return await asyncio.wait_for(waiter.future, timeout)
+        except asyncio.TimeoutError:
+            return None
+        finally:
+            if waiter in self._waiters.get(rpc_url, []):
+                self._waiters[rpc_url].remove(waiter)
+
+    async def _watch(self, rpc_url: str):
+        web3 = create_web3(rpc_url=rpc_url)
+        last_block = None
+
+        while self._waiters.get(rpc_url):
+            try:
+                block_number = await web3.eth.block_number
+                if block_number != last_block:
+                    last_block = block_number
+                    await self._check(rpc_url, list(self._waiters[rpc_url]))
+            except Exception as e:
+                logger.warning(f"Fund watcher failed to check balances on {rpc_url}: {e}")
+
+            await asyncio.sleep(self.poll_interval)
+
+    async def _check(self, rpc_url: str, waiters: List[_Waiter]):
+        waiters = [waiter for waiter in waiters if not waiter.future.done()]
+
+        for start in range(0, len(waiters), MAX_BATCH_SIZE):
+            chunk = waiters[start : start + MAX_BATCH_SIZE]
+            async with batch_web3(rpc_url=rpc_url) as web3:
+                async with web3.batch_requests() as batch:
+                    for waiter in chunk:
+                        if waiter.token is None:
+                            batch.add(web3.eth.get_balance(waiter.address))
+                        else:
+                            contract = web3.eth.contract(
+                                address=web3.to_checksum_address(waiter.token),
+                                abi=ERC20_ABI,
+                            )
+                            batch.add(contract.functions.balanceOf(waiter.address))
+                    balances = await batch.async_execute()
+
+            for waiter, balance in zip(chunk, balances):
+                if not waiter.future.done() and waiter.condition(int(balance)):
+                    waiter.future.set_result(int(balance))
+
+
+# Singleton pattern
+def get_fund_watcher() -> FundWatcher:
+    """Get fund watcher singleton"""
+    if not hasattr(get_fund_watcher, "_watcher"):
+        get_fund_watcher._watcher = FundWatcher()
+    return get_fund_watcher._watcher
@@ -0,0 +1,53 @@
+from typing import Dict, Optional, Tuple
+
+from eth_utils import keccak
+
+
+GasKey = Tuple[Optional[str], str, bool]
+
+
+class GasLimitCache:
+    """
+    Process-wide gas limit memo for calldata shapes with constant gas.
+
+    Entries are keyed by (to, selector, value > 0). Contract deployments
+    have no `to`, so the whole bytecode hash stands in for the selector.
+    The cache is seeded from live estimates and serves the largest one
+    plus a safety margin. Receipts teach it nothing: Monad charges the
+    full gas limit, so gasUsed is the limit whether it was enough or not.
+    """
+
+    def __init__(self, safety_margin: float = 1.2):
+        self.safety_margin = safety_margin
+        self._gas: Dict[GasKey, int] = {}
+
+    @staticmethod
+    def make_key(to: Optional[str], data: str, value: int) -> GasKey:
+        data = data if data.startswith("0x") else "0x" + data
+        if to is None:
+            selector = "0x" + keccak(hexstr=data).hex()
+        else:
+            selector = data[:10]
+            to = to.lower()
+        return to, selector, value > 0
+
+    def get(self, key: GasKey) -> Optional[int]:
+        gas = self._gas.get(key)
+        if gas is None:
+            return None
+        return int(gas * self.safety_margin)
+
+    def observe(self, key: GasKey, gas: int):
+        """Remember gas for key, keeping the largest value seen."""
+        self._gas[key] = max(self._gas.get(key, 0), gas)
+
+    def invalidate(self, key: GasKey):
+        self._gas.pop(key, None)
+
+
+# Singleton pattern
+def get_gas_cache() -> GasLimitCache:
+    """Get gas limit cache singleton"""
+    if not hasattr(get_gas_cache, "_cache"):
+        get_gas_cache._cache = GasLimitCache()
+    return get_gas_cache._cache
@@ -0,0 +1,101 @@
+import asyncio
+import time
+from collections import OrderedDict
+from functools import wraps
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional, Tuple
+
+
+MAX_ENTRIES = 256
+
+
+class HttpCache:
+    """
+    Process-wide cache of HTTP API results that are the same for every account.
+
+    Entries expire after their TTL and the least recently used one is
+    dropped when the cache is full. Concurrent misses of the same key
+    wait for one upstream request. None results (failed requests) are
+    never cached.
+    """
+
+    def __init__(self, max_entries: int = MAX_ENTRIES):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[Hashable, Tuple[float, Any]]" = OrderedDict()
+        self._inflight: Dict[Hashable, asyncio.Future] = {}
+        self.hits = 0
+        self.misses = 0
+
+    async def get(
+        self, key: Hashable, fetch: Callable[[], Awaitable[Any]], ttl: float
+    ) -> Any:
+        """Cached result for key, fetch() it when missing or older than ttl seconds."""
+        entry = self._entries.get(key)
+        if entry is not None and time.monotonic() - entry[0] < ttl:
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+        inflight = self._inflight.get(key)
+        if inflight is not None:
+            self.hits += 1
+            return await asyncio.shield(inflight)
+
+        self.misses += 1
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        try:
+            value = await fetch()
+            if value is not None:
+                self._put(key, value)
+            future.set_result(value)
+            return value
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as e:
+            future.set_exception(e)
+            # Nobody may be waiting, don't let asyncio warn about it
+            future.exception()
+            raise
+        finally:
+            del self._inflight[key]
+
+    def _put(self, key: Hashable, value: Any):
+        self._entries[key] = (time.monotonic(), value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def invalidate(self, key: Hashable):
+        self._entries.pop(key, None)
+
+
+# Singleton pattern
+def get_http_cache() -> HttpCache:
+    """Get HTTP response cache singleton"""
+    if not hasattr(get_http_cache, "_cache"):
+        get_http_cache._cache = HttpCache()
+    return get_http_cache._cache
+
+
+def shared_response(ttl: float, key: Optional[str] = None):
+    """
+    Share a method's result between all instances (accounts) for ttl seconds.
+
+    Only for endpoints whose answer doesn't depend on the account: the
+    cache key is the method name and its arguments, self is ignored.
+    """
+
+    def decorator(func: Callable[..., Awaitable[Any]]):
+        name = key or func.__qualname__
+
+        @wraps(func)
+        async def wrapper(self, *args, **kwargs):
+            cache_key = (name, args, tuple(sorted(kwargs.items())))
+            return await get_http_cache().get(
+                cache_key, lambda: func(self, *args, **kwargs), ttl
+            )
+
+        return wrapper
+
+    return decorator
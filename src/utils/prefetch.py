@@ -0,0 +1,33 @@
+import time
+from typing import Any, Optional
+
+
+# Prepared inputs older than this are fetched again when the task starts
+PREFETCH_MAX_AGE = 60  # seconds
+
+
+class Prefetched:
+    """
+    Slot for a value fetched ahead of time by a module's prepare() step.
+
+    Start.flow runs prepare() of the next task during the pause after the
+    current one, the task then takes the value instead of fetching it cold.
+    """
+
+    def __init__(self, max_age: float = PREFETCH_MAX_AGE):
+        self.max_age = max_age
+        self._value: Any = None
+        self._fetched_at: Optional[float] = None
+
+    def put(self, value: Any):
+        self._value = value
+        self._fetched_at = time.monotonic()
+
+    def take(self) -> Any:
+        """Return the prepared value once, None if it is missing or stale."""
+        value, fetched_at = self._value, self._fetched_at
+        self._value, self._fetched_at = None, None
+
+        if fetched_at is None or time.monotonic() - fetched_at > self.max_age:
+            return None
+        return value
@@ -0,0 +1,154 @@
+import asyncio
+import random
+import time
+from collections import Counter
+from contextlib import asynccontextmanager
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from eth_account import Account
+from loguru import logger
+from web3 import AsyncHTTPProvider, AsyncWeb3
+
+from src.utils.constants import RPC_URL
+from src.utils.call_cache import get_call_cache
+from src.utils.proxy_pool import get_proxy_pool
+from src.utils.concurrency import get_rpc_metrics, is_rate_limited
+
+
+class SharedHTTPProvider(AsyncHTTPProvider):
+    """
+    AsyncHTTPProvider that counts every JSON-RPC call it sends.
+
+    The counters make hidden round trips visible: each entry in
+    `request_counts` is one request that actually left the process.
+    Send listeners are called with the sender of every raw transaction
+    that went through the provider. eth_calls registered as global in
+    the call cache are answered from it when possible. The outcome of
+    every request is reported to the proxy pool and the RPC metrics.
+    """
+
+    def __init__(self, endpoint_uri: str, proxy: Optional[str] = None, **kwargs):
+        super().__init__(
+            endpoint_uri,
+            request_kwargs={
+                "proxy": (f"http://{proxy}") if proxy else None,
+                "ssl": False,
+            },
+            **kwargs,
+        )
+        self.proxy = proxy
+        self.request_counts: Counter = Counter()
+        self._send_listeners: List[Callable[[str], None]] = []
+
+    @property
+    def total_requests(self) -> int:
+        return sum(self.request_counts.values())
+
+    def add_send_listener(self, listener: Callable[[str], None]):
+        self._send_listeners.append(listener)
+
+    def remove_send_listener(self, listener: Callable[[str], None]):
+        if listener in self._send_listeners:
+            self._send_listeners.remove(listener)
+
+    def _notify_send(self, raw_transaction):
+        try:
+            sender = Account.recover_transaction(raw_transaction)
+        except Exception as e:
+            logger.warning(f"Failed to recover sender of raw transaction: {e}")
+            return
+        for listener in list(self._send_listeners):
+            listener(sender)
+
+    async def make_request(self, method, params: Any):
+        if method == "eth_call":
+            call_cache = get_call_cache()
+            rule = call_cache.rule_for(params)
+            if rule is not None:
+                return await call_cache.call(
+                    self.endpoint_uri,
+                    params,
+                    rule,
+                    lambda: self._send_request(method, params),
+                    self._block_number,
+                    request_id=next(self.request_counter),
+                )
+        return await self._send_request(method, params)
+
+    async def _block_number(self) -> int:
+        response = await self._send_request("eth_blockNumber", [])
+        return int(response["result"], 16)
+
+    async def _send_request(self, method, params: Any):
+        self.request_counts[method] += 1
+        response = await self._tracked(super().make_request(method, params))
+        if method == "eth_sendRawTransaction" and self._send_listeners:
+            self._notify_send(params[0])
+        return response
+
+    async def make_batch_request(self, batch_requests):
+        # A batch is one HTTP round trip no matter how many calls it carries
+        self.request_counts["batch"] += 1
+        return await self._tracked(super().make_batch_request(batch_requests))
+
+    async def _tracked(self, request):
+        started = time.monotonic()
+        try:
+            response = await request
+        except Exception as e:
+            get_proxy_pool().report_error(self.proxy, e, self.endpoint_uri)
+            get_rpc_metrics().record(time.monotonic() - started, failed=True)
+            raise
+        latency = time.monotonic() - started
+        get_proxy_pool().report_success(self.proxy, latency, self.endpoint_uri)
+        get_rpc_metrics().record(latency, failed=is_rate_limited(response))
+        return response
+
+
+_web3_pool: Dict[Tuple[str, Optional[str]], AsyncWeb3] = {}
+
+# Clients of (rpc_url, proxy) that only carry JSON-RPC batches
+BATCH_CLIENTS = 4
+_batch_pool: Dict[Tuple[str, Optional[str]], List[Tuple[AsyncWeb3, asyncio.Lock]]] = {}
+
+
+def create_web3(proxy: Optional[str] = None, rpc_url: str = RPC_URL) -> AsyncWeb3:
+    """
+    Get the shared AsyncWeb3 client for (rpc_url, proxy).
+
+    Clients are created with an empty middleware stack: web3's default
+    middleware validates chain id and fills gas/fees with extra RPC calls
+    that TxBuilder already takes care of locally.
+    """
+    key = (rpc_url, proxy)
+    if key not in _web3_pool:
+        _web3_pool[key] = AsyncWeb3(
+            SharedHTTPProvider(rpc_url, proxy=proxy),
+            middleware=[],
+        )
+    return _web3_pool[key]
+
+
+@asynccontextmanager
+async def batch_web3(proxy: Optional[str] = None, rpc_url: str = RPC_URL):
+    """
+    Client of (rpc_url, proxy) held exclusively for one JSON-RPC batch.
+
+    web3 switches the whole provider into batching mode while a batch is
+    open: any other call made through it meanwhile gets request info back
+    instead of a result. Batches therefore never go through the shared
+    clients of create_web3, and no two batches share a client at once.
+    Up to BATCH_CLIENTS batches of one (rpc_url, proxy) run in parallel.
+    """
+    clients = _batch_pool.setdefault((rpc_url, proxy), [])
+    free = [client for client in clients if not client[1].locked()]
+    if free:
+        web3, lock = free[0]
+    elif len(clients) < BATCH_CLIENTS:
+        web3, lock = AsyncWeb3(SharedHTTPProvider(rpc_url, proxy=proxy), middleware=[]), asyncio.Lock()
+        clients.append((web3, lock))
+    else:
+        web3, lock = random.choice(clients)
+
+    async with lock:
+        yield web3
@@ -0,0 +1,327 @@
+import asyncio
+import time
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from typing import AsyncIterator, Dict, List, Optional
+from urllib.parse import urlsplit
+
+import aiohttp
+from aiohttp import web
+from loguru import logger
+
+
+MAX_ERRORS = 5  # connection errors in a row before a proxy is considered dead
+# A dead proxy gets another chance after this, one more failure kills it again
+DEAD_COOLDOWN = 300  # seconds
+LATENCY_SMOOTHING = 0.2  # weight of a new latency sample
+# A timeout counts against a proxy only if the same host answered
+# through another proxy within this window
+TIMEOUT_BLAME_WINDOW = 60  # seconds
+
+# CHECK_URL value that checks against a stand-in server on this machine
+LOCAL_CHECK_URL = "local"
+
+# Errors of the proxy hop itself: CONNECT refused or not authorized (407),
+# the proxy refusing or dropping the connection
+PROXY_ERROR_TYPES = (
+    aiohttp.ClientProxyConnectionError,
+    aiohttp.ClientHttpProxyError,
+    ConnectionRefusedError,
+    ConnectionResetError,
+)
+PROXY_ERROR_MARKERS = (
+    "proxy",
+    "tunnel",
+    "407",
+    "connection refused",
+    "connection reset",
+)
+TIMEOUT_MARKERS = ("timed out", "timeout")
+
+
+def is_proxy_error(error: BaseException) -> bool:
+    if isinstance(error, PROXY_ERROR_TYPES):
+        return True
+    message = str(error).lower()
+    return any(marker in message for marker in PROXY_ERROR_MARKERS)
+
+
+def is_timeout(error: BaseException) -> bool:
+    if isinstance(error, asyncio.TimeoutError):
+        return True
+    message = str(error).lower()
+    return any(marker in message for marker in TIMEOUT_MARKERS)
+
+
+def _host(url: Optional[str]) -> Optional[str]:
+    if not url:
+        return None
+    return urlsplit(str(url)).netloc.lower() or None
+
+
+@asynccontextmanager
+async def local_check_target() -> AsyncIterator[str]:
+    """
+    HTTP server on 127.0.0.1 that answers 200 to anything.
+
+    Stands in for the real CHECK_URL in tests and for proxies that run on
+    this machine. Yields its URL.
+    """
+
+    async def ok(request: web.Request) -> web.Response:
+        return web.Response(text="ok")
+
+    app = web.Application()
+    app.router.add_route("*", "/{tail:.*}", ok)
+    runner = web.AppRunner(app, access_log=None)
+    await runner.setup()
+    try:
+        site = web.TCPSite(runner, "127.0.0.1", 0)
+        await site.start()
+        port = runner.addresses[0][1]
+        yield f"http://127.0.0.1:{port}/"
+    finally:
+        await runner.cleanup()
+
+
+def mask_proxy(proxy: Optional[str]) -> str:
+    """ip:port without credentials, for logs"""
+    if not proxy:
+        return "direct"
+    return proxy.rsplit("@", 1)[-1]
+
+
+@dataclass
+class ProxyStats:
+    latency: Optional[float] = None  # seconds, smoothed
+    alive: bool = True
+    dead_since: float = 0.0
+    requests: int = 0
+    errors: int = 0
+    consecutive_errors: int = 0
+    accounts: int = 0  # accounts currently using the proxy
+
+    @property
+    def error_rate(self) -> float:
+        return self.errors / self.requests if self.requests else 0.0
+
+
+class ProxyPool:
+    """
+    Health and load of every proxy of the run.
+
+    Proxies are checked concurrently before the start, RPC and HTTP
+    clients report the outcome of their requests during the run. A proxy
+    with max_errors connection errors in a row is marked dead and the
+    accounts bound to it move to the alive proxy with the fewest accounts
+    and the lowest latency. Direct connections (None) are never tracked.
+
+    Only errors of the proxy hop count. A timeout may just as well be a
+    slow target, so it counts only while the same host keeps answering
+    through other proxies.
+    """
+
+    def __init__(self, max_errors: int = MAX_ERRORS):
+        self.max_errors = max_errors
+        self.stats: Dict[str, ProxyStats] = {}
+        self.started_at = time.monotonic()
+        # host -> proxy -> time of its last successful request there
+        self._answered: Dict[str, Dict[str, float]] = {}
+
+    def add(self, proxies: List[Optional[str]]):
+        for proxy in proxies:
+            if proxy and proxy not in self.stats:
+                self.stats[proxy] = ProxyStats()
+
+    def _get(self, proxy: str) -> ProxyStats:
+        if proxy not in self.stats:
+            self.stats[proxy] = ProxyStats()
+        return self.stats[proxy]
+
+    def is_alive(self, proxy: Optional[str]) -> bool:
+        if not proxy:
+            return True
+        stats = self._get(proxy)
+        if not stats.alive and time.monotonic() - stats.dead_since > DEAD_COOLDOWN:
+            # Probation: the next error marks it dead again
+            stats.alive = True
+            stats.consecutive_errors = self.max_errors - 1
+        return stats.alive
+
+    async def check(self, url: str, timeout: float) -> int:
+        """
+        Send one request to url through every proxy at once.
+
+        Any HTTP answer counts as alive, its time is the proxy's latency.
+        With url LOCAL_CHECK_URL the proxies are checked against
+        local_check_target().
+
+        Returns:
+            Number of alive proxies
+        """
+        if url == LOCAL_CHECK_URL:
+            async with local_check_target() as local_url:
+                return await self.check(local_url, timeout)
+
+        proxies = list(self.stats)
+        if not proxies:
+            return 0
+        logger.info(f"Checking {len(proxies)} proxies...")
+
+        async with aiohttp.ClientSession(
+            timeout=aiohttp.ClientTimeout(total=timeout),
+            cookie_jar=aiohttp.DummyCookieJar(),
+        ) as session:
+            results = await asyncio.gather(
+                *(self._check_one(session, url, proxy) for proxy in proxies)
+            )
+
+        for proxy, latency in zip(proxies, results):
+            stats = self.stats[proxy]
+            if latency is None:
+                stats.alive = False
+                stats.dead_since = time.monotonic()
+            else:
+                stats.alive = True
+                stats.latency = latency
+
+        alive = sum(1 for latency in results if latency is not None)
+        if alive < len(proxies):
+            logger.warning(
+                f"Dead proxies: {' '.join(mask_proxy(p) for p, l in zip(proxies, results) if l is None)}"
+            )
+        logger.info(f"{alive} of {len(proxies)} proxies are alive")
+        return alive
+
+    async def _check_one(
+        self, session: aiohttp.ClientSession, url: str, proxy: str
+    ) -> Optional[float]:
+        started = time.monotonic()
+        try:
+            async with session.get(url, proxy=f"http://{proxy}", ssl=False) as response:
+                await response.read()
+            return time.monotonic() - started
+        except Exception as e:
+            logger.debug(f"Proxy {mask_proxy(proxy)} failed the check: {e}")
+            return None
+
+    def report_success(
+        self,
+        proxy: Optional[str],
+        latency: Optional[float] = None,
+        url: Optional[str] = None,
+    ):
+        if not proxy:
+            return
+        host = _host(url)
+        if host:
+            self._answered.setdefault(host, {})[proxy] = time.monotonic()
+        stats = self._get(proxy)
+        stats.requests += 1
+        stats.consecutive_errors = 0
+        if latency is not None:
+            stats.latency = (
+                latency
+                if stats.latency is None
+                else (1 - LATENCY_SMOOTHING) * stats.latency + LATENCY_SMOOTHING * latency
+            )
+
+    def report_error(
+        self, proxy: Optional[str], error: BaseException, url: Optional[str] = None
+    ):
+        """Count a failed request, only errors of the proxy hop count against the proxy."""
+        if not proxy:
+            return
+        stats = self._get(proxy)
+        stats.requests += 1
+        if is_timeout(error) and not is_proxy_error(error):
+            if not self._answers_elsewhere(proxy, url):
+                # The target may be slow for everybody, the proxy is not to blame
+                return
+        elif not is_proxy_error(error):
+            stats.consecutive_errors = 0
+            return
+        stats.errors += 1
+        stats.consecutive_errors += 1
+        if stats.alive and stats.consecutive_errors >= self.max_errors:
+            stats.alive = False
+            stats.dead_since = time.monotonic()
+            logger.warning(
+                f"Proxy {mask_proxy(proxy)} failed {stats.consecutive_errors} times in a row, "
+                f"moving its accounts to other proxies"
+            )
+
+    def _answers_elsewhere(self, proxy: str, url: Optional[str]) -> bool:
+        """True if the host of url answered through another proxy within TIMEOUT_BLAME_WINDOW."""
+        host = _host(url)
+        if not host:
+            return False
+        since = time.monotonic() - TIMEOUT_BLAME_WINDOW
+        return any(
+            other != proxy and answered_at >= since
+            for other, answered_at in self._answered.get(host, {}).items()
+        )
+
+    def _best(self, exclude: Optional[str] = None) -> Optional[str]:
+        alive = [
+            proxy for proxy in self.stats if proxy != exclude and self.is_alive(proxy)
+        ]
+        if not alive:
+            return None
+        return min(
+            alive,
+            key=lambda proxy: (
+                self.stats[proxy].accounts,
+                self.stats[proxy].latency if self.stats[proxy].latency is not None else float("inf"),
+            ),
+        )
+
+    def acquire(self, proxy: Optional[str]) -> Optional[str]:
+        """The proxy an account bound to `proxy` should use, counted as its load."""
+        if proxy and not self.is_alive(proxy):
+            proxy = self._best(exclude=proxy) or proxy
+        if proxy:
+            self._get(proxy).accounts += 1
+        return proxy
+
+    def release(self, proxy: Optional[str]):
+        if proxy and proxy in self.stats:
+            self.stats[proxy].accounts = max(self.stats[proxy].accounts - 1, 0)
+
+    def replacement(self, proxy: Optional[str]) -> Optional[str]:
+        """
+        A new proxy for an account whose proxy died, None if it is alive
+        or there is nothing better.
+        """
+        if self.is_alive(proxy):
+            return None
+        new_proxy = self._best(exclude=proxy)
+        if new_proxy is None:
+            return None
+        self.release(proxy)
+        self._get(new_proxy).accounts += 1
+        return new_proxy
+
+    def log_report(self):
+        """Per-proxy requests, errors and latency of the run."""
+        used = [(proxy, stats) for proxy, stats in self.stats.items() if stats.requests]
+        if not used:
+            return
+        minutes = max((time.monotonic() - self.started_at) / 60, 1 / 60)
+        lines = []
+        for proxy, stats in sorted(used, key=lambda item: -item[1].error_rate):
+            latency = f"{stats.latency * 1000:.0f}ms" if stats.latency is not None else "-"
+            lines.append(
+                f"{mask_proxy(proxy)}: {stats.requests} requests ({stats.requests / minutes:.1f}/min), "
+                f"{stats.errors} errors ({stats.error_rate:.0%}), latency {latency}"
+                f"{'' if stats.alive else ', DEAD'}"
+            )
+        logger.info("Proxy stats:\n" + "\n".join(lines))
+
+
+# Singleton pattern
+def get_proxy_pool() -> ProxyPool:
+    """Get proxy pool singleton"""
+    if not hasattr(get_proxy_pool, "_pool"):
+        get_proxy_pool._pool = ProxyPool()
+    return get_proxy_pool._pool
@@ -0,0 +1,144 @@
+import asyncio
+import random
+import sys
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Any, Optional, Tuple
+
+from loguru import logger
+
+from src.utils.circuit_breaker import CircuitOpenError
+
+
+DEFAULT_PAUSE = (1, 3)  # seconds, for call sites without a pause of their own
+MAX_BACKOFF_MULTIPLIER = 4
+
+# Errors another attempt can't fix: the same call would fail the same way
+FATAL_ERROR_MARKERS = (
+    "insufficient funds",
+    "insufficient balance",
+    "exceeds balance",
+    "not enough balance",
+    "invalid private key",
+    "non-hexadecimal",
+)
+
+
+@dataclass
+class RetryBudget:
+    """
+    Retries one scope (an account, a task) may spend, in number and in time.
+
+    Only time lost to retrying is charged: backoff pauses and retried
+    attempts that failed again. Waiting for funds, bridge polling and the
+    pauses between actions don't eat into the budget of a long task.
+    """
+
+    name: str
+    max_retries: int
+    max_time: float
+    retries: int = 0
+    spent: float = 0.0  # seconds lost to retrying
+    started_at: float = field(default_factory=time.monotonic)
+
+    @property
+    def remaining_time(self) -> float:
+        return self.max_time - self.spent
+
+    @property
+    def exhausted(self) -> bool:
+        return self.retries >= self.max_retries or self.remaining_time <= 0
+
+
+# Budgets of the scopes the current code runs in, outermost first
+_budgets: ContextVar[Tuple[RetryBudget, ...]] = ContextVar("retry_budgets", default=())
+# (call site, time, attempt) of the last retry started in this context, a failure of it is charged too
+_last_retry: ContextVar[Optional[Tuple[Any, float, int]]] = ContextVar("last_retry", default=None)
+
+
+def _call_site(frame) -> Tuple[int, Any]:
+    """Running frame of the retry loop; the code object keeps a reused id from matching another loop"""
+    return id(frame), frame.f_code
+
+
+@contextmanager
+def retry_budget(name: str, max_retries: int, max_time: float):
+    """Every retry made inside is charged to this budget too."""
+    budget = RetryBudget(name, max_retries, max_time)
+    token = _budgets.set(_budgets.get() + (budget,))
+    try:
+        yield budget
+    finally:
+        _budgets.reset(token)
+
+
+def is_retryable(error: Optional[BaseException]) -> bool:
+    """False for errors another attempt can't fix. None (a failed result) is retryable."""
+    if error is None:
+        return True
+    if isinstance(error, (CircuitOpenError, asyncio.CancelledError)):
+        return False
+    message = str(error).lower()
+    return not any(marker in message for marker in FATAL_ERROR_MARKERS)
+
+
+def backoff(attempt: int, pause: Tuple[float, float] = DEFAULT_PAUSE) -> float:
+    """Random pause within the range, growing with the attempt number up to MAX_BACKOFF_MULTIPLIER times"""
+    return random.uniform(pause[0], pause[1]) * min(2**attempt, MAX_BACKOFF_MULTIPLIER)
+
+
+async def should_retry(
+    error: Optional[BaseException] = None,
+    attempt: int = 0,
+    pause: Tuple[float, float] = DEFAULT_PAUSE,
+) -> bool:
+    """
+    Decide on another attempt after a failure and wait before it.
+
+    The local attempt limit stays with the call site, this adds the
+    shared rules: fatal errors are not retried and every retry, with its
+    pause and the time of the failed retried attempt, is charged to the
+    budgets of the account and the task it runs in.
+
+    Args:
+        error: The exception of the failed attempt, None for a failed result
+        attempt: Zero-based number of the failed attempt
+        pause: (min, max) seconds before backoff
+
+    Returns:
+        True after the pause if the caller should try again
+    """
+    call_site = _call_site(sys._getframe(1))
+    if not is_retryable(error):
+        logger.debug(f"Not retrying, the error is fatal: {error}")
+        return False
+
+    budgets = _budgets.get()
+    last_retry = _last_retry.get()
+    now = time.monotonic()
+    # The failed attempt is the retry this loop started last: its time is lost to retrying.
+    # Retries started by other retry loops are not this failure
+    if last_retry is not None and last_retry[0] == call_site and last_retry[2] == attempt:
+        for budget in budgets:
+            budget.spent += now - max(last_retry[1], budget.started_at)
+
+    for budget in budgets:
+        if budget.exhausted:
+            logger.warning(
+                f"Retry budget of {budget.name} is spent ({budget.retries} retries, "
+                f"{budget.spent:.0f}s), giving up: {error}"
+            )
+            return False
+
+    delay = backoff(attempt, pause)
+    if budgets:
+        delay = max(min(delay, min(budget.remaining_time for budget in budgets)), 0)
+    for budget in budgets:
+        budget.retries += 1
+        budget.spent += delay
+
+    await asyncio.sleep(delay)
+    _last_retry.set((call_site, time.monotonic(), attempt + 1))
+    return True
@@ -0,0 +1,207 @@
+import asyncio
+import random
+import time
+from contextlib import asynccontextmanager
+from contextvars import ContextVar
+from typing import Dict, Optional
+
+from loguru import logger
+
+from src.utils.concurrency import AdjustableSemaphore
+
+
+# Slot of the THREADS semaphore held by the account flow running in this task
+_current_slot: ContextVar[Optional[asyncio.Semaphore]] = ContextVar(
+    "scheduler_slot", default=None
+)
+
+
+@asynccontextmanager
+async def scheduler_slot(semaphore: asyncio.Semaphore):
+    """Hold one of the THREADS slots for the account flow running inside."""
+    async with semaphore:
+        token = _current_slot.set(semaphore)
+        try:
+            yield
+        finally:
+            _current_slot.reset(token)
+
+
+@asynccontextmanager
+async def parked():
+    """
+    Give the slot to another account while this one waits on something
+    external (bridged funds, CEX withdrawal). The slot is taken back before
+    the flow continues. Outside of a slot this is a no-op.
+    """
+    semaphore = _current_slot.get()
+    if semaphore is None:
+        yield
+        return
+
+    semaphore.release()
+    try:
+        yield
+    finally:
+        await semaphore.acquire()
+
+
+class TaskClasses:
+    """
+    Concurrency limits per resource class of tasks (browser, cex, ...),
+    on top of the THREADS limit for accounts.
+
+    An account waiting for a class slot gives its THREADS slot away
+    meanwhile, so accounts with cheap tasks keep running. Classes with
+    limit 0 and tasks without a class are limited by THREADS only.
+    """
+
+    def __init__(self, limits: Dict[str, int]):
+        self.limits = {name: limit for name, limit in limits.items() if limit > 0}
+        self.semaphores = {
+            name: AdjustableSemaphore(limit) for name, limit in self.limits.items()
+        }
+
+    @asynccontextmanager
+    async def slot(self, resource_class: Optional[str]):
+        semaphore = self.semaphores.get(resource_class)
+        if semaphore is None:
+            yield
+            return
+
+        if semaphore.locked():
+            async with parked():
+                await semaphore.acquire()
+        else:
+            await semaphore.acquire()
+        try:
+            yield
+        finally:
+            semaphore.release()
+
+
+# Singleton pattern
+def get_task_classes(limits: Optional[Dict[str, int]] = None) -> TaskClasses:
+    """Get task class limits singleton, configured by the first call with limits"""
+    if not hasattr(get_task_classes, "_classes"):
+        get_task_classes._classes = TaskClasses(limits or {})
+    return get_task_classes._classes
+
+
+class Pacer:
+    """
+    Spreads account starts evenly over a target duration.
+
+    Each account waits for its turn (turn()) before taking a THREADS slot
+    and holds the next turn until it got the slot (started()). The
+    interval to the next start is the time left divided among the
+    accounts left, re-planned from the moment the account really started:
+    accounts that started late because all slots were busy make the
+    following intervals shorter, early finishes make them longer. Starts
+    are shifted by up to jitter seconds (at most half the interval)
+    either way. A pause moves the whole schedule by its length, a drain
+    lets the waiting accounts through at once to be dropped.
+    """
+
+    def __init__(self, total: int, duration: float, jitter: float):
+        self.total = total
+        self.remaining = total
+        self.jitter = jitter
+        self.started_at = time.monotonic()
+        self.deadline = self.started_at + duration
+        self._last_start = self.started_at
+        self._interval = 0.0
+        self._lock = asyncio.Lock()
+        self._holder: Optional[object] = None
+        self._paused_at: Optional[float] = None
+        self._draining = False
+        self._changed = asyncio.Event()
+
+    @property
+    def interval(self) -> float:
+        # The last account starts one interval before the deadline, with time left to run
+        return max(self.deadline - self._last_start, 0) / (self.remaining + 1)
+
+    @asynccontextmanager
+    async def turn(self):
+        """Wait for the planned start, the next account waits until this one called started()"""
+        # The lock queues accounts in the order they asked, that is in launch order
+        await self._lock.acquire()
+        holder = self._holder = object()
+        try:
+            await self._wait_planned()
+            yield
+        finally:
+            # Account that never started (error, cancel) gives the turn away too
+            if self._holder is holder:
+                self._release()
+
+    async def _wait_planned(self):
+        shift = random.uniform(-1, 1)
+        # Pause, resume and drain wake the account up to plan again
+        while not self._draining:
+            changed = self._changed
+            if self._paused_at is not None:
+                await changed.wait()
+                continue
+
+            self._interval = self.interval
+            # The first account starts right away
+            if self.remaining < self.total:
+                planned = self._last_start + self._interval
+            else:
+                planned = self.started_at
+            delay = planned + shift * min(self.jitter, self._interval / 2) - time.monotonic()
+            if delay <= 0:
+                return
+            try:
+                await asyncio.wait_for(changed.wait(), delay)
+            except asyncio.TimeoutError:
+                return
+
+    def pause(self):
+        if self._paused_at is None:
+            self._paused_at = time.monotonic()
+            self._wake()
+
+    def resume(self):
+        if self._paused_at is not None:
+            # Starts missed during the pause are not made up in a burst
+            paused = time.monotonic() - self._paused_at
+            self.started_at += paused
+            self._last_start += paused
+            self.deadline += paused
+            self._paused_at = None
+        self._draining = False
+        self._wake()
+
+    def drain(self):
+        self._draining = True
+        self._wake()
+
+    def _wake(self):
+        self._changed.set()
+        self._changed = asyncio.Event()
+
+    def started(self):
+        """The account holding the turn got its THREADS slot, the next interval is planned from now"""
+        if self._holder is None:
+            return
+        self._last_start = time.monotonic()
+        self.remaining -= 1
+        self._log_progress(self._interval)
+        self._release()
+
+    def _release(self):
+        self._holder = None
+        self._lock.release()
+
+    def _log_progress(self, interval: float):
+        started = self.total - self.remaining
+        if started % max(self.total // 20, 1) and self.remaining:
+            return
+        left = max(self.deadline - time.monotonic(), 0)
+        logger.info(
+            f"Pacing: {started}/{self.total} accounts started, one every {interval:.0f}s, "
+            f"{left / 3600:.1f}h left of the target window"
+        )
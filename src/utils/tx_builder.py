@@ -0,0 +1,259 @@
+import asyncio
+import time
+from typing import Dict, Optional, Tuple
+
+from eth_account import Account
+from loguru import logger
+from web3 import AsyncWeb3
+
+from src.utils.constants import CHAIN_ID
+from src.utils.gas_cache import GasLimitCache, get_gas_cache
+from src.utils.provider import create_web3
+
+
+# Fees are the same for every account, so one read serves the whole process
+FEE_CACHE_TTL = 15  # seconds
+
+_fee_cache: Dict[str, Tuple[float, Dict[str, int]]] = {}
+_fee_locks: Dict[str, asyncio.Lock] = {}
+
+
+async def get_gas_params(web3: AsyncWeb3) -> Dict[str, int]:
+    """Get EIP-1559 fee params, refreshed at most once per FEE_CACHE_TTL."""
+    key = web3.provider.endpoint_uri
+    cached = _fee_cache.get(key)
+    if cached and time.monotonic() - cached[0] < FEE_CACHE_TTL:
+        return cached[1]
+
+    lock = _fee_locks.setdefault(key, asyncio.Lock())
+    async with lock:
+        # Another coroutine may have refreshed the cache while we waited
+        cached = _fee_cache.get(key)
+        if cached and time.monotonic() - cached[0] < FEE_CACHE_TTL:
+            return cached[1]
+
+        latest_block = await web3.eth.get_block("latest")
+        base_fee = latest_block["baseFeePerGas"]
+        max_priority_fee = await web3.eth.max_priority_fee
+
+        # The value is reused for a while, leave room for the base fee to grow
+        gas_params = {
+            "maxFeePerGas": int(base_fee * 1.25) + max_priority_fee,
+            "maxPriorityFeePerGas": max_priority_fee,
+        }
+        _fee_cache[key] = (time.monotonic(), gas_params)
+        return gas_params
+
+
+def _is_nonce_error(error: Exception) -> bool:
+    message = str(error).lower()
+    return "nonce" in message or "already known" in message
+
+
+class TxBuilder:
+    """
+    Lean transaction builder for Monad testnet.
+
+    chainId is a constant, the nonce is read once and then tracked locally,
+    fees come from a process-wide cache and calldata is encoded by the caller.
+    With cache_gas=True the gas limit is served from GasLimitCache, so sending
+    a transaction costs a single eth_sendRawTransaction call.
+    """
+
+    # Shared by all builders of the same address, modules are created per task
+    _nonces: Dict[str, int] = {}
+    _nonce_locks: Dict[str, asyncio.Lock] = {}
+
+    def __init__(
+        self,
+        private_key: str,
+        proxy: Optional[str] = None,
+        web3: Optional[AsyncWeb3] = None,
+        gas_buffer: float = 1.1,
+    ):
+        self.account = Account.from_key(private_key)
+        self.web3 = web3 or create_web3(proxy)
+        self.gas_buffer = gas_buffer
+        self.gas_cache = get_gas_cache()
+
+    @property
+    def address(self) -> str:
+        return self.account.address
+
+    async def get_nonce(self) -> int:
+        if self.address not in TxBuilder._nonces:
+            TxBuilder._nonces[self.address] = await self.web3.eth.get_transaction_count(
+                self.address, "pending"
+            )
+        return TxBuilder._nonces[self.address]
+
+    def reset_nonce(self):
+        TxBuilder._nonces.pop(self.address, None)
+
+    def set_nonce(self, nonce: int):
+        TxBuilder._nonces[self.address] = nonce
+
+    @property
+    def local_nonce(self) -> Optional[int]:
+        """Next nonce as tracked locally, None until it was read."""
+        return TxBuilder._nonces.get(self.address)
+
+    async def estimate_gas(self, transaction: dict) -> int:
+        """Estimate gas for transaction and add some buffer."""
+        estimated = await self.web3.eth.estimate_gas(transaction)
+        return int(estimated * self.gas_buffer)
+
+    async def build(
+        self,
+        to: Optional[str],
+        data: str = "0x",
+        value: int = 0,
+        gas: Optional[int] = None,
+        gas_params: Optional[Dict[str, int]] = None,
+        cache_gas: bool = False,
+    ) -> dict:
+        """
+        Build a signed-ready EIP-1559 transaction.
+
+        Args:
+            to: Recipient, None for contract deployment
+            data: Calldata encoded locally, e.g. fn._encode_transaction_data()
+            value: Amount of MON in wei
+            gas: Gas limit, estimated when not given
+            gas_params: Fee override, the shared fee cache is used when not given
+            cache_gas: Calldata shape has constant gas, reuse the memoized limit
+        """
+        transaction, _ = await self._build(to, data, value, gas, gas_params, cache_gas)
+        return transaction
+
+    async def _build(
+        self,
+        to: Optional[str],
+        data: str,
+        value: int,
+        gas: Optional[int],
+        gas_params: Optional[Dict[str, int]],
+        cache_gas: bool,
+    ) -> Tuple[dict, bool]:
+        """build() that also tells whether the gas limit came from the cache"""
+        transaction = {
+            "from": self.address,
+            "value": value,
+            "data": data,
+            "chainId": CHAIN_ID,
+            "type": 2,
+            "nonce": await self.get_nonce(),
+            **(gas_params or await get_gas_params(self.web3)),
+        }
+        if to is not None:
+            transaction["to"] = self.web3.to_checksum_address(to)
+
+        gas_key = GasLimitCache.make_key(to, data, value) if cache_gas else None
+        from_cache = False
+        if gas is None and gas_key:
+            gas = self.gas_cache.get(gas_key)
+            from_cache = gas is not None
+        if gas is None:
+            estimated = await self.web3.eth.estimate_gas(transaction)
+            if gas_key:
+                self.gas_cache.observe(gas_key, estimated)
+            gas = int(estimated * self.gas_buffer)
+
+        transaction["gas"] = gas
+        return transaction, from_cache
+
+    async def _send(
+        self,
+        to: Optional[str],
+        data: str,
+        value: int,
+        gas: Optional[int],
+        gas_params: Optional[Dict[str, int]],
+        cache_gas: bool,
+    ) -> Tuple[bytes, dict, bool]:
+        lock = TxBuilder._nonce_locks.setdefault(self.address, asyncio.Lock())
+        async with lock:
+            for attempt in range(2):
+                transaction, from_cache = await self._build(
+                    to, data, value, gas, gas_params, cache_gas
+                )
+                signed_tx = self.account.sign_transaction(transaction)
+                try:
+                    tx_hash = await self.web3.eth.send_raw_transaction(
+                        signed_tx.raw_transaction
+                    )
+                except Exception as e:
+                    # Another code path used the nonce, re-read it once and retry
+                    if attempt == 0 and _is_nonce_error(e):
+                        logger.warning(
+                            f"{self.address} | Local nonce is stale, re-reading it: {e}"
+                        )
+                        self.reset_nonce()
+                        continue
+                    self.reset_nonce()
+                    raise
+
+                TxBuilder._nonces[self.address] = transaction["nonce"] + 1
+                return tx_hash, transaction, from_cache
+
+    async def send(
+        self,
+        to: Optional[str],
+        data: str = "0x",
+        value: int = 0,
+        gas: Optional[int] = None,
+        gas_params: Optional[Dict[str, int]] = None,
+        cache_gas: bool = False,
+    ):
+        """Build, sign and send a transaction. Returns the tx hash."""
+        tx_hash, _, _ = await self._send(to, data, value, gas, gas_params, cache_gas)
+        return tx_hash
+
+    async def send_and_wait(
+        self,
+        to: Optional[str],
+        data: str = "0x",
+        value: int = 0,
+        gas: Optional[int] = None,
+        gas_params: Optional[Dict[str, int]] = None,
+        poll_latency: float = 2,
+        cache_gas: bool = False,
+    ) -> Tuple[str, dict]:
+        """
+        Send a transaction and wait for the receipt. Returns (tx_hash, receipt).
+
+        A revert with a cached gas limit is sent once more only if a fresh
+        estimate shows the limit was too low, any other revert is returned
+        as is.
+        """
+        tx_hash, transaction, from_cache = await self._send(
+            to, data, value, gas, gas_params, cache_gas
+        )
+        receipt = await self.web3.eth.wait_for_transaction_receipt(
+            tx_hash, poll_latency=poll_latency
+        )
+
+        if receipt["status"] == 0 and from_cache and await self._limit_too_low(transaction):
+            logger.warning(
+                f"{self.address} | Transaction ran out of gas with cached limit "
+                f"{transaction['gas']}, retrying with a fresh estimate"
+            )
+            self.gas_cache.invalidate(GasLimitCache.make_key(to, data, value))
+            tx_hash, transaction, _ = await self._send(
+                to, data, value, gas, gas_params, cache_gas
+            )
+            receipt = await self.web3.eth.wait_for_transaction_receipt(
+                tx_hash, poll_latency=poll_latency
+            )
+
+        return tx_hash.hex(), receipt
+
+    async def _limit_too_low(self, transaction: dict) -> bool:
+        """True if the call now needs more gas than the reverted transaction had"""
+        call = {key: value for key, value in transaction.items() if key not in ("gas", "nonce")}
+        try:
+            estimated = await self.web3.eth.estimate_gas(call)
+        except Exception:
+            # The call itself reverts now, the revert was not about gas
+            return False
+        return estimated > transaction["gas"]
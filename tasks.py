@@ -38,6 +38,9 @@ and add it to the TASKS list or use our ready-made preset tasks.
 in random order
 [ ] - Means that only one of the modules inside the brackets will be executed 
 on random
+{ } - Means that all of the modules inside the brackets will be executed, 
+off-chain ones (superboard, monsternad_whitelist, logs) at the same time 
+as the on-chain ones, which still go one by one
 SEE THE EXAMPLE BELOW:
 
 RU:
@@ -46,6 +49,8 @@ RU:
 
 ( ) - означает, что все модули внутри скобок будут выполнены в случайном порядке
 [ ] - означает, что будет выполнен только один из модулей внутри скобок в случайном порядке
+{ } - означает, что будут выполнены все модули внутри скобок, офчейн модули 
+(superboard, monsternad_whitelist, logs) одновременно с ончейн модулями, которые идут по очереди
 СМОТРИТЕ ПРИМЕР НИЖЕ:
 
 CHINESE:
@@ -54,6 +59,8 @@ CHINESE:
 
 ( ) - 表示括号内的所有模块将按随机顺序执行
 [ ] - 表示括号内的模块将按随机顺序执行
+{ } - 表示括号内的所有模块都将执行，链下模块（superboard, monsternad_whitelist, logs）
+与链上模块同时执行，链上模块仍然逐个执行
 
 --------------------------------
 !!! IMPORTANT !!!
@@ -66,6 +73,7 @@ CREATE_YOUR_OWN_TASK = [
     "crusty_refuel",
     ("apriori", "magma", "shmonad"),
     ["ambient", "izumi", "bean"],
+    {"superboard", "nad_domains", "owlto"},
     "collect_all_to_monad",
 ]
 --------------------------------